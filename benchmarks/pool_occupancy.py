@@ -0,0 +1,116 @@
+"""
+Сравнение занятости пула соединений при обычной и ленивой сессии.
+
+Каждый запрос с вероятностью --hit-ratio обслуживается без обращения к БД
+(как при попадании в кэш), иначе читает задачу по UUID. Затем запрос тратит
+--response-ms миллисекунд на сериализацию и отправку ответа, после чего
+зависимость закрывает сессию.
+
+Запуск:
+
+    python -m benchmarks.pool_occupancy --requests 2000 --concurrency 15
+"""
+
+import argparse
+import asyncio
+import contextlib
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from src.domain.entities import Status, Task
+from src.infra.database.connection import create_session_maker, new_session
+from src.infra.database.models.base import Base
+from src.infra.database.repositories.task import TaskRepo
+from src.presentation.api.config import WebConfig
+
+
+async def eager_session(session_maker):
+    """Поведение до ленивой сессии: сессия открывается на весь запрос."""
+    async with session_maker() as session:
+        yield session
+
+
+async def handle_request(sessions, hit_ratio: float, response_ms: float) -> None:
+    async with contextlib.aclosing(sessions) as gen:
+        session = await anext(gen)
+        if random.random() >= hit_ratio:
+            await TaskRepo(session).get_task("task-1")
+        await asyncio.sleep(response_ms / 1000)
+
+
+async def run(mode: str, args: argparse.Namespace, db_path: Path) -> dict:
+    config = WebConfig(
+        async_db_uri=f"sqlite+aiosqlite:///{db_path}",
+        db_uri="",
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+    )
+    session_maker = create_session_maker(config, name=mode, read_only=True)
+    engine = session_maker.kw["bind"]
+    pool = engine.sync_engine.pool
+
+    samples: list[int] = []
+    done = asyncio.Event()
+
+    async def sample() -> None:
+        while not done.is_set():
+            samples.append(pool.checkedout())
+            await asyncio.sleep(0.001)
+
+    def sessions():
+        if mode == "eager":
+            return eager_session(session_maker)
+        return new_session(session_maker, release_after_read=True)
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def limited() -> None:
+        async with semaphore:
+            await handle_request(sessions(), args.hit_ratio, args.response_ms)
+
+    sampler = asyncio.create_task(sample())
+    start = time.perf_counter()
+    await asyncio.gather(*(limited() for _ in range(args.requests)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await sampler
+    await engine.dispose()
+
+    return {
+        "mode": mode,
+        "requests_per_second": round(args.requests / elapsed, 1),
+        "mean_checked_out": round(sum(samples) / len(samples), 2),
+        "peak_checked_out": max(samples),
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=15)
+    parser.add_argument("--hit-ratio", type=float, default=0.5)
+    parser.add_argument("--response-ms", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "tasks.db"
+        session_maker = create_session_maker(WebConfig(f"sqlite+aiosqlite:///{db_path}", ""))
+        engine = session_maker.kw["bind"]
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_maker() as session:
+            await TaskRepo(session).create_new_task(
+                Task(uuid="task-1", title="Task", description="Test", status=Status.TODO)
+            )
+        await engine.dispose()
+
+        for mode in ("eager", "lazy"):
+            print(await run(mode, args, db_path))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Стоимость сериализации одной задачи в ответе GET /tasks/.
+
+Сравниваются прежний путь (TaskResponse на каждую задачу, TaskListResponse,
+повторная валидация по response_model и json.dumps, как это делает FastAPI)
+и прямое кодирование dataclass-сущностей в байты через orjson.
+
+Запуск:
+
+    python -m benchmarks.serialization --items 5000 --repeat 20
+"""
+
+import argparse
+import json
+import time
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+
+from src.domain.entities import Status, Task
+from src.presentation.api.task.schemas import TaskListResponse, TaskResponse
+from src.presentation.api.task.serialization import render_task_list
+
+
+def pydantic_path(tasks: list[Task], adapter: TypeAdapter) -> bytes:
+    response = TaskListResponse(
+        tasks=[
+            TaskResponse(
+                uuid=t.uuid,
+                title=t.title,
+                description=t.description,
+                status=t.status,
+                version=t.version,
+            )
+            for t in tasks
+        ],
+        next_cursor=None,
+    )
+    validated = adapter.validate_python(response, from_attributes=True)
+    content = adapter.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def orjson_path(tasks: list[Task], adapter: TypeAdapter) -> bytes:
+    return render_task_list(tasks, None)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    statuses = list(Status)
+    tasks = [
+        Task(
+            uuid=str(uuid4()),
+            title=f"Задача {i}",
+            description="Описание задачи " * 8,
+            status=statuses[i % len(statuses)],
+            version=i % 7 + 1,
+        )
+        for i in range(args.items)
+    ]
+    adapter = TypeAdapter(TaskListResponse)
+    assert json.loads(pydantic_path(tasks, adapter)) == json.loads(
+        orjson_path(tasks, adapter)
+    )
+
+    results = {}
+    for name, path in (("pydantic", pydantic_path), ("orjson", orjson_path)):
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            path(tasks, adapter)
+            best = min(best, time.perf_counter() - start)
+        results[name] = best / args.items * 1e6
+        print({"path": name, "us_per_item": round(results[name], 3)})
+    print({"speedup": round(results["pydantic"] / results["orjson"], 1)})
+
+
+if __name__ == "__main__":
+    main()
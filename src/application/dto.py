@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+
+from src.domain.entities import Status
+
+
+@dataclass
+class NewTask:
+    """
+    Данные для создания задачи, uuid которой еще не назначен.
+    """
+
+    title: str
+    description: str
+    status: Status
+
+
+@dataclass
+class TaskStats:
+    """
+    Количество задач в каждом статусе.
+    """
+
+    counts: dict[Status, int]
+    approximate: bool = False
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
@@ -0,0 +1,40 @@
+import secrets
+import time
+from uuid import UUID
+
+_last_ms = 0
+_sequence = 0
+
+
+def uuid7() -> str:
+    """
+    Генерация UUID версии 7 (RFC 9562).
+
+    Старшие 48 бит — время Unix в миллисекундах, поэтому новые идентификаторы
+    больше старых и вставки попадают в правую часть индекса первичного ключа,
+    а не в случайные страницы. Внутри одной миллисекунды 12 бит rand_a
+    используются как счетчик, начинающийся со случайного значения, так что
+    идентификаторы процесса монотонны и при переводе часов назад.
+    Остальные 62 бита случайны.
+
+    :return: UUID в каноническом строковом представлении.
+    """
+    global _last_ms, _sequence
+    now_ms = time.time_ns() // 1_000_000
+    if now_ms > _last_ms:
+        # Старший бит счетчика остается нулевым, чтобы в миллисекунде было
+        # место хотя бы для 2048 идентификаторов.
+        _last_ms, _sequence = now_ms, secrets.randbits(11)
+    else:
+        _sequence += 1
+        if _sequence > 0xFFF:
+            _last_ms, _sequence = _last_ms + 1, 0
+
+    value = (
+        (_last_ms & 0xFFFF_FFFF_FFFF) << 80
+        | 0x7 << 76
+        | _sequence << 64
+        | 0b10 << 62
+        | secrets.randbits(62)
+    )
+    return str(UUID(int=value))
@@ -1,8 +1,23 @@
-from uuid import uuid4
-
+from src.application.dto import NewTask, TaskStats
+from src.application.ids import uuid7
+from src.application.pagination import Page, TaskCursor, decode_cursor, encode_cursor
+from src.application.projection import TaskProjection, with_required_fields
+from src.application.search import (
+    SearchHit,
+    decode_search_cursor,
+    encode_search_cursor,
+)
+from src.application.sync import (
+    ORIGIN,
+    TaskChanges,
+    decode_change_cursor,
+    encode_change_cursor,
+)
 from src.application.interfaces import TaskCreator, TaskDeleter, TaskReader, TaskUpdater
 from src.domain.entities import Task, Status
+from src.infra.database.group_commit import GroupCommitWriter
 from src.infra.database.repositories.task import BaseTaskRepo
+from src.infra.database.single_flight import TaskReadCoalescer
 
 
 class TaskCreatorImpl(TaskCreator):
@@ -11,13 +26,17 @@ class TaskCreatorImpl(TaskCreator):
     Имплементирует интерфейс TaskCreator.
     """
 
-    def __init__(self, task_repo: BaseTaskRepo) -> None:
+    def __init__(
+        self, task_repo: BaseTaskRepo, group_commit: GroupCommitWriter | None = None
+    ) -> None:
         """
         Инициализация класса.
 
         :param task_repo: Репозиторий для работы с задачами в базе данных.
+        :param group_commit: Писатель, объединяющий создание задач в пакеты.
         """
         self._task_repo = task_repo
+        self._group_commit = group_commit
 
     async def create_new_task(
         self, title: str, description: str, status: Status
@@ -29,11 +48,34 @@ class TaskCreatorImpl(TaskCreator):
         :param description: Описание задачи.
         :param status: Статус задачи.
         """
-        uuid = str(uuid4())
+        uuid = uuid7()
         task = Task(uuid=uuid, title=title, description=description, status=status)
-        await self._task_repo.create_new_task(task)
+        if self._group_commit is not None:
+            await self._group_commit.create_new_task(task)
+        else:
+            await self._task_repo.create_new_task(task)
         return uuid
 
+    async def create_new_tasks(self, tasks: list[NewTask]) -> list[str]:
+        """
+        Создание нескольких задач одним запросом.
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param tasks: Данные создаваемых задач.
+        :return: Список uuid созданных задач в порядке передачи.
+        """
+        entities = [
+            Task(
+                uuid=uuid7(),
+                title=t.title,
+                description=t.description,
+                status=t.status,
+            )
+            for t in tasks
+        ]
+        await self._task_repo.create_new_tasks(entities)
+        return [t.uuid for t in entities]
+
 
 class TaskReaderImpl(TaskReader):
     """
@@ -41,13 +83,17 @@ class TaskReaderImpl(TaskReader):
     Имплементирует интерфейс TaskReader.
     """
 
-    def __init__(self, task_repo: BaseTaskRepo) -> None:
+    def __init__(
+        self, task_repo: BaseTaskRepo, coalescer: TaskReadCoalescer | None = None
+    ) -> None:
         """
         Инициализация класса.
 
         :param task_repo: Репозиторий для работы с задачами в базе данных.
+        :param coalescer: Объединение одинаковых одновременных чтений задач.
         """
         self._task_repo = task_repo
+        self._reads = coalescer or task_repo
 
     async def get_task_by_uuid(self, uuid: str) -> Task:
         """
@@ -56,16 +102,127 @@ class TaskReaderImpl(TaskReader):
         :param uuid: Уникальный идентификатор задачи.
         :return: Задача, соответствующая переданному uuid.
         """
-        return await self._task_repo.get_task(uuid)
+        return await self._reads.get_task(uuid)
 
-    async def get_all_tasks(self, status: Status | None) -> list[Task]:
+    async def get_all_tasks(
+        self, status: Status | None, limit: int, cursor: str | None = None
+    ) -> Page[Task]:
         """
-        Получение всех задач по статусу.
+        Получение страницы задач по статусу.
 
         :param status: Статус задач (может быть None, если нужно получить все задачи).
-        :return: Список задач с заданным статусом.
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Курсор, полученный на предыдущей странице.
+        :return: Страница задач с курсором следующей страницы.
+        :raises InvalidCursorException: Если курсор поврежден.
         """
-        return await self._task_repo.get_tasks(status)
+        after = decode_cursor(cursor) if cursor else None
+        tasks = await self._reads.get_tasks(status, limit + 1, after)
+        if len(tasks) <= limit:
+            return Page(items=tasks, next_cursor=None)
+        tasks = tasks[:limit]
+        return Page(items=tasks, next_cursor=encode_cursor(tasks[-1]))
+
+    async def get_task_projection(
+        self, uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection:
+        """
+        Получение только запрошенных полей задачи.
+        Поля uuid, status и version читаются всегда, так как нужны для ETag.
+
+        :param uuid: Уникальный идентификатор задачи.
+        :param fields: Запрошенные поля задачи.
+        :return: Словарь со значениями полей задачи.
+        """
+        return await self._task_repo.get_task_projection(
+            uuid, with_required_fields(fields)
+        )
+
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: str | None,
+        fields: tuple[str, ...],
+    ) -> Page[TaskProjection]:
+        """
+        Получение страницы задач, содержащей только запрошенные поля.
+        Поля uuid, status и version читаются всегда, так как нужны для курсора и ETag.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Курсор, полученный на предыдущей странице.
+        :param fields: Запрошенные поля задачи.
+        :return: Страница словарей со значениями полей задач.
+        :raises InvalidCursorException: Если курсор поврежден.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        items = await self._task_repo.get_task_projections(
+            status, limit + 1, after, with_required_fields(fields)
+        )
+        if len(items) <= limit:
+            return Page(items=items, next_cursor=None)
+        items = items[:limit]
+        last = TaskCursor(status=items[-1]["status"], uuid=items[-1]["uuid"])
+        return Page(items=items, next_cursor=encode_cursor(last))
+
+    async def search_tasks(
+        self, query: str, limit: int, cursor: str | None = None
+    ) -> Page[SearchHit]:
+        """
+        Полнотекстовый поиск задач по заголовку и описанию.
+
+        :param query: Поисковый запрос.
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Курсор, полученный на предыдущей странице.
+        :return: Страница результатов в порядке убывания релевантности.
+        :raises InvalidCursorException: Если курсор поврежден.
+        """
+        after = decode_search_cursor(cursor) if cursor else None
+        hits = await self._task_repo.search_tasks(query, limit + 1, after)
+        if len(hits) <= limit:
+            return Page(items=hits, next_cursor=None)
+        hits = hits[:limit]
+        return Page(items=hits, next_cursor=encode_search_cursor(hits[-1]))
+
+    async def get_task_stats(self, approximate: bool = False) -> TaskStats:
+        """
+        Получение количества задач в каждом статусе.
+
+        :param approximate: Оценить количество по статистике планировщика
+            вместо чтения счетчиков.
+        :return: Количество задач по статусам.
+        """
+        if approximate:
+            counts = await self._task_repo.estimate_task_counts()
+        else:
+            counts = await self._task_repo.count_tasks()
+        return TaskStats(counts=counts, approximate=approximate)
+
+    async def get_changes(self, since: str | None, limit: int) -> TaskChanges:
+        """
+        Получение задач, измененных и удаленных после курсора синхронизации.
+        Без курсора возвращаются все задачи, порциями по limit.
+
+        :param since: Курсор, полученный клиентом при предыдущей синхронизации.
+        :param limit: Максимальное количество изменений в ответе.
+        :return: Измененные задачи, uuid удаленных задач и курсор для следующего
+            запроса; has_more означает, что изменения получены не полностью.
+        :raises InvalidCursorException: Если курсор поврежден.
+        :raises ChangesCursorExpiredException: Если курсор устарел.
+        """
+        after = decode_change_cursor(since) if since else None
+        changes = await self._task_repo.get_changes(after, limit + 1)
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        # Если изменений нет, клиент продолжает с той же позиции.
+        position = changes[-1].position if changes else after or ORIGIN
+        return TaskChanges(
+            tasks=[change.task for change in changes if change.task is not None],
+            deleted=[change.uuid for change in changes if change.task is None],
+            next_cursor=encode_change_cursor(position),
+            has_more=has_more,
+        )
 
 
 class TaskUpdaterImpl(TaskUpdater):
@@ -83,8 +240,13 @@ class TaskUpdaterImpl(TaskUpdater):
         self._task_repo = task_repo
 
     async def update_task(
-        self, uuid: str, title: str, description: str, status: Status
-    ) -> None:
+        self,
+        uuid: str,
+        title: str,
+        description: str,
+        status: Status,
+        expected_version: int | None = None,
+    ) -> int:
         """
         Обновление данных задачи.
 
@@ -92,9 +254,23 @@ class TaskUpdaterImpl(TaskUpdater):
         :param title: Новый заголовок задачи.
         :param description: Новое описание задачи.
         :param status: Новый статус задачи.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        :return: Новая версия задачи.
         """
         task = Task(uuid=uuid, title=title, description=description, status=status)
-        await self._task_repo.update_task(task)
+        return await self._task_repo.update_task(task, expected_version)
+
+    async def update_tasks(self, tasks: list[Task]) -> set[str]:
+        """
+        Обновление нескольких задач одним запросом.
+        Если одна задача передана несколько раз, применяется последнее изменение.
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param tasks: Задачи с обновленными данными.
+        :return: Множество uuid задач, которые были найдены и обновлены.
+        """
+        unique = {t.uuid: t for t in tasks}
+        return await self._task_repo.update_tasks(list(unique.values()))
 
 
 class TaskDeleterImpl(TaskDeleter):
@@ -111,10 +287,23 @@ class TaskDeleterImpl(TaskDeleter):
         """
         self._task_repo = task_repo
 
-    async def delete_task(self, uuid: str) -> None:
+    async def delete_task(
+        self, uuid: str, expected_version: int | None = None
+    ) -> None:
         """
         Удаление задачи по уникальному идентификатору.
 
         :param uuid: Уникальный идентификатор задачи.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        """
+        await self._task_repo.delete_task(uuid, expected_version)
+
+    async def delete_tasks(self, uuids: list[str]) -> set[str]:
+        """
+        Удаление нескольких задач одним запросом.
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param uuids: Уникальные идентификаторы задач.
+        :return: Множество uuid задач, которые были найдены и удалены.
         """
-        await self._task_repo.delete_task(uuid)
+        return await self._task_repo.delete_tasks(list(dict.fromkeys(uuids)))
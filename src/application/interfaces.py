@@ -1,7 +1,12 @@
 from abc import abstractmethod
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 
-from src.domain.entities import Status, Task
+from src.application.dto import NewTask, TaskStats
+from src.application.pagination import Page
+from src.application.projection import TaskProjection
+from src.application.search import SearchHit
+from src.application.sync import TaskChanges
+from src.domain.entities import Status, Task, TaskEvent
 
 
 class TaskCreator(Protocol):
@@ -14,6 +19,9 @@ class TaskCreator(Protocol):
         self, title: str, description: str, status: Status
     ) -> str: ...
 
+    @abstractmethod
+    async def create_new_tasks(self, tasks: list[NewTask]) -> list[str]: ...
+
 
 class TaskReader(Protocol):
     """
@@ -24,7 +32,43 @@ class TaskReader(Protocol):
     async def get_task_by_uuid(self, uuid: str) -> Task: ...
 
     @abstractmethod
-    async def get_all_tasks(self, status: Status | None) -> list[Task]: ...
+    async def get_all_tasks(
+        self, status: Status | None, limit: int, cursor: str | None = None
+    ) -> Page[Task]: ...
+
+    @abstractmethod
+    async def get_task_projection(
+        self, uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection: ...
+
+    @abstractmethod
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: str | None,
+        fields: tuple[str, ...],
+    ) -> Page[TaskProjection]: ...
+
+    @abstractmethod
+    async def search_tasks(
+        self, query: str, limit: int, cursor: str | None = None
+    ) -> Page[SearchHit]: ...
+
+    @abstractmethod
+    async def get_task_stats(self, approximate: bool = False) -> TaskStats: ...
+
+    @abstractmethod
+    async def get_changes(self, since: str | None, limit: int) -> TaskChanges: ...
+
+
+class TaskExporter(Protocol):
+    """
+    Интерфейс для потоковой выгрузки задач.
+    """
+
+    @abstractmethod
+    def export_tasks(self, status: Status | None) -> AsyncIterator[Task]: ...
 
 
 class TaskUpdater(Protocol):
@@ -34,8 +78,16 @@ class TaskUpdater(Protocol):
 
     @abstractmethod
     async def update_task(
-        self, uuid: str, title: str, description: str, status: Status
-    ) -> None: ...
+        self,
+        uuid: str,
+        title: str,
+        description: str,
+        status: Status,
+        expected_version: int | None = None,
+    ) -> int: ...
+
+    @abstractmethod
+    async def update_tasks(self, tasks: list[Task]) -> set[str]: ...
 
 
 class TaskDeleter(Protocol):
@@ -44,4 +96,51 @@ class TaskDeleter(Protocol):
     """
 
     @abstractmethod
-    async def delete_task(self, uuid: str) -> None: ...
+    async def delete_task(
+        self, uuid: str, expected_version: int | None = None
+    ) -> None: ...
+
+    @abstractmethod
+    async def delete_tasks(self, uuids: list[str]) -> set[str]: ...
+
+
+class UnitOfWork(Protocol):
+    """
+    Интерфейс для управления транзакцией в рамках запроса.
+    """
+
+    @abstractmethod
+    async def commit(self) -> None: ...
+
+    @abstractmethod
+    async def rollback(self) -> None: ...
+
+
+class TaskEventSubscription(Protocol):
+    """
+    Интерфейс подписки на события задач.
+    """
+
+    @abstractmethod
+    async def next(self, timeout: float) -> list[TaskEvent] | None: ...
+
+
+class TaskEventFeed(Protocol):
+    """
+    Интерфейс ленты событий задач.
+    """
+
+    @property
+    @abstractmethod
+    def available(self) -> bool: ...
+
+    @abstractmethod
+    def subscribe(self, status: Status | None = None) -> TaskEventSubscription: ...
+
+    @abstractmethod
+    def unsubscribe(self, subscription: TaskEventSubscription) -> None: ...
+
+    @abstractmethod
+    async def replay(
+        self, after_id: int, status: Status | None = None
+    ) -> list[TaskEvent] | None: ...
@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+from uuid import UUID
+
+from src.domain.entities import Status, Task
+from src.domain.exceptions import InvalidCursorException
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class TaskCursor:
+    """
+    Позиция в списке задач для keyset-пагинации.
+    Задачи упорядочены по паре (status, uuid).
+    """
+
+    status: Status
+    uuid: str
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    next_cursor: str | None
+
+
+def encode_cursor(task: Task | TaskCursor) -> str:
+    """
+    Кодирование позиции задачи в непрозрачный курсор.
+
+    :param task: Последняя задача на странице или ее позиция.
+    :return: Курсор для получения следующей страницы.
+    """
+    raw = json.dumps([task.status.value, task.uuid], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> TaskCursor:
+    """
+    Декодирование непрозрачного курсора.
+
+    :param cursor: Курсор, полученный клиентом на предыдущей странице.
+    :return: Позиция в списке задач.
+    :raises InvalidCursorException: Если курсор поврежден.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        status, uuid = json.loads(base64.urlsafe_b64decode(padded))
+        return TaskCursor(status=Status(status), uuid=str(UUID(uuid)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, AttributeError):
+        raise InvalidCursorException(cursor=cursor)
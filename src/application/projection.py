@@ -0,0 +1,33 @@
+from dataclasses import fields as dataclass_fields
+from typing import Any
+
+from src.domain.entities import Task
+from src.domain.exceptions import InvalidFieldsException
+
+TaskProjection = dict[str, Any]
+
+TASK_FIELDS = tuple(field.name for field in dataclass_fields(Task))
+# Поля, которые читаются всегда: из них строятся курсор страницы и ETag.
+REQUIRED_FIELDS = ("uuid", "status", "version")
+
+
+def parse_task_fields(fields: str) -> tuple[str, ...]:
+    """
+    Разбор списка полей задачи, перечисленных через запятую.
+
+    :param fields: Значение параметра fields, например "uuid,status".
+    :return: Запрошенные поля в порядке объявления сущности Task.
+    :raises InvalidFieldsException: Если список пуст или содержит неизвестное поле.
+    """
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    if not requested or not requested.issubset(TASK_FIELDS):
+        raise InvalidFieldsException(fields=fields)
+    return tuple(field for field in TASK_FIELDS if field in requested)
+
+
+def with_required_fields(fields: tuple[str, ...]) -> tuple[str, ...]:
+    return tuple(f for f in TASK_FIELDS if f in fields or f in REQUIRED_FIELDS)
+
+
+def project_task(task: Task, fields: tuple[str, ...]) -> TaskProjection:
+    return {field: getattr(task, field) for field in fields}
@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+import re
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.domain.entities import Task
+from src.domain.exceptions import InvalidCursorException
+
+# Вес совпадения в описании относительно совпадения в заголовке.
+DESCRIPTION_WEIGHT = 0.4
+
+
+@dataclass(frozen=True)
+class SearchCursor:
+    """
+    Позиция в результатах поиска.
+    Результаты упорядочены по убыванию релевантности, затем по uuid.
+    """
+
+    rank: float
+    uuid: str
+
+
+@dataclass
+class SearchHit:
+    task: Task
+    rank: float
+
+
+def encode_search_cursor(hit: SearchHit) -> str:
+    """
+    Кодирование позиции результата поиска в непрозрачный курсор.
+
+    :param hit: Последний результат на странице.
+    :return: Курсор для получения следующей страницы.
+    """
+    raw = json.dumps([hit.rank, hit.task.uuid], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> SearchCursor:
+    """
+    Декодирование курсора результатов поиска.
+
+    :param cursor: Курсор, полученный клиентом на предыдущей странице.
+    :return: Позиция в результатах поиска.
+    :raises InvalidCursorException: Если курсор поврежден.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, uuid = json.loads(base64.urlsafe_b64decode(padded))
+        return SearchCursor(rank=float(rank), uuid=str(UUID(uuid)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, AttributeError):
+        raise InvalidCursorException(cursor=cursor)
+
+
+def rank_task(task: Task, query: str) -> float | None:
+    """
+    Упрощенный поиск для хранилищ без полнотекстового индекса.
+    Задача подходит, если каждое слово запроса встречается в заголовке
+    или описании; релевантность — число вхождений с учетом веса поля.
+
+    :param task: Проверяемая задача.
+    :param query: Поисковый запрос.
+    :return: Релевантность или None, если задача не подходит.
+    """
+    terms = re.findall(r"\w+", query.lower())
+    if not terms:
+        return None
+    title, description = task.title.lower(), task.description.lower()
+    rank = 0.0
+    for term in terms:
+        matches = title.count(term) + DESCRIPTION_WEIGHT * description.count(term)
+        if not matches:
+            return None
+        rank += matches
+    return rank
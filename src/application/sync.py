@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.domain.entities import Task
+from src.domain.exceptions import InvalidCursorException
+
+
+@dataclass(frozen=True, order=True)
+class ChangeCursor:
+    """
+    Позиция в журнале изменений задач.
+    Изменения упорядочены по (txid, seq, uuid): txid — транзакция, изменившая
+    задачу, seq — номер изменения в общей последовательности. uuid различает
+    задачи, созданные до появления журнала: у них txid и seq равны нулю.
+    """
+
+    txid: int
+    seq: int
+    uuid: str
+
+
+# Начало журнала: позиция перед любым изменением в любом хранилище.
+ORIGIN = ChangeCursor(txid=0, seq=0, uuid="00000000-0000-0000-0000-000000000000")
+
+
+@dataclass
+class TaskChange:
+    """
+    Последнее изменение задачи: задача в текущем состоянии
+    или None, если задача удалена.
+    """
+
+    position: ChangeCursor
+    uuid: str
+    task: Task | None
+
+
+@dataclass
+class TaskChanges:
+    tasks: list[Task]
+    deleted: list[str]
+    next_cursor: str
+    has_more: bool
+
+
+def encode_change_cursor(position: ChangeCursor) -> str:
+    """
+    Кодирование позиции в журнале изменений в непрозрачный курсор.
+
+    :param position: Позиция последнего изменения, полученного клиентом.
+    :return: Курсор для следующего запроса изменений.
+    """
+    raw = json.dumps(
+        [position.txid, position.seq, position.uuid], separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_change_cursor(cursor: str) -> ChangeCursor:
+    """
+    Декодирование курсора синхронизации.
+
+    :param cursor: Курсор, полученный клиентом при предыдущей синхронизации.
+    :return: Позиция в журнале изменений.
+    :raises InvalidCursorException: Если курсор поврежден.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        txid, seq, uuid = json.loads(base64.urlsafe_b64decode(padded))
+        if type(txid) is not int or type(seq) is not int or txid < 0 or seq < 0:
+            raise ValueError(cursor)
+        return ChangeCursor(txid=txid, seq=seq, uuid=str(UUID(uuid)))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError, AttributeError):
+        raise InvalidCursorException(cursor=cursor)
@@ -14,3 +14,14 @@ class Task:
     title: str
     description: str
     status: Status
+    version: int = 1
+
+
+@dataclass
+class TaskEvent:
+    id: int
+    op: str
+    uuid: str
+    status: Status
+    previous_status: Status | None
+    version: int
@@ -8,3 +8,47 @@ class TaskNotFoundException(Exception):
     @property
     def message(self):
         return f"Задача с uuid: {self.task_uuid} не была найдена."
+
+
+@dataclass(eq=False)
+class InvalidCursorException(Exception):
+    cursor: str
+
+    @property
+    def message(self):
+        return f"Некорректный курсор пагинации: {self.cursor}."
+
+
+@dataclass(eq=False)
+class TaskVersionMismatchException(Exception):
+    task_uuid: str
+    expected_version: int
+    actual_version: int
+
+    @property
+    def message(self):
+        return (
+            f"Задача с uuid: {self.task_uuid} была изменена: "
+            f"ожидалась версия {self.expected_version}, текущая версия {self.actual_version}."
+        )
+
+
+@dataclass(eq=False)
+class InvalidFieldsException(Exception):
+    fields: str
+
+    @property
+    def message(self):
+        return f"Некорректный список полей задачи: {self.fields}."
+
+
+@dataclass(eq=False)
+class ChangesCursorExpiredException(Exception):
+    cursor: str
+
+    @property
+    def message(self):
+        return (
+            f"Курсор синхронизации {self.cursor} устарел: часть удалений уже удалена "
+            "из журнала. Выполните полную синхронизацию без параметра since."
+        )
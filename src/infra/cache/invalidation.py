@@ -0,0 +1,196 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Iterable
+from uuid import uuid4
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+Subscriber = Callable[[str], None]
+ResetSubscriber = Callable[[], None]
+
+# Postgres ограничивает размер полезной нагрузки NOTIFY 8000 байтами.
+MAX_NOTIFY_PAYLOAD = 7000
+
+
+class InvalidationBus(ABC):
+    """
+    Шина инвалидации кэша между процессами.
+    Используется как асинхронный контекстный менеджер на время жизни приложения.
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: list[Subscriber] = []
+        self._reset_subscribers: list[ResetSubscriber] = []
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        """
+        Подписка на события инвалидации.
+
+        :param subscriber: Функция, вызываемая с ключом инвалидированной записи.
+        """
+        self._subscribers.append(subscriber)
+
+    def on_reset(self, subscriber: ResetSubscriber) -> None:
+        """
+        Подписка на сброс: события инвалидации могли быть потеряны,
+        и кэш нужно очистить целиком.
+
+        :param subscriber: Функция без аргументов.
+        """
+        self._reset_subscribers.append(subscriber)
+
+    def _deliver(self, key: str) -> None:
+        for subscriber in self._subscribers:
+            subscriber(key)
+
+    def _reset(self) -> None:
+        for subscriber in self._reset_subscribers:
+            subscriber()
+
+    @abstractmethod
+    async def publish(self, keys: Iterable[str]) -> None: ...
+
+    async def __aenter__(self) -> "InvalidationBus":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+class LocalInvalidationBus(InvalidationBus):
+    """
+    Шина инвалидации в пределах одного процесса.
+    Доставляет события всем подписчикам, в том числе отправителю.
+    """
+
+    async def publish(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._deliver(key)
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """
+    Шина инвалидации на основе Postgres LISTEN/NOTIFY.
+    Каждый процесс держит одно выделенное соединение, через которое
+    слушает канал и отправляет уведомления. Собственные уведомления
+    процесса игнорируются: локальный кэш инвалидирует отправитель.
+
+    При потере соединения шина переподключается с экспоненциально растущей
+    паузой. Уведомления, отправленные в это время, не доходят, поэтому после
+    восстановления соединения подписчики сброса очищают кэш.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = "task_cache_invalidation",
+        reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30.0,
+    ) -> None:
+        """
+        Инициализация шины.
+
+        :param dsn: Строка подключения к Postgres в формате libpq.
+        :param channel: Имя канала LISTEN/NOTIFY.
+        :param reconnect_delay: Пауза перед первой повторной попыткой подключения.
+        :param max_reconnect_delay: Максимальная пауза между попытками.
+        """
+        super().__init__()
+        self._dsn = dsn
+        self._channel = channel
+        self._origin = uuid4().hex
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._reconnect_delay = reconnect_delay
+        self._max_reconnect_delay = max_reconnect_delay
+        self._reconnecting: asyncio.Task | None = None
+        self._stopping = False
+        # Ключи, которые не удалось отправить без соединения.
+        self._unpublished: set[str] = set()
+
+    async def __aenter__(self) -> "PostgresInvalidationBus":
+        await self._connect()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._stopping = True
+        if self._reconnecting is not None:
+            self._reconnecting.cancel()
+            await asyncio.gather(self._reconnecting, return_exceptions=True)
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+        await connection.add_listener(self._channel, self._on_notification)
+        connection.add_termination_listener(self._on_termination)
+        self._connection = connection
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        if self._stopping or connection is not self._connection:
+            return
+        logger.warning("Cache invalidation connection lost, reconnecting")
+        self._connection = None
+        self._reconnecting = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = self._reconnect_delay
+        while not self._stopping:
+            await asyncio.sleep(delay)
+            try:
+                await self._connect()
+            except (asyncpg.PostgresError, OSError):
+                logger.warning("Failed to reconnect cache invalidation", exc_info=True)
+                delay = min(delay * 2, self._max_reconnect_delay)
+                continue
+            # Кэш очищается после подписки на канал: все инвалидации
+            # после этого момента снова доставляются.
+            self._reset()
+            self._reconnecting = None
+            unpublished, self._unpublished = self._unpublished, set()
+            await self.publish(unpublished)
+            return
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        origin, _, keys = payload.partition(":")
+        if origin != self._origin:
+            for key in keys.split(","):
+                self._deliver(key)
+
+    def _payloads(self, keys: Iterable[str]) -> Iterable[str]:
+        prefix = f"{self._origin}:"
+        chunk: list[str] = []
+        size = len(prefix)
+        for key in keys:
+            if chunk and size + len(key) + 1 > MAX_NOTIFY_PAYLOAD:
+                yield prefix + ",".join(chunk)
+                chunk, size = [], len(prefix)
+            chunk.append(key)
+            size += len(key) + 1
+        if chunk:
+            yield prefix + ",".join(chunk)
+
+    async def publish(self, keys: Iterable[str]) -> None:
+        keys = list(keys)
+        if self._connection is None:
+            # Ключи отправятся после восстановления соединения.
+            self._unpublished.update(keys)
+            return
+        try:
+            async with self._lock:
+                for payload in self._payloads(keys):
+                    await self._connection.execute(
+                        "SELECT pg_notify($1, $2)", self._channel, payload
+                    )
+        except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError):
+            # Запись уже зафиксирована, поэтому ошибка уведомления не должна
+            # приводить к ошибке запроса: ключи отправятся после переподключения,
+            # а до этого другие процессы догонят по TTL.
+            logger.warning("Failed to publish cache invalidation")
+            self._unpublished.update(keys)
@@ -0,0 +1,165 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Generic, Hashable, Protocol, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+class CacheObserver(Protocol):
+    """
+    Получатель событий кэша, например экспорт в метрики.
+    """
+
+    def record(self, event: str, count: int) -> None: ...
+
+    def resize(self, size: int) -> None: ...
+
+
+class LRUCache(Generic[K, V]):
+    """
+    Ограниченный по размеру LRU-кэш с временем жизни записей.
+
+    Значение, прочитанное из источника до инвалидации его ключа, не попадет
+    в кэш: для этого put принимает поколение, полученное до чтения. Поколение —
+    счетчик инвалидаций; для каждого ключа запоминается поколение его последней
+    инвалидации, поэтому инвалидация одного ключа не отбрасывает чтения других.
+    Отметки хранятся для max_size последних инвалидированных ключей; при вытеснении
+    отметки все более ранние чтения считаются устаревшими.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic,
+        observer: CacheObserver | None = None,
+    ) -> None:
+        """
+        Инициализация кэша.
+
+        :param max_size: Максимальное количество записей.
+        :param ttl: Время жизни записи в секундах.
+        :param clock: Источник монотонного времени.
+        :param observer: Получатель событий hit, miss, eviction и invalidation
+        и размера кэша.
+        """
+        self._max_size = max_size
+        self._ttl = ttl
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._generation = 0
+        self._invalidated: OrderedDict[K, int] = OrderedDict()
+        # Чтения, начатые до этого поколения, устарели для любого ключа.
+        self._stale_before = 0
+        self.stats = CacheStats()
+        self._observer = observer
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        """
+        Получение значения из кэша.
+
+        :param key: Ключ записи.
+        :return: Значение или None, если записи нет или она устарела.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            self._record("miss")
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._data[key]
+            self._record("miss")
+            self._record("eviction")
+            self._resized()
+            return None
+
+        self._data.move_to_end(key)
+        self._record("hit")
+        return value
+
+    def put(self, key: K, value: V, generation: int | None = None) -> None:
+        """
+        Сохранение значения в кэш.
+
+        :param key: Ключ записи.
+        :param value: Значение.
+        :param generation: Поколение кэша на момент чтения значения из источника.
+        Если с тех пор ключ был инвалидирован, значение не сохраняется.
+        """
+        if generation is not None and self._is_stale(key, generation):
+            return
+
+        self._data[key] = (self._clock() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+            self._record("eviction")
+        self._resized()
+
+    def invalidate(self, key: K) -> None:
+        """
+        Удаление записи из кэша.
+
+        :param key: Ключ записи.
+        """
+        self._generation += 1
+        self._record("invalidation")
+        self._data.pop(key, None)
+        self._resized()
+        self._invalidated[key] = self._generation
+        self._invalidated.move_to_end(key)
+        while len(self._invalidated) > self._max_size:
+            _, generation = self._invalidated.popitem(last=False)
+            self._stale_before = max(self._stale_before, generation)
+
+    def clear(self) -> None:
+        """
+        Удаление всех записей, например если события инвалидации могли быть потеряны.
+        Значения, чтение которых уже началось, тоже не попадут в кэш.
+        """
+        self._generation += 1
+        self._record("invalidation", len(self._data))
+        self._data.clear()
+        self._resized()
+        self._invalidated.clear()
+        self._stale_before = self._generation
+
+    def _is_stale(self, key: K, generation: int) -> bool:
+        return (
+            generation < self._stale_before
+            or self._invalidated.get(key, 0) > generation
+        )
+
+    def _record(self, event: str, count: int = 1) -> None:
+        if event == "hit":
+            self.stats.hits += count
+        elif event == "miss":
+            self.stats.misses += count
+        elif event == "eviction":
+            self.stats.evictions += count
+        else:
+            self.stats.invalidations += count
+        if self._observer is not None:
+            self._observer.record(event, count)
+
+    def _resized(self) -> None:
+        if self._observer is not None:
+            self._observer.resize(len(self._data))
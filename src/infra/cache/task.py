@@ -0,0 +1,164 @@
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from src.application.interfaces import UnitOfWork
+from src.application.pagination import TaskCursor
+from src.application.projection import TaskProjection, project_task
+from src.application.search import SearchCursor, SearchHit
+from src.application.sync import ChangeCursor, TaskChange
+from src.domain.entities import Status
+from src.domain.entities import Task as TaskEntity
+from src.infra.cache.invalidation import InvalidationBus
+from src.infra.cache.lru import LRUCache
+from src.infra.database.repositories.task import BaseTaskRepo
+
+
+@dataclass
+class CachingTaskRepo(BaseTaskRepo):
+    """
+    Репозиторий, кэширующий получение задачи по UUID.
+    Остальные операции передаются во вложенный репозиторий; операции
+    изменения инвалидируют кэш локально и через шину в других процессах.
+
+    Одиночные изменения фиксируются самим репозиторием, и кэш инвалидируется
+    сразу после них. Пакетные изменения фиксирует вызывающая сторона, поэтому
+    их ключи копятся до фиксации и инвалидируются CachingUnitOfWork: иначе
+    чтение между инвалидацией и фиксацией вернуло бы в кэш старое значение.
+    """
+
+    _repo: BaseTaskRepo
+    _cache: LRUCache[str, TaskEntity]
+    _bus: InvalidationBus | None = None
+    _pending: set[str] = field(default_factory=set)
+
+    async def _invalidate(self, *task_uuids: str) -> None:
+        for task_uuid in task_uuids:
+            self._cache.invalidate(task_uuid)
+        if self._bus is not None and task_uuids:
+            await self._bus.publish(task_uuids)
+
+    async def flush_invalidations(self) -> None:
+        """
+        Инвалидация задач, измененных пакетными операциями.
+        Вызывается после фиксации транзакции.
+        """
+        pending, self._pending = self._pending, set()
+        await self._invalidate(*pending)
+
+    def discard_invalidations(self) -> None:
+        """
+        Отказ от инвалидации после отката транзакции: задачи не изменились.
+        """
+        self._pending.clear()
+
+    async def create_new_task(self, task: TaskEntity) -> None:
+        await self._repo.create_new_task(task)
+
+    async def get_task(self, task_uuid: str) -> TaskEntity:
+        """
+        Получение задачи по UUID с чтением через кэш.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :return: Сущность задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        """
+        task = self._cache.get(task_uuid)
+        if task is not None:
+            return task
+
+        generation = self._cache.generation
+        task = await self._repo.get_task(task_uuid)
+        self._cache.put(task_uuid, task, generation)
+        return task
+
+    async def get_tasks(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None = None
+    ) -> list[TaskEntity]:
+        return await self._repo.get_tasks(status, limit, cursor)
+
+    async def get_task_projection(
+        self, task_uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection:
+        """
+        Получение полей задачи из кэша, если задача в нем есть.
+        Промах не заполняет кэш: в БД читаются только запрошенные колонки.
+        """
+        task = self._cache.get(task_uuid)
+        if task is not None:
+            return project_task(task, fields)
+        return await self._repo.get_task_projection(task_uuid, fields)
+
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: TaskCursor | None,
+        fields: tuple[str, ...],
+    ) -> list[TaskProjection]:
+        return await self._repo.get_task_projections(status, limit, cursor, fields)
+
+    async def search_tasks(
+        self, query: str, limit: int, cursor: SearchCursor | None = None
+    ) -> list[SearchHit]:
+        return await self._repo.search_tasks(query, limit, cursor)
+
+    async def count_tasks(self) -> dict[Status, int]:
+        return await self._repo.count_tasks()
+
+    async def estimate_task_counts(self) -> dict[Status, int]:
+        return await self._repo.estimate_task_counts()
+
+    def stream_tasks(self, status: Status | None) -> AsyncIterator[TaskEntity]:
+        return self._repo.stream_tasks(status)
+
+    async def update_task(
+        self, task: TaskEntity, expected_version: int | None = None
+    ) -> int:
+        try:
+            return await self._repo.update_task(task, expected_version)
+        finally:
+            await self._invalidate(task.uuid)
+
+    async def delete_task(
+        self, task_uuid: str, expected_version: int | None = None
+    ) -> None:
+        try:
+            await self._repo.delete_task(task_uuid, expected_version)
+        finally:
+            await self._invalidate(task_uuid)
+
+    async def create_new_tasks(self, tasks: list[TaskEntity]) -> None:
+        await self._repo.create_new_tasks(tasks)
+
+    async def update_tasks(self, tasks: list[TaskEntity]) -> set[str]:
+        updated = await self._repo.update_tasks(tasks)
+        self._pending.update(updated)
+        return updated
+
+    async def delete_tasks(self, task_uuids: list[str]) -> set[str]:
+        deleted = await self._repo.delete_tasks(task_uuids)
+        self._pending.update(deleted)
+        return deleted
+
+    async def get_changes(
+        self, cursor: ChangeCursor | None, limit: int
+    ) -> list[TaskChange]:
+        return await self._repo.get_changes(cursor, limit)
+
+
+@dataclass
+class CachingUnitOfWork(UnitOfWork):
+    """
+    Единица работы, инвалидирующая кэш пакетных изменений после фиксации.
+    """
+
+    _uow: UnitOfWork
+    _repo: CachingTaskRepo
+
+    async def commit(self) -> None:
+        await self._uow.commit()
+        await self._repo.flush_invalidations()
+
+    async def rollback(self) -> None:
+        await self._uow.rollback()
+        self._repo.discard_invalidations()
@@ -0,0 +1,131 @@
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, Callable
+
+import asyncpg
+
+
+class AsyncpgDatabase:
+    """
+    Пул соединений asyncpg, открываемый на время жизни приложения.
+
+    asyncpg подготавливает каждый выполняемый запрос и кэширует подготовленные
+    выражения в LRU-кэше соединения (statement_cache_size), поэтому повторные
+    запросы репозитория не тратят время на разбор и планирование.
+    Пул открывает min_size соединений одновременно при старте; init выполняется
+    на каждом новом соединении и может заранее заполнить этот кэш.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 15,
+        max_size: int = 30,
+        statement_cache_size: int = 256,
+        init: Callable[[asyncpg.Connection], Awaitable[None]] | None = None,
+    ) -> None:
+        """
+        Инициализация пула.
+
+        :param dsn: Строка подключения к Postgres в формате libpq.
+        :param min_size: Количество соединений, открываемых при старте.
+        :param max_size: Максимальное количество соединений.
+        :param statement_cache_size: Размер кэша подготовленных выражений соединения.
+        :param init: Функция, выполняемая на каждом новом соединении.
+        """
+        self._dsn = dsn
+        self._min_size = min_size
+        self._max_size = max_size
+        self._statement_cache_size = statement_cache_size
+        self._init = init
+        self._pool: asyncpg.Pool | None = None
+
+    @property
+    def pool(self) -> asyncpg.Pool:
+        if self._pool is None:
+            raise RuntimeError("asyncpg pool is not started")
+        return self._pool
+
+    async def __aenter__(self) -> "AsyncpgDatabase":
+        self._pool = await asyncpg.create_pool(
+            self._dsn,
+            min_size=self._min_size,
+            max_size=self._max_size,
+            statement_cache_size=self._statement_cache_size,
+            init=self._init,
+        )
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+
+class AsyncpgSession:
+    """
+    Сессия запроса поверх пула asyncpg.
+
+    Одиночные операции берут соединение из пула на время одного запроса.
+    Пакетные операции открывают транзакцию на выделенном соединении, которая
+    фиксируется через commit, как у сессии SQLAlchemy.
+    """
+
+    def __init__(self, pool: asyncpg.Pool) -> None:
+        self._pool = pool
+        self._connection: asyncpg.Connection | None = None
+        self._transaction: Any = None
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[asyncpg.Connection]:
+        """
+        Соединение для одиночной операции.
+        Если в сессии открыта транзакция, используется ее соединение.
+        """
+        if self._connection is not None:
+            yield self._connection
+            return
+        async with self._pool.acquire() as connection:
+            yield connection
+
+    async def transaction(self) -> asyncpg.Connection:
+        """
+        Соединение с открытой транзакцией, которая фиксируется через commit.
+        """
+        if self._connection is None:
+            self._connection = await self._pool.acquire()
+            self._transaction = self._connection.transaction()
+            await self._transaction.start()
+        return self._connection
+
+    async def _release(self) -> None:
+        if self._connection is not None:
+            await self._pool.release(self._connection)
+            self._connection = None
+            self._transaction = None
+
+    async def commit(self) -> None:
+        if self._transaction is not None:
+            await self._transaction.commit()
+        await self._release()
+
+    async def rollback(self) -> None:
+        if self._transaction is not None:
+            await self._transaction.rollback()
+        await self._release()
+
+    async def close(self) -> None:
+        await self.rollback()
+
+
+async def new_asyncpg_session(database: AsyncpgDatabase) -> AsyncGenerator:
+    """
+    Асинхронная функция для создания новой сессии asyncpg.
+
+    :param database: Пул соединений asyncpg.
+    :yield: Сессия запроса.
+    """
+    session = AsyncpgSession(database.pool)
+    try:
+        yield session
+    finally:
+        await session.close()
@@ -1,31 +1,188 @@
-from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
-from typing import AsyncContextManager, AsyncGenerator, Callable
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from typing import Any, AsyncContextManager, AsyncGenerator, Callable
 
-from src.presentation.api.config import WebConfig
+from src.infra.metrics.pool import InstrumentedAsyncAdaptedQueuePool, instrument_pool
+from src.infra.metrics.slow_queries import SlowQueryLog, instrument_slow_queries
+from src.presentation.api.config import WebConfig, is_sqlite_uri
 
+# Прагмы, применяемые к каждому соединению с SQLite.
+# WAL позволяет читателям работать параллельно с писателем, synchronous=NORMAL
+# в режиме WAL не синхронизирует журнал на диск при каждой фиксации (при сбое
+# питания теряются последние транзакции, но база остается целой), mmap_size
+# читает страницы через отображение файла в память без лишнего копирования.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "busy_timeout": 5000,
+}
 
-def create_session_maker(config: WebConfig) -> Callable[[], AsyncContextManager]:
+
+def create_session_maker(
+    config: WebConfig,
+    db_uri: str | None = None,
+    name: str = "primary",
+    read_only: bool = False,
+    slow_queries: SlowQueryLog | None = None,
+) -> Callable[[], AsyncContextManager]:
     """
     Функция для создания фабрики сессий для работы с базой данных.
 
-    :param config: Конфигурация, содержащая строку подключения к базе данных.
+    SQLite допускает только одного писателя, поэтому пул пишущих соединений
+    с файлом SQLite состоит из одного соединения: запросы на запись ждут
+    своей очереди в пуле, а не получают SQLITE_BUSY. Читающим сессиям нужна
+    отдельная фабрика с read_only=True и полным размером пула.
+
+    :param config: Конфигурация, содержащая строку подключения и параметры пула.
+    :param db_uri: Строка подключения, заменяющая основную (например, для реплики).
+    :param name: Имя пула соединений в метриках.
+    :param read_only: Фабрика только для чтения (учитывается для SQLite).
+    :param slow_queries: Журнал медленных запросов; None — запросы не замеряются.
     :return: Фабрика сессий, которая может быть использована для создания асинхронных сессий.
     """
-    db_uri = config.async_db_uri
+    db_uri = db_uri or config.async_db_uri
+    sqlite = is_sqlite_uri(db_uri)
+    pool_size, max_overflow = config.pool_size, config.max_overflow
+    if sqlite and not read_only:
+        pool_size, max_overflow = 1, 0
 
-    engine = create_async_engine(db_uri, echo=True, pool_size=15, max_overflow=15)
+    engine = create_async_engine(
+        db_uri,
+        echo=config.echo,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        pool_logging_name=name,
+    )
+    instrument_pool(engine, name)
+    if slow_queries is not None:
+        instrument_slow_queries(engine, name, slow_queries)
+    if sqlite:
+        configure_sqlite(engine, read_only)
 
     return async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
 
 
+def configure_sqlite(engine: AsyncEngine, read_only: bool) -> None:
+    """
+    Настройка соединений с SQLite: прагмы SQLITE_PRAGMAS и явное начало транзакций.
+
+    Пишущие транзакции начинаются с BEGIN IMMEDIATE и сразу берут блокировку
+    записи. При обычном BEGIN транзакция, начавшая с чтения, не может повысить
+    блокировку, если другой процесс уже пишет, и сразу завершается SQLITE_BUSY
+    без ожидания busy_timeout. Читающие соединения переводятся в query_only.
+
+    :param engine: Асинхронный движок SQLite.
+    :param read_only: Соединения только для чтения.
+    """
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _connect(dbapi_connection: Any, connection_record: Any) -> None:
+        # Транзакциями управляет событие begin, а не неявная логика драйвера sqlite3.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
+        if read_only:
+            cursor.execute("PRAGMA query_only = ON")
+        cursor.close()
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def _begin(connection: Any) -> None:
+        connection.exec_driver_sql("BEGIN" if read_only else "BEGIN IMMEDIATE")
+
+
+class LazySession:
+    """
+    Прокси AsyncSession, создающий сессию только при первом обращении.
+    Запрос, который не обращается к базе данных (например, при попадании в кэш),
+    не создает сессию и не занимает соединение из пула.
+
+    В режиме release_after_read сессия закрывается сразу после каждого
+    читающего запроса, и соединение возвращается в пул, не дожидаясь
+    сериализации и отправки ответа. Этот режим предназначен только для сессий,
+    через которые ничего не записывается.
+    """
+
+    def __init__(
+        self,
+        session_maker: Callable[[], AsyncSession],
+        release_after_read: bool = False,
+    ) -> None:
+        """
+        Инициализация прокси.
+
+        :param session_maker: Фабрика сессий.
+        :param release_after_read: Возвращать соединение в пул после каждого чтения.
+        """
+        self._session_maker = session_maker
+        self._release_after_read = release_after_read
+        self._session: AsyncSession | None = None
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._session_maker()
+        return self._session
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    async def _release(self) -> None:
+        if self._release_after_read and self._session is not None:
+            await self._session.close()
+
+    async def get(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await self.session.get(*args, **kwargs)
+        finally:
+            await self._release()
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await self.session.scalar(*args, **kwargs)
+        finally:
+            await self._release()
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        return (await self.execute(*args, **kwargs)).scalars()
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        if not self._release_after_read:
+            return await self.session.execute(*args, **kwargs)
+        try:
+            # Результат материализуется до закрытия сессии, чтобы его можно было
+            # прочитать после возврата соединения в пул.
+            result = await self.session.execute(*args, **kwargs)
+            return result.freeze()()
+        finally:
+            await self._release()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+
+
 async def new_session(
-    session_maker: Callable[[], AsyncContextManager],
+    session_maker: Callable[[], AsyncSession],
+    release_after_read: bool = False,
 ) -> AsyncGenerator:
     """
     Асинхронная функция для создания новой сессии.
+    Сессия создается лениво: соединение берется из пула только при первом запросе к БД.
 
     :param session_maker: Фабрика сессий.
+    :param release_after_read: Возвращать соединение в пул после каждого чтения.
     :yield: Асинхронная сессия для работы с базой данных.
     """
-    async with session_maker() as session:
+    session = LazySession(session_maker, release_after_read)
+    try:
         yield session
+    finally:
+        await session.close()
@@ -14,6 +14,7 @@ def convert_task_entity_to_task_model(task: TaskEntity) -> TaskModel:
         title=task.title,
         description=task.description,
         status=task.status,
+        version=task.version,
     )
 
 
@@ -29,4 +30,5 @@ def convert_task_model_to_task_entity(task: TaskModel) -> TaskEntity:
         title=task.title,
         description=task.description,
         status=task.status,
+        version=task.version,
     )
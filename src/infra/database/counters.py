@@ -0,0 +1,70 @@
+"""
+Пересчет таблицы счетчиков task_status_counts по фактическому содержимому tasks.
+
+Нужен после операций, которые обходят триггеры (TRUNCATE, COPY с отключенными
+триггерами, ручные правки), и для проверки расхождений. Запуск:
+
+    python -m src.infra.database.counters
+"""
+
+import asyncio
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.domain.entities import Status
+from src.infra.database.connection import create_session_maker
+from src.infra.database.models.task import Task as TaskModel
+from src.infra.database.models.task_status_count import TaskStatusCount
+from src.presentation.api.config import load_web_config
+
+
+async def reconcile_task_counts(session: AsyncSession) -> dict[Status, int]:
+    """
+    Пересчет счетчиков задач по статусам в одной транзакции.
+
+    Блокировка таблицы счетчиков ждет завершения транзакций, которые уже
+    изменили счетчики, и задерживает обновление счетчиков новыми записями до
+    фиксации пересчета. Поэтому подсчет видит все учтенные изменения, а
+    изменения, сделанные после него, применяются поверх нового значения.
+    В SQLite пишущая транзакция начинается с BEGIN IMMEDIATE и сама
+    блокирует запись в базу до фиксации.
+
+    :param session: Асинхронная сессия основной БД.
+    :return: Количество задач в каждом статусе после пересчета.
+    """
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        await session.execute(text("LOCK TABLE task_status_counts IN EXCLUSIVE MODE"))
+    result = await session.execute(
+        select(TaskModel.status, func.count()).group_by(TaskModel.status)
+    )
+    counts = dict.fromkeys(Status, 0)
+    counts.update(result.all())
+
+    insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    query = insert(TaskStatusCount).values(
+        [{"status": status, "count": count} for status, count in counts.items()]
+    )
+    await session.execute(
+        query.on_conflict_do_update(
+            index_elements=[TaskStatusCount.status],
+            set_={"count": query.excluded.count},
+        )
+    )
+    await session.commit()
+    return counts
+
+
+async def main() -> None:
+    session_maker = create_session_maker(load_web_config())
+    async with session_maker() as session:
+        counts = await reconcile_task_counts(session)
+    await session_maker.kw["bind"].dispose()
+    for status, count in counts.items():
+        print(f"{status.value}: {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+import contextlib
+from typing import Any, AsyncIterator, Callable
+
+from src.application.interfaces import TaskExporter
+from src.domain.entities import Status
+from src.domain.entities import Task as TaskEntity
+from src.infra.database.repositories.task import BaseTaskRepo
+
+
+class SessionTaskExporter(TaskExporter):
+    """
+    Потоковая выгрузка задач в собственной сессии.
+
+    Тело потокового ответа отправляется после завершения зависимостей запроса,
+    поэтому сессия запроса к этому моменту уже закрыта. Выгрузка открывает
+    сессию при чтении первой задачи и закрывает ее, когда поток закончился
+    или был закрыт.
+    """
+
+    def __init__(
+        self,
+        sessions: Callable[[], AsyncIterator[Any]],
+        repo_factory: Callable[[Any], BaseTaskRepo],
+    ) -> None:
+        """
+        Инициализация.
+
+        :param sessions: Генератор читающих сессий.
+        :param repo_factory: Фабрика репозитория поверх сессии.
+        """
+        self._sessions = sessions
+        self._repo_factory = repo_factory
+
+    async def export_tasks(self, status: Status | None) -> AsyncIterator[TaskEntity]:
+        """
+        Потоковая выгрузка всех задач по статусу.
+
+        :param status: Статус задач (может быть None, если нужно выгрузить все задачи).
+        :yield: Сущности задач.
+        """
+        async with contextlib.aclosing(self._sessions()) as sessions:
+            repo = self._repo_factory(await anext(sessions))
+            async with contextlib.aclosing(repo.stream_tasks(status)) as tasks:
+                async for task in tasks:
+                    yield task
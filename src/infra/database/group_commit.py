@@ -0,0 +1,135 @@
+import asyncio
+import contextlib
+from typing import Any, AsyncIterator, Callable
+
+from src.domain.entities import Task as TaskEntity
+from src.infra.database.repositories.task import BaseTaskRepo
+from src.infra.metrics.collectors import TASK_GROUP_COMMIT_BATCH_SIZE
+
+_Pending = tuple[TaskEntity, asyncio.Future]
+
+
+class GroupCommitWriter:
+    """
+    Групповая фиксация создаваемых задач.
+
+    Задачи, созданные параллельными запросами в течение окна window секунд
+    (но не более max_rows), записываются одним многострочным INSERT и одной
+    фиксацией транзакции. Каждый запрос ждет фиксации своего пакета.
+    Если пакет отклонен целиком, его задачи записываются по одной, чтобы
+    ошибка досталась только тому запросу, чья задача ее вызвала.
+
+    Пакеты записываются последовательно в отдельной сессии; пока пакет
+    записывается, в очереди копится следующий.
+    """
+
+    def __init__(
+        self,
+        sessions: Callable[[], AsyncIterator[Any]],
+        repo_factory: Callable[[Any], BaseTaskRepo],
+        window: float = 0.002,
+        max_rows: int = 256,
+    ) -> None:
+        """
+        Инициализация писателя.
+
+        :param sessions: Генератор сессий, как у зависимости сессии запроса.
+        :param repo_factory: Фабрика репозитория поверх сессии.
+        :param window: Время ожидания других задач после первой задачи пакета.
+        :param max_rows: Максимальное количество задач в пакете.
+        """
+        self._sessions = sessions
+        self._repo_factory = repo_factory
+        self._window = window
+        self._max_rows = max_rows
+        self._queue: asyncio.Queue[_Pending | None] = asyncio.Queue()
+        self._full = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "GroupCommitWriter":
+        self._flusher = asyncio.create_task(self._run())
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        # Задачи, поставленные до остановки, записываются до выхода.
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None:
+            self._queue.put_nowait(None)
+            await flusher
+
+    async def create_new_task(self, task: TaskEntity) -> None:
+        """
+        Создание задачи в составе ближайшего пакета.
+
+        :param task: Сущность задачи, которую необходимо сохранить.
+        :raises RuntimeError: Если писатель не запущен.
+        """
+        if self._flusher is None:
+            raise RuntimeError("GroupCommitWriter is not running")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((task, future))
+        if self._queue.qsize() >= self._max_rows - 1:
+            self._full.set()
+        await future
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                return
+            if item[1].done():
+                continue
+            batch = [item]
+            # Ожидается событие, а не сама очередь: отмена queue.get() по таймауту
+            # может потерять уже извлеченный элемент.
+            if self._queue.qsize() < self._max_rows - 1:
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._full.wait(), self._window)
+            self._full.clear()
+            while len(batch) < self._max_rows and not self._queue.empty():
+                item = self._queue.get_nowait()
+                if item is None:
+                    stopping = True
+                    break
+                if not item[1].done():
+                    batch.append(item)
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        # Задачи запросов, отмененных до записи пакета, не записываются.
+        pending = [(task, future) for task, future in batch if not future.done()]
+        if not pending:
+            return
+        TASK_GROUP_COMMIT_BATCH_SIZE.observe(len(pending))
+        try:
+            await self._write([task for task, _ in pending])
+        except Exception as error:
+            if len(pending) == 1:
+                _resolve(pending[0][1], error)
+                return
+            for task, future in pending:
+                try:
+                    await self._write([task])
+                except Exception as task_error:
+                    _resolve(future, task_error)
+                else:
+                    _resolve(future, None)
+            return
+        for _, future in pending:
+            _resolve(future, None)
+
+    async def _write(self, tasks: list[TaskEntity]) -> None:
+        async with contextlib.aclosing(self._sessions()) as sessions:
+            session = await anext(sessions)
+            await self._repo_factory(session).create_new_tasks(tasks)
+            await session.commit()
+
+
+def _resolve(future: asyncio.Future, error: Exception | None) -> None:
+    if future.done():
+        return
+    if error is None:
+        future.set_result(None)
+    else:
+        future.set_exception(error)
@@ -0,0 +1,38 @@
+"""tasks status uuid index
+
+Revision ID: 8c1f4e2a9b7d
+Revises: 32d878efa9a9
+Create Date: 2026-10-18 10:02:41.120934
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c1f4e2a9b7d"
+down_revision: Union[str, None] = "32d878efa9a9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY не блокирует запись в таблицу на время построения индекса,
+    # но не может выполняться внутри транзакции.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_status_uuid",
+            "tasks",
+            ["status", "uuid"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_status_uuid", table_name="tasks", postgresql_concurrently=True
+        )
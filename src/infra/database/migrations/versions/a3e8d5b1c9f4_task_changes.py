@@ -0,0 +1,168 @@
+"""task changes
+
+Revision ID: a3e8d5b1c9f4
+Revises: f7c3a9d2b6e8
+Create Date: 2026-10-18 19:47:31.082645
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3e8d5b1c9f4"
+down_revision: Union[str, None] = "f7c3a9d2b6e8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CHANGE_TXID = "pg_current_xact_id()::text::bigint"
+
+STAMP_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION task_changes_stamp() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_txid := {CHANGE_TXID};
+    NEW.change_seq := nextval('task_change_seq');
+    RETURN NEW;
+END
+$$
+"""
+
+TOMBSTONES_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION task_tombstones_record() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_tombstones (uuid, change_txid, change_seq)
+    SELECT uuid, {CHANGE_TXID}, nextval('task_change_seq') FROM old_rows ORDER BY uuid
+    ON CONFLICT (uuid) DO UPDATE
+    SET change_txid = EXCLUDED.change_txid, change_seq = EXCLUDED.change_seq,
+        deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    "tasks_changes_update": "BEFORE UPDATE ON tasks "
+    "FOR EACH ROW EXECUTE FUNCTION task_changes_stamp()",
+    "tasks_tombstones_delete": "AFTER DELETE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_tombstones_record()",
+}
+
+SQLITE_NEXT_SEQ = "UPDATE task_change_seq SET value = value + 1; "
+SQLITE_CURRENT_SEQ = "(SELECT value FROM task_change_seq)"
+SQLITE_TRIGGERS = {
+    "tasks_changes_insert": "AFTER INSERT ON tasks BEGIN "
+    + SQLITE_NEXT_SEQ
+    + f"UPDATE tasks SET change_seq = {SQLITE_CURRENT_SEQ} WHERE uuid = new.uuid; END",
+    "tasks_changes_update": "AFTER UPDATE OF title, description, status, version "
+    "ON tasks BEGIN "
+    + SQLITE_NEXT_SEQ
+    + f"UPDATE tasks SET change_seq = {SQLITE_CURRENT_SEQ} WHERE uuid = new.uuid; END",
+    "tasks_tombstones_delete": "AFTER DELETE ON tasks BEGIN "
+    + SQLITE_NEXT_SEQ
+    + "INSERT INTO task_tombstones (uuid, change_txid, change_seq) "
+    f"VALUES (old.uuid, 0, {SQLITE_CURRENT_SEQ}) "
+    "ON CONFLICT (uuid) DO UPDATE SET change_seq = excluded.change_seq, "
+    "deleted_at = excluded.deleted_at; END",
+}
+
+
+def upgrade() -> None:
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    uuid_type = sa.Uuid(as_uuid=False).with_variant(sa.String(), "sqlite")
+
+    # Постоянное значение по умолчанию добавляется без перезаписи таблицы.
+    # Существующие задачи получают позицию (0, 0) и различаются по uuid,
+    # поэтому клиенты получат их при первой полной синхронизации.
+    op.add_column(
+        "tasks",
+        sa.Column("change_txid", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "tasks",
+        sa.Column("change_seq", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    op.create_table(
+        "task_tombstones",
+        sa.Column("uuid", uuid_type, nullable=False),
+        sa.Column("change_txid", sa.BigInteger(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("uuid", name=op.f("pk_task_tombstones")),
+    )
+    op.create_index(
+        "ix_task_tombstones_changes",
+        "task_tombstones",
+        ["change_txid", "change_seq", "uuid"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_task_tombstones_deleted_at", "task_tombstones", ["deleted_at"], unique=False
+    )
+    op.create_table(
+        "task_sync_horizon",
+        sa.Column("id", sa.SmallInteger(), nullable=False),
+        sa.Column("change_txid", sa.BigInteger(), nullable=False),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("uuid", uuid_type, nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_task_sync_horizon")),
+    )
+
+    if sqlite:
+        op.create_index(
+            "ix_tasks_changes", "tasks", ["change_txid", "change_seq", "uuid"]
+        )
+        op.execute("CREATE TABLE task_change_seq (value INTEGER NOT NULL)")
+        op.execute("INSERT INTO task_change_seq (value) VALUES (0)")
+        for name, definition in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {name} {definition}")
+        return
+
+    op.execute("CREATE SEQUENCE task_change_seq")
+    op.execute(f"ALTER TABLE tasks ALTER COLUMN change_txid SET DEFAULT {CHANGE_TXID}")
+    op.execute(
+        "ALTER TABLE tasks ALTER COLUMN change_seq SET DEFAULT nextval('task_change_seq')"
+    )
+    op.execute(STAMP_FUNCTION)
+    op.execute(TOMBSTONES_FUNCTION)
+    for name, definition in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {definition}")
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_changes",
+            "tasks",
+            ["change_txid", "change_seq", "uuid"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER {name}")
+        op.execute("DROP TABLE task_change_seq")
+    else:
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER {name} ON tasks")
+        op.execute("DROP FUNCTION task_tombstones_record()")
+        op.execute("DROP FUNCTION task_changes_stamp()")
+        op.execute("ALTER TABLE tasks ALTER COLUMN change_seq DROP DEFAULT")
+        op.execute("ALTER TABLE tasks ALTER COLUMN change_txid DROP DEFAULT")
+        op.execute("DROP SEQUENCE task_change_seq")
+    op.drop_index("ix_tasks_changes", table_name="tasks")
+    op.drop_table("task_sync_horizon")
+    op.drop_index("ix_task_tombstones_deleted_at", table_name="task_tombstones")
+    op.drop_index("ix_task_tombstones_changes", table_name="task_tombstones")
+    op.drop_table("task_tombstones")
+    op.drop_column("tasks", "change_seq")
+    op.drop_column("tasks", "change_txid")
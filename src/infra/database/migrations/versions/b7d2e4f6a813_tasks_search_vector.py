@@ -0,0 +1,90 @@
+"""tasks search vector
+
+Revision ID: b7d2e4f6a813
+Revises: 5e9a0c3d7f21
+Create Date: 2026-10-18 13:05:52.447310
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7d2e4f6a813"
+down_revision: Union[str, None] = "5e9a0c3d7f21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Конфигурация russian стеммирует русские слова, а латиницу — английским стеммером.
+# Совпадения в заголовке весят больше, чем в описании.
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', title), 'A') || "
+    "setweight(to_tsvector('russian', description), 'B')"
+)
+
+# В SQLite вместо колонки search_vector используется индекс FTS5 tasks_fts,
+# связанный с tasks по rowid и поддерживаемый триггерами.
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    # Индексирование уже существующих задач.
+    "INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        return
+
+    # Добавление STORED-колонки переписывает таблицу под эксклюзивной блокировкой,
+    # поэтому миграцию нужно проводить в окно обслуживания.
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR, persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_search_vector",
+            "tasks",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for trigger in ("tasks_fts_insert", "tasks_fts_delete", "tasks_fts_update"):
+            op.execute(f"DROP TRIGGER {trigger}")
+        op.execute("DROP TABLE tasks_fts")
+        return
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_tasks_search_vector", table_name="tasks", postgresql_concurrently=True
+        )
+    op.drop_column("tasks", "search_vector")
@@ -0,0 +1,127 @@
+"""task status counts
+
+Revision ID: d1a6c8e0f4b2
+Revises: b7d2e4f6a813
+Create Date: 2026-10-18 14:21:37.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d1a6c8e0f4b2"
+down_revision: Union[str, None] = "b7d2e4f6a813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS_FUNCTION = """
+CREATE OR REPLACE FUNCTION task_status_counts_refresh() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_status_counts (status, count)
+        SELECT status, count(*) FROM new_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE
+        SET count = task_status_counts.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_status_counts (status, count)
+        SELECT status, -count(*) FROM old_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE
+        SET count = task_status_counts.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO task_status_counts (status, count)
+        SELECT status, sum(delta) FROM (
+            SELECT n.status, 1 AS delta
+            FROM new_rows n JOIN old_rows o USING (uuid)
+            WHERE n.status <> o.status
+            UNION ALL
+            SELECT o.status, -1 AS delta
+            FROM new_rows n JOIN old_rows o USING (uuid)
+            WHERE n.status <> o.status
+        ) AS changes
+        GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE
+        SET count = task_status_counts.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+TRIGGERS = {
+    "tasks_status_counts_insert": "AFTER INSERT ON tasks "
+    "REFERENCING NEW TABLE AS new_rows",
+    "tasks_status_counts_update": "AFTER UPDATE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    "tasks_status_counts_delete": "AFTER DELETE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows",
+}
+
+# В SQLite нет триггеров уровня выражения, поэтому счетчики обновляются построчно.
+SQLITE_TRIGGERS = {
+    "tasks_status_counts_insert": "AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO task_status_counts (status, count) VALUES (new.status, 1) "
+    "ON CONFLICT (status) DO UPDATE SET count = count + 1; END",
+    "tasks_status_counts_update": "AFTER UPDATE OF status ON tasks "
+    "WHEN old.status <> new.status BEGIN "
+    "INSERT INTO task_status_counts (status, count) VALUES (new.status, 1) "
+    "ON CONFLICT (status) DO UPDATE SET count = count + 1; "
+    "UPDATE task_status_counts SET count = count - 1 WHERE status = old.status; END",
+    "tasks_status_counts_delete": "AFTER DELETE ON tasks BEGIN "
+    "UPDATE task_status_counts SET count = count - 1 WHERE status = old.status; END",
+}
+
+
+def upgrade() -> None:
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    status_type = (
+        sa.Enum("TODO", "IN_PROGRESS", "DONE", name="status_enum")
+        if sqlite
+        else postgresql.ENUM(name="status_enum", create_type=False)
+    )
+    op.create_table(
+        "task_status_counts",
+        sa.Column("status", status_type, nullable=False),
+        sa.Column("count", sa.BigInteger(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("status", name=op.f("pk_task_status_counts")),
+    )
+    if sqlite:
+        # В SQLite нет LOCK TABLE: миграцию нужно проводить, пока приложение
+        # не пишет в базу, иначе записи между подсчетом и триггерами не будут учтены.
+        op.execute(
+            "INSERT INTO task_status_counts (status, count) "
+            "SELECT status, count(*) FROM tasks GROUP BY status"
+        )
+        for name, definition in SQLITE_TRIGGERS.items():
+            op.execute(f"CREATE TRIGGER {name} {definition}")
+        return
+
+    op.execute(COUNTERS_FUNCTION)
+    # Блокировка не дает записям появиться между начальным подсчетом
+    # и созданием триггеров, иначе они не попали бы в счетчики.
+    op.execute("LOCK TABLE tasks IN SHARE MODE")
+    op.execute(
+        "INSERT INTO task_status_counts (status, count) "
+        "SELECT status, count(*) FROM tasks GROUP BY status"
+    )
+    for name, definition in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER {name} {definition} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_refresh()"
+        )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER {name}")
+    else:
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER {name} ON tasks")
+        op.execute("DROP FUNCTION task_status_counts_refresh()")
+    op.drop_table("task_status_counts")
@@ -0,0 +1,130 @@
+"""tasks native uuid
+
+Revision ID: e4b9f2c7a1d5
+Revises: d1a6c8e0f4b2
+Create Date: 2026-10-18 16:40:12.518377
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b9f2c7a1d5"
+down_revision: Union[str, None] = "d1a6c8e0f4b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 5000
+
+# Пока идет перенос, триггер заполняет новую колонку у вставляемых
+# и изменяемых строк, чтобы после заполнения старых строк она была полной.
+SYNC_FUNCTION = """
+CREATE OR REPLACE FUNCTION tasks_uuid_new_sync() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.uuid_new := NEW.uuid::uuid;
+    RETURN NEW;
+END
+$$
+"""
+
+BACKFILL = sa.text(
+    """
+    WITH batch AS (
+        SELECT uuid FROM tasks WHERE uuid > :after ORDER BY uuid LIMIT :size
+    )
+    UPDATE tasks SET uuid_new = tasks.uuid::uuid
+    FROM batch WHERE tasks.uuid = batch.uuid
+    RETURNING tasks.uuid
+    """
+)
+
+
+def upgrade() -> None:
+    # В SQLite uuid остается строкой (см. TaskUuid в модели): смена типа колонки
+    # потребовала бы пересоздания таблицы вместе с триггерами поиска и счетчиков.
+    if op.get_bind().dialect.name == "sqlite":
+        return
+
+    # Перенос выполняется без долгих блокировок: колонка добавляется
+    # без значения по умолчанию, заполняется пакетами в отдельных транзакциях,
+    # индексы строятся CONCURRENTLY, а ACCESS EXCLUSIVE берется только
+    # на короткую замену колонок в конце.
+    op.add_column("tasks", sa.Column("uuid_new", postgresql.UUID(), nullable=True))
+    op.execute(SYNC_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER tasks_uuid_new_sync BEFORE INSERT OR UPDATE OF uuid ON tasks "
+        "FOR EACH ROW EXECUTE FUNCTION tasks_uuid_new_sync()"
+    )
+
+    with op.get_context().autocommit_block():
+        # Пакеты выбираются по первичному ключу, а не по uuid_new IS NULL,
+        # чтобы каждый пакет читал только свои строки.
+        after = ""
+        while True:
+            rows = op.get_bind().execute(
+                BACKFILL, {"after": after, "size": BACKFILL_BATCH_SIZE}
+            )
+            uuids = rows.scalars().all()
+            if not uuids:
+                break
+            after = max(uuids)
+
+        op.create_index(
+            "uq_tasks_uuid_new",
+            "tasks",
+            ["uuid_new"],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_status_uuid_new",
+            "tasks",
+            ["status", "uuid_new"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+    # Проверенное ограничение CHECK позволяет SET NOT NULL не сканировать таблицу
+    # под эксклюзивной блокировкой; VALIDATE блокирует только изменение схемы.
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT ck_tasks_uuid_new_not_null "
+        "CHECK (uuid_new IS NOT NULL) NOT VALID"
+    )
+    op.execute("ALTER TABLE tasks VALIDATE CONSTRAINT ck_tasks_uuid_new_not_null")
+
+    op.execute("LOCK TABLE tasks IN ACCESS EXCLUSIVE MODE")
+    op.execute("ALTER TABLE tasks ALTER COLUMN uuid_new SET NOT NULL")
+    op.execute("ALTER TABLE tasks DROP CONSTRAINT ck_tasks_uuid_new_not_null")
+    op.execute("DROP TRIGGER tasks_uuid_new_sync ON tasks")
+    op.execute("DROP FUNCTION tasks_uuid_new_sync()")
+    # Вместе со старой колонкой удаляются pk_tasks, uq_tasks_uuid
+    # и ix_tasks_status_uuid; отдельный уникальный индекс первичному ключу не нужен.
+    op.drop_column("tasks", "uuid")
+    op.alter_column("tasks", "uuid_new", new_column_name="uuid")
+    op.execute(
+        "ALTER TABLE tasks ADD CONSTRAINT pk_tasks PRIMARY KEY USING INDEX uq_tasks_uuid_new"
+    )
+    op.execute("ALTER INDEX ix_tasks_status_uuid_new RENAME TO ix_tasks_status_uuid")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        return
+
+    # Обратное преобразование переписывает таблицу под эксклюзивной блокировкой,
+    # поэтому его нужно проводить в окно обслуживания.
+    op.alter_column(
+        "tasks",
+        "uuid",
+        type_=sa.String(),
+        existing_type=postgresql.UUID(),
+        existing_nullable=False,
+        postgresql_using="uuid::text",
+    )
+    op.create_unique_constraint(op.f("uq_tasks_uuid"), "tasks", ["uuid"])
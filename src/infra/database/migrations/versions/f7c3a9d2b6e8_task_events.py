@@ -0,0 +1,87 @@
+"""task events
+
+Revision ID: f7c3a9d2b6e8
+Revises: e4b9f2c7a1d5
+Create Date: 2026-10-18 18:12:05.330219
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from src.infra.database.models.task_event import EVENTS_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f7c3a9d2b6e8"
+down_revision: Union[str, None] = "e4b9f2c7a1d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    sqlite = op.get_bind().dialect.name == "sqlite"
+    status_type = (
+        sa.Enum("TODO", "IN_PROGRESS", "DONE", name="status_enum")
+        if sqlite
+        else postgresql.ENUM(name="status_enum", create_type=False)
+    )
+    op.create_table(
+        "task_events",
+        sa.Column(
+            "id", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), nullable=False
+        ),
+        sa.Column("txid", sa.BigInteger(), nullable=False),
+        sa.Column("op", sa.String(length=6), nullable=False),
+        sa.Column(
+            "task_uuid",
+            sa.Uuid(as_uuid=False).with_variant(sa.String(), "sqlite"),
+            nullable=False,
+        ),
+        sa.Column("status", status_type, nullable=False),
+        sa.Column("previous_status", status_type, nullable=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_task_events")),
+    )
+    op.create_index(
+        "ix_task_events_created_at",
+        "task_events",
+        ["created_at"],
+        unique=False,
+        postgresql_using="brin",
+    )
+    op.create_index(
+        "ix_task_events_position", "task_events", ["txid", "id"], unique=False
+    )
+    op.create_table(
+        "task_events_lease",
+        sa.Column("id", sa.SmallInteger(), nullable=False),
+        sa.Column("listening_until", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_task_events_lease")),
+    )
+    # Лента событий работает только через Postgres LISTEN/NOTIFY.
+    if sqlite:
+        return
+
+    for statement in EVENTS_DDL:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        for trigger in ("tasks_events_insert", "tasks_events_update", "tasks_events_delete"):
+            op.execute(f"DROP TRIGGER {trigger} ON tasks")
+        op.execute("DROP FUNCTION task_events_publish()")
+    op.drop_table("task_events_lease")
+    op.drop_index("ix_task_events_position", table_name="task_events")
+    op.drop_index("ix_task_events_created_at", table_name="task_events")
+    op.drop_table("task_events")
@@ -1,4 +1,14 @@
 from .base import Base
 from .task import Task
+from .task_event import TaskEvent
+from .task_status_count import TaskStatusCount
+from .task_tombstone import TaskSyncHorizon, TaskTombstone
 
-__all__ = ["Task", "Base"]
+__all__ = [
+    "Task",
+    "TaskEvent",
+    "TaskStatusCount",
+    "TaskSyncHorizon",
+    "TaskTombstone",
+    "Base",
+]
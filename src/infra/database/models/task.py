@@ -1,19 +1,96 @@
 from sqlalchemy.orm import Mapped, mapped_column
-from sqlalchemy import Enum
+from sqlalchemy import DDL, BigInteger, Enum, Index, String, Uuid, event
 
 from src.infra.database.models.base import Base
 from src.domain.entities import Status
 
 
+# В Postgres uuid хранится нативным типом UUID (16 байт вместо 36 символов),
+# в SQLite — строкой в каноническом виде, как и раньше: смена типа колонки
+# в SQLite требует пересоздания таблицы вместе с ее триггерами.
+TaskUuid = Uuid(as_uuid=False).with_variant(String(), "sqlite")
+
+
 class Task(Base):
     __tablename__ = "tasks"
     __mapper_args__ = {"eager_defaults": True}
-
-    uuid: Mapped[str] = mapped_column(
-        "uuid", primary_key=True, unique=True, nullable=False
+    __table_args__ = (
+        Index("ix_tasks_status_uuid", "status", "uuid"),
+        Index("ix_tasks_changes", "change_txid", "change_seq", "uuid"),
     )
+    # Вычисляемая колонка search_vector с GIN-индексом есть только в Postgres
+    # (миграция b7d2e4f6a813) и не объявлена в модели, чтобы схема создавалась
+    # и в других СУБД; TaskRepo.search_tasks обращается к ней напрямую.
+    # В SQLite вместо нее используется таблица FTS5 tasks_fts.
+    # При create_all они добавляются событиями ниже.
+
+    uuid: Mapped[str] = mapped_column("uuid", TaskUuid, primary_key=True)
     title: Mapped[str] = mapped_column("title", nullable=False)
     description: Mapped[str] = mapped_column("description", nullable=False)
     status: Mapped[Status] = mapped_column(
         Enum(Status, name="status_enum"), nullable=False
     )
+    version: Mapped[int] = mapped_column(
+        "version", nullable=False, default=1, server_default="1"
+    )
+    # Позиция последнего изменения задачи для синхронизации (GET /tasks/changes).
+    # Значения назначает БД (см. models/task_tombstone.py), а не приложение.
+    change_txid: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+    change_seq: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, server_default="0"
+    )
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', title), 'A') || "
+    "setweight(to_tsvector('russian', description), 'B')"
+)
+
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE tasks ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
+
+# Индекс FTS5 с внешним содержимым: текст хранится только в tasks, индекс
+# связан с ней по rowid и поддерживается триггерами. VACUUM может изменить rowid
+# таблицы без INTEGER PRIMARY KEY, поэтому после него индекс нужно перестроить:
+# INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild').
+SQLITE_SEARCH_DDL = (
+    "CREATE VIRTUAL TABLE tasks_fts USING fts5("
+    "title, description, content='tasks', content_rowid='rowid', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+    "CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); END",
+    "CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN "
+    "INSERT INTO tasks_fts (tasks_fts, rowid, title, description) "
+    "VALUES ('delete', old.rowid, old.title, old.description); "
+    "INSERT INTO tasks_fts (rowid, title, description) "
+    "VALUES (new.rowid, new.title, new.description); END",
+)
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite"),
+)
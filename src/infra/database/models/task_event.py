@@ -0,0 +1,132 @@
+from datetime import datetime
+
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    DateTime,
+    Enum,
+    Index,
+    Integer,
+    SmallInteger,
+    String,
+    event,
+    func,
+)
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infra.database.models.base import Base
+from src.infra.database.models.task import TaskUuid
+from src.infra.database.models.task_tombstone import CHANGE_TXID
+from src.domain.entities import Status
+
+TASK_EVENTS_CHANNEL = "task_events"
+
+
+class TaskEvent(Base):
+    """
+    Журнал изменений задач для ленты событий.
+    Заполняется триггерами таблицы tasks в Postgres; позволяет клиенту
+    продолжить ленту с последнего полученного события.
+    """
+
+    __tablename__ = "task_events"
+    # Журнал только дополняется, поэтому BRIN-индекса по времени достаточно
+    # для удаления старых событий.
+    __table_args__ = (
+        Index("ix_task_events_created_at", "created_at", postgresql_using="brin"),
+        Index("ix_task_events_position", "txid", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer, "sqlite"), primary_key=True
+    )
+    # Номер записавшей событие транзакции; события отдаются в порядке (txid, id).
+    txid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    op: Mapped[str] = mapped_column(String(6), nullable=False)
+    task_uuid: Mapped[str] = mapped_column(TaskUuid, nullable=False)
+    status: Mapped[Status] = mapped_column(
+        Enum(Status, name="status_enum"), nullable=False
+    )
+    previous_status: Mapped[Status | None] = mapped_column(
+        Enum(Status, name="status_enum"), nullable=True
+    )
+    version: Mapped[int] = mapped_column(nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class TaskEventsLease(Base):
+    """
+    Срок, до которого журнал task_events читает хотя бы один процесс
+    с включенной лентой событий (одна строка). Процессы продлевают срок,
+    а по его истечении триггеры перестают записывать события,
+    поэтому без ленты журнал не растет.
+    """
+
+    __tablename__ = "task_events_lease"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+    listening_until: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+
+
+# Триггеры уровня выражения записывают по событию на каждую измененную строку
+# вместе с номером транзакции. Номера событий выдаются до фиксации, поэтому
+# транзакция с меньшим номером может стать видна позже; как и изменения
+# для GET /tasks/changes (см. models/task_tombstone.py), события отдаются
+# в порядке (txid, id) и только от транзакций старше xmin снимка.
+#
+# Уведомление в канале task_events содержит только номер транзакции:
+# слушатель по нему читает новые события из журнала, поэтому размер
+# изменения не ограничен лимитом NOTIFY в 8000 байт. Одинаковые уведомления
+# одной транзакции Postgres объединяет.
+EVENTS_DDL = (
+    "INSERT INTO task_events_lease (id, listening_until) VALUES (1, '-infinity') "
+    "ON CONFLICT (id) DO NOTHING",
+    f"""
+CREATE OR REPLACE FUNCTION task_events_publish() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM task_events_lease WHERE listening_until > now()) THEN
+        RETURN NULL;
+    END IF;
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_events (txid, op, task_uuid, status, version)
+        SELECT {CHANGE_TXID}, 'create', uuid, status, version
+        FROM new_rows ORDER BY uuid;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_events (txid, op, task_uuid, status, version)
+        SELECT {CHANGE_TXID}, 'delete', uuid, status, version
+        FROM old_rows ORDER BY uuid;
+    ELSE
+        INSERT INTO task_events (txid, op, task_uuid, status, previous_status, version)
+        SELECT {CHANGE_TXID}, 'update', n.uuid, n.status, o.status, n.version
+        FROM new_rows n JOIN old_rows o USING (uuid) ORDER BY n.uuid;
+    END IF;
+    IF FOUND THEN
+        PERFORM pg_notify('{TASK_EVENTS_CHANNEL}', ({CHANGE_TXID})::text);
+    END IF;
+    RETURN NULL;
+END
+$$
+""",
+    "CREATE TRIGGER tasks_events_insert AFTER INSERT ON tasks "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_events_publish()",
+    "CREATE TRIGGER tasks_events_update AFTER UPDATE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_events_publish()",
+    "CREATE TRIGGER tasks_events_delete AFTER DELETE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_events_publish()",
+)
+
+# Миграция f7c3a9d2b6e8 выполняет эти же выражения.
+for statement in EVENTS_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
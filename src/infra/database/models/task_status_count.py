@@ -0,0 +1,100 @@
+from sqlalchemy import DDL, BigInteger, Enum, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infra.database.models.base import Base
+from src.domain.entities import Status
+
+
+class TaskStatusCount(Base):
+    """
+    Количество задач в каждом статусе.
+    Поддерживается триггерами таблицы tasks.
+    """
+
+    __tablename__ = "task_status_counts"
+
+    status: Mapped[Status] = mapped_column(
+        Enum(Status, name="status_enum"), primary_key=True
+    )
+    count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+
+
+# Триггеры уровня выражения с таблицами переходов: пакетный INSERT на тысячи строк
+# обновляет счетчики одним запросом на каждый затронутый статус, а не построчно.
+# Счетчики обновляются в порядке статусов, чтобы параллельные транзакции,
+# затрагивающие несколько статусов, не взаимоблокировались.
+COUNTERS_FUNCTION = """
+CREATE OR REPLACE FUNCTION task_status_counts_refresh() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO task_status_counts (status, count)
+        SELECT status, count(*) FROM new_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE
+        SET count = task_status_counts.count + EXCLUDED.count;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO task_status_counts (status, count)
+        SELECT status, -count(*) FROM old_rows GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE
+        SET count = task_status_counts.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO task_status_counts (status, count)
+        SELECT status, sum(delta) FROM (
+            SELECT n.status, 1 AS delta
+            FROM new_rows n JOIN old_rows o USING (uuid)
+            WHERE n.status <> o.status
+            UNION ALL
+            SELECT o.status, -1 AS delta
+            FROM new_rows n JOIN old_rows o USING (uuid)
+            WHERE n.status <> o.status
+        ) AS changes
+        GROUP BY status ORDER BY status
+        ON CONFLICT (status) DO UPDATE
+        SET count = task_status_counts.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+COUNTERS_TRIGGERS = (
+    "CREATE TRIGGER tasks_status_counts_insert AFTER INSERT ON tasks "
+    "REFERENCING NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_refresh()",
+    "CREATE TRIGGER tasks_status_counts_update AFTER UPDATE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_refresh()",
+    "CREATE TRIGGER tasks_status_counts_delete AFTER DELETE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_status_counts_refresh()",
+)
+
+# Триггеры ссылаются на обе таблицы, поэтому создаются после всей схемы.
+for statement in (COUNTERS_FUNCTION, *COUNTERS_TRIGGERS):
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+
+# В SQLite нет триггеров уровня выражения, поэтому счетчики обновляются построчно.
+# Запись в SQLite и так сериализована, поэтому конкуренции за строки счетчиков нет.
+SQLITE_COUNTERS_TRIGGERS = (
+    "CREATE TRIGGER tasks_status_counts_insert AFTER INSERT ON tasks BEGIN "
+    "INSERT INTO task_status_counts (status, count) VALUES (new.status, 1) "
+    "ON CONFLICT (status) DO UPDATE SET count = count + 1; END",
+    "CREATE TRIGGER tasks_status_counts_update AFTER UPDATE OF status ON tasks "
+    "WHEN old.status <> new.status BEGIN "
+    "INSERT INTO task_status_counts (status, count) VALUES (new.status, 1) "
+    "ON CONFLICT (status) DO UPDATE SET count = count + 1; "
+    "UPDATE task_status_counts SET count = count - 1 WHERE status = old.status; END",
+    "CREATE TRIGGER tasks_status_counts_delete AFTER DELETE ON tasks BEGIN "
+    "UPDATE task_status_counts SET count = count - 1 WHERE status = old.status; END",
+)
+
+for statement in SQLITE_COUNTERS_TRIGGERS:
+    event.listen(
+        Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
@@ -0,0 +1,136 @@
+from datetime import datetime
+
+from sqlalchemy import DDL, BigInteger, DateTime, Index, SmallInteger, event, func
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.infra.database.models.base import Base
+from src.infra.database.models.task import TaskUuid
+
+
+class TaskTombstone(Base):
+    """
+    Отметка об удалении задачи для синхронизации клиентов.
+    Создается триггером при удалении строки tasks и удаляется
+    после TASK_TOMBSTONE_RETENTION секунд задачей сжатия.
+    """
+
+    __tablename__ = "task_tombstones"
+    __table_args__ = (
+        Index("ix_task_tombstones_changes", "change_txid", "change_seq", "uuid"),
+        Index("ix_task_tombstones_deleted_at", "deleted_at"),
+    )
+
+    uuid: Mapped[str] = mapped_column(TaskUuid, primary_key=True)
+    change_txid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, server_default=func.now()
+    )
+
+
+class TaskSyncHorizon(Base):
+    """
+    Позиция последней удаленной сжатием отметки (одна строка).
+    Клиент с курсором до этой позиции мог пропустить удаления
+    и должен синхронизироваться заново.
+    """
+
+    __tablename__ = "task_sync_horizon"
+
+    id: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=1)
+    change_txid: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    change_seq: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    uuid: Mapped[str] = mapped_column(TaskUuid, nullable=False)
+
+
+# Позицию изменения назначает БД, поэтому ее получают все пути записи:
+# ORM, asyncpg, пакетные операции и групповая фиксация.
+#
+# В Postgres change_seq берется из последовательности, а change_txid — номер
+# транзакции. Номера последовательности выдаются до фиксации, поэтому транзакция
+# с меньшим номером может стать видна позже; изменения отдаются в порядке
+# (change_txid, change_seq, uuid) и только от транзакций старше xmin снимка,
+# которые уже гарантированно завершены. Так ни одно зафиксированное изменение
+# не окажется позади курсора клиента. Новые строки получают позицию значениями
+# по умолчанию, измененные — построчным триггером, удаленные превращаются
+# в отметки триггером уровня выражения.
+CHANGE_TXID = "pg_current_xact_id()::text::bigint"
+
+CHANGES_DDL = (
+    "CREATE SEQUENCE IF NOT EXISTS task_change_seq",
+    f"ALTER TABLE tasks ALTER COLUMN change_txid SET DEFAULT {CHANGE_TXID}",
+    "ALTER TABLE tasks ALTER COLUMN change_seq SET DEFAULT nextval('task_change_seq')",
+    f"""
+CREATE OR REPLACE FUNCTION task_changes_stamp() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.change_txid := {CHANGE_TXID};
+    NEW.change_seq := nextval('task_change_seq');
+    RETURN NEW;
+END
+$$
+""",
+    f"""
+CREATE OR REPLACE FUNCTION task_tombstones_record() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO task_tombstones (uuid, change_txid, change_seq)
+    SELECT uuid, {CHANGE_TXID}, nextval('task_change_seq') FROM old_rows ORDER BY uuid
+    ON CONFLICT (uuid) DO UPDATE
+    SET change_txid = EXCLUDED.change_txid, change_seq = EXCLUDED.change_seq,
+        deleted_at = EXCLUDED.deleted_at;
+    RETURN NULL;
+END
+$$
+""",
+    "CREATE TRIGGER tasks_changes_update BEFORE UPDATE ON tasks "
+    "FOR EACH ROW EXECUTE FUNCTION task_changes_stamp()",
+    "CREATE TRIGGER tasks_tombstones_delete AFTER DELETE ON tasks "
+    "REFERENCING OLD TABLE AS old_rows "
+    "FOR EACH STATEMENT EXECUTE FUNCTION task_tombstones_record()",
+)
+
+# В SQLite запись сериализована, поэтому порядок номеров совпадает с порядком
+# фиксаций и change_txid не нужен. Последовательность хранится в отдельной
+# таблице: максимум по tasks не годится, так как отметки удаляются сжатием.
+SQLITE_NEXT_SEQ = "UPDATE task_change_seq SET value = value + 1; "
+SQLITE_CURRENT_SEQ = "(SELECT value FROM task_change_seq)"
+SQLITE_CHANGES_DDL = (
+    "CREATE TABLE task_change_seq (value INTEGER NOT NULL)",
+    "INSERT INTO task_change_seq (value) VALUES (0)",
+    "CREATE TRIGGER tasks_changes_insert AFTER INSERT ON tasks BEGIN "
+    + SQLITE_NEXT_SEQ
+    + f"UPDATE tasks SET change_seq = {SQLITE_CURRENT_SEQ} WHERE uuid = new.uuid; END",
+    "CREATE TRIGGER tasks_changes_update "
+    "AFTER UPDATE OF title, description, status, version ON tasks BEGIN "
+    + SQLITE_NEXT_SEQ
+    + f"UPDATE tasks SET change_seq = {SQLITE_CURRENT_SEQ} WHERE uuid = new.uuid; END",
+    "CREATE TRIGGER tasks_tombstones_delete AFTER DELETE ON tasks BEGIN "
+    + SQLITE_NEXT_SEQ
+    + "INSERT INTO task_tombstones (uuid, change_txid, change_seq) "
+    f"VALUES (old.uuid, 0, {SQLITE_CURRENT_SEQ}) "
+    "ON CONFLICT (uuid) DO UPDATE SET change_seq = excluded.change_seq, "
+    "deleted_at = excluded.deleted_at; END",
+)
+
+# Триггеры ссылаются на tasks и task_tombstones, поэтому создаются после всей схемы.
+for statement in CHANGES_DDL:
+    event.listen(
+        Base.metadata,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+for statement in SQLITE_CHANGES_DDL:
+    event.listen(
+        Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Base.metadata,
+    "after_drop",
+    DDL("DROP SEQUENCE IF EXISTS task_change_seq").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Base.metadata,
+    "after_drop",
+    DDL("DROP TABLE IF EXISTS task_change_seq").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,97 @@
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infra.database.connection import LazySession
+
+
+class ReplicaRouter:
+    """
+    Распределение читающих сессий между репликами по кругу.
+    Реплика, на которой произошла ошибка соединения, исключается из ротации
+    на eject_seconds секунд; если исправных реплик нет, чтение идет с основной БД.
+    """
+
+    def __init__(
+        self,
+        session_makers: list[async_sessionmaker[AsyncSession]],
+        eject_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Инициализация маршрутизатора.
+
+        :param session_makers: Фабрики сессий реплик.
+        :param eject_seconds: Время исключения неисправной реплики из ротации.
+        :param clock: Источник монотонного времени.
+        """
+        self._session_makers = session_makers
+        self._eject_seconds = eject_seconds
+        self._clock = clock
+        self._ejected_until = [0.0] * len(session_makers)
+        self._next = 0
+
+    def choose(self) -> int | None:
+        """
+        Выбор следующей исправной реплики.
+
+        :return: Индекс реплики или None, если исправных реплик нет.
+        """
+        now = self._clock()
+        for _ in range(len(self._session_makers)):
+            index = self._next
+            self._next = (self._next + 1) % len(self._session_makers)
+            if self._ejected_until[index] <= now:
+                return index
+        return None
+
+    def session_maker(self, index: int) -> async_sessionmaker[AsyncSession]:
+        return self._session_makers[index]
+
+    def eject(self, index: int) -> None:
+        """
+        Исключение реплики из ротации.
+
+        :param index: Индекс реплики.
+        """
+        self._ejected_until[index] = self._clock() + self._eject_seconds
+
+    def is_healthy(self, index: int) -> bool:
+        return self._ejected_until[index] <= self._clock()
+
+
+@asynccontextmanager
+async def open_read_session(
+    router: ReplicaRouter,
+    primary_session_maker: async_sessionmaker[AsyncSession],
+    read_your_writes: bool = False,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Открытие сессии для чтения.
+    Ошибка соединения внутри контекста исключает реплику из ротации.
+
+    :param router: Маршрутизатор реплик.
+    :param primary_session_maker: Фабрика сессий основной БД.
+    :param read_your_writes: Читать с основной БД, чтобы видеть только что записанные данные.
+    :yield: Асинхронная сессия реплики или основной БД.
+    """
+    index = None if read_your_writes else router.choose()
+    if index is None:
+        session = LazySession(primary_session_maker, release_after_read=True)
+        try:
+            yield session
+        finally:
+            await session.close()
+        return
+
+    session = LazySession(router.session_maker(index), release_after_read=True)
+    try:
+        yield session
+    except (OperationalError, InterfaceError, OSError):
+        router.eject(index)
+        raise
+    finally:
+        await session.close()
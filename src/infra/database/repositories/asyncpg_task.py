@@ -0,0 +1,530 @@
+from dataclasses import dataclass
+from typing import AsyncIterator, NoReturn
+from uuid import UUID
+
+import asyncpg
+
+from src.application.pagination import TaskCursor
+from src.application.projection import TASK_FIELDS, TaskProjection
+from src.application.search import SearchCursor, SearchHit
+from src.application.sync import ChangeCursor, TaskChange, encode_change_cursor
+from src.domain.entities import Status
+from src.domain.entities import Task as TaskEntity
+from src.domain.exceptions import (
+    ChangesCursorExpiredException,
+    TaskNotFoundException,
+    TaskVersionMismatchException,
+)
+from src.infra.database.asyncpg_connection import AsyncpgSession
+from src.infra.database.repositories.task import (
+    ESTIMATE_TASK_COUNTS,
+    SEARCH_CONFIG,
+    SNAPSHOT_XMIN,
+    STREAM_FETCH_SIZE,
+    BaseTaskRepo,
+    estimate_counts,
+)
+
+# Запросы записаны константами: asyncpg кэширует подготовленные выражения
+# соединения по тексту запроса, поэтому текст не должен меняться от вызова к вызову.
+# Статус хранится в status_enum по имени члена перечисления (TODO, IN_PROGRESS, DONE).
+# Колонка uuid имеет тип UUID: asyncpg принимает uuid строкой, а возвращает
+# объектом asyncpg.pgproto.UUID, который приводится к строке при чтении.
+_COLUMNS = "uuid, title, description, status, version"
+
+INSERT_TASK = (
+    "INSERT INTO tasks (uuid, title, description, status, version) "
+    "VALUES ($1, $2, $3, $4::status_enum, $5)"
+)
+SELECT_TASK = f"SELECT {_COLUMNS} FROM tasks WHERE uuid = $1"
+SELECT_TASK_VERSION = "SELECT version FROM tasks WHERE uuid = $1"
+SELECT_TASKS = f"SELECT {_COLUMNS} FROM tasks ORDER BY status, uuid LIMIT $1"
+SELECT_TASKS_AFTER = (
+    f"SELECT {_COLUMNS} FROM tasks "
+    "WHERE (status, uuid) > ($2::status_enum, $3) "
+    "ORDER BY status, uuid LIMIT $1"
+)
+SELECT_TASKS_BY_STATUS = (
+    f"SELECT {_COLUMNS} FROM tasks WHERE status = $2::status_enum "
+    "ORDER BY status, uuid LIMIT $1"
+)
+SELECT_TASKS_BY_STATUS_AFTER = (
+    f"SELECT {_COLUMNS} FROM tasks WHERE status = $2::status_enum "
+    "AND (status, uuid) > ($3::status_enum, $4) "
+    "ORDER BY status, uuid LIMIT $1"
+)
+SEARCH_TASKS = (
+    f"SELECT {_COLUMNS}, ts_rank_cd(search_vector, query) AS rank "
+    f"FROM tasks, websearch_to_tsquery('{SEARCH_CONFIG}', $2) AS query "
+    "WHERE search_vector @@ query "
+    "ORDER BY rank DESC, uuid LIMIT $1"
+)
+SEARCH_TASKS_AFTER = (
+    f"SELECT * FROM (SELECT {_COLUMNS}, ts_rank_cd(search_vector, query) AS rank "
+    f"FROM tasks, websearch_to_tsquery('{SEARCH_CONFIG}', $2) AS query "
+    "WHERE search_vector @@ query) AS hits "
+    "WHERE rank < $3 OR (rank = $3 AND uuid > $4) "
+    "ORDER BY rank DESC, uuid LIMIT $1"
+)
+COUNT_TASKS = "SELECT status, count FROM task_status_counts"
+STREAM_TASKS = f"SELECT {_COLUMNS} FROM tasks"
+STREAM_TASKS_BY_STATUS = f"SELECT {_COLUMNS} FROM tasks WHERE status = $1::status_enum"
+UPDATE_TASK = (
+    "UPDATE tasks SET title = $2, description = $3, status = $4::status_enum, "
+    "version = version + 1 WHERE uuid = $1 RETURNING version"
+)
+UPDATE_TASK_VERSIONED = (
+    "UPDATE tasks SET title = $2, description = $3, status = $4::status_enum, "
+    "version = version + 1 WHERE uuid = $1 AND version = $5 RETURNING version"
+)
+DELETE_TASK = "DELETE FROM tasks WHERE uuid = $1 RETURNING uuid"
+DELETE_TASK_VERSIONED = (
+    "DELETE FROM tasks WHERE uuid = $1 AND version = $2 RETURNING uuid"
+)
+# Пакетные запросы передают каждую колонку одним массивом и разворачивают
+# их через unnest, поэтому число параметров не зависит от размера пакета.
+INSERT_TASKS = (
+    "INSERT INTO tasks (uuid, title, description, status, version) "
+    "SELECT * FROM unnest($1::uuid[], $2::varchar[], $3::varchar[], "
+    "$4::status_enum[], $5::integer[])"
+)
+UPDATE_TASKS = (
+    "UPDATE tasks SET title = batch.title, description = batch.description, "
+    "status = batch.status, version = tasks.version + 1 "
+    "FROM unnest($1::uuid[], $2::varchar[], $3::varchar[], $4::status_enum[]) "
+    "AS batch (uuid, title, description, status) "
+    "WHERE tasks.uuid = batch.uuid RETURNING tasks.uuid"
+)
+DELETE_TASKS = "DELETE FROM tasks WHERE uuid = ANY($1::uuid[]) RETURNING uuid"
+_POSITION = "change_txid, change_seq, uuid"
+SELECT_CHANGED_TASKS = (
+    f"SELECT {_COLUMNS}, change_txid, change_seq FROM tasks "
+    f"WHERE change_txid < {SNAPSHOT_XMIN} ORDER BY {_POSITION} LIMIT $1"
+)
+SELECT_CHANGED_TASKS_AFTER = (
+    f"SELECT {_COLUMNS}, change_txid, change_seq FROM tasks "
+    f"WHERE ({_POSITION}) > ($2, $3, $4) AND change_txid < {SNAPSHOT_XMIN} "
+    f"ORDER BY {_POSITION} LIMIT $1"
+)
+SELECT_TOMBSTONES_AFTER = (
+    f"SELECT {_POSITION} FROM task_tombstones "
+    f"WHERE ({_POSITION}) > ($2, $3, $4) AND change_txid < {SNAPSHOT_XMIN} "
+    f"ORDER BY {_POSITION} LIMIT $1"
+)
+SELECT_SYNC_HORIZON = f"SELECT {_POSITION} FROM task_sync_horizon"
+
+# Запросы, подготавливаемые на каждом новом соединении пула: чтения
+# и одиночные изменения задачи. Параметры не совпадают ни с одной строкой.
+_MISSING_UUID = str(UUID(int=0))
+PRIMED_QUERIES = (
+    (SELECT_TASK, (_MISSING_UUID,)),
+    (SELECT_TASK_VERSION, (_MISSING_UUID,)),
+    (SELECT_TASKS, (1,)),
+    (SELECT_TASKS_AFTER, (1, Status.TODO.name, _MISSING_UUID)),
+    (SELECT_TASKS_BY_STATUS, (1, Status.TODO.name)),
+    (SELECT_TASKS_BY_STATUS_AFTER, (1, Status.TODO.name, Status.TODO.name, _MISSING_UUID)),
+    (COUNT_TASKS, ()),
+    (UPDATE_TASK, (_MISSING_UUID, "", "", Status.TODO.name)),
+    (UPDATE_TASK_VERSIONED, (_MISSING_UUID, "", "", Status.TODO.name, 1)),
+    (DELETE_TASK, (_MISSING_UUID,)),
+    (DELETE_TASK_VERSIONED, (_MISSING_UUID, 1)),
+)
+
+
+async def prime_connection(connection: asyncpg.Connection) -> None:
+    """
+    Подготовка частых запросов репозитория на новом соединении пула.
+
+    Connection.prepare не помещает выражение в кэш соединения, поэтому запросы
+    выполняются. Транзакция откатывается, так что данные не изменяются.
+
+    :param connection: Новое соединение asyncpg.
+    """
+    transaction = connection.transaction()
+    await transaction.start()
+    try:
+        for query, args in PRIMED_QUERIES:
+            await connection.fetch(query, *args)
+    finally:
+        await transaction.rollback()
+
+
+def convert_record_to_projection(record: asyncpg.Record) -> TaskProjection:
+    projection = dict(record.items())
+    if "uuid" in projection:
+        projection["uuid"] = str(projection["uuid"])
+    if "status" in projection:
+        projection["status"] = Status[projection["status"]]
+    return projection
+
+
+def _select_columns(fields: tuple[str, ...]) -> str:
+    # Имена колонок подставляются в текст запроса, поэтому допускаются только
+    # поля сущности. Для каждого набора полей подготавливается свое выражение.
+    if not set(fields).issubset(TASK_FIELDS):
+        raise ValueError(f"Unknown task fields: {fields}")
+    return ", ".join(fields)
+
+
+def convert_record_to_task_entity(record: asyncpg.Record) -> TaskEntity:
+    return TaskEntity(
+        uuid=str(record[0]),
+        title=record[1],
+        description=record[2],
+        status=Status[record[3]],
+        version=record[4],
+    )
+
+
+@dataclass
+class AsyncpgTaskRepo(BaseTaskRepo):
+    """
+    Репозиторий задач поверх asyncpg без ORM.
+    Сущности строятся напрямую из записей драйвера.
+    """
+
+    _session: AsyncpgSession
+
+    async def create_new_task(self, task: TaskEntity) -> None:
+        """
+        Создание новой задачи в базе данных.
+
+        :param task: Сущность задачи, которую необходимо сохранить.
+        """
+        async with self._session.connection() as connection:
+            await connection.execute(
+                INSERT_TASK,
+                task.uuid,
+                task.title,
+                task.description,
+                task.status.name,
+                task.version,
+            )
+
+    async def get_task(self, task_uuid: str) -> TaskEntity:
+        """
+        Получение задачи из базы данных по UUID.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :return: Сущность задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        """
+        async with self._session.connection() as connection:
+            record = await connection.fetchrow(SELECT_TASK, task_uuid)
+        if record is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        return convert_record_to_task_entity(record)
+
+    async def get_tasks(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None = None
+    ) -> list[TaskEntity]:
+        """
+        Получение страницы задач с заданным статусом в порядке (status, uuid).
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :return: Список сущностей задач.
+        """
+        query, args = self._page_query(status, cursor)
+        async with self._session.connection() as connection:
+            records = await connection.fetch(query, limit, *args)
+        return [convert_record_to_task_entity(record) for record in records]
+
+    async def get_task_projection(
+        self, task_uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection:
+        """
+        Получение задачи по UUID с чтением только перечисленных колонок.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :param fields: Поля задачи, которые нужно прочитать.
+        :return: Словарь со значениями полей задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        """
+        query = f"SELECT {_select_columns(fields)} FROM tasks WHERE uuid = $1"
+        async with self._session.connection() as connection:
+            record = await connection.fetchrow(query, task_uuid)
+        if record is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        return convert_record_to_projection(record)
+
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: TaskCursor | None,
+        fields: tuple[str, ...],
+    ) -> list[TaskProjection]:
+        """
+        Получение страницы задач с чтением только перечисленных колонок.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :param fields: Поля задачи, которые нужно прочитать.
+        :return: Список словарей со значениями полей задач.
+        """
+        query, args = self._page_query(status, cursor)
+        query = query.replace(_COLUMNS, _select_columns(fields), 1)
+        async with self._session.connection() as connection:
+            records = await connection.fetch(query, limit, *args)
+        return [convert_record_to_projection(record) for record in records]
+
+    @staticmethod
+    def _page_query(
+        status: Status | None, cursor: TaskCursor | None
+    ) -> tuple[str, tuple]:
+        if status and cursor:
+            return SELECT_TASKS_BY_STATUS_AFTER, (
+                status.name,
+                cursor.status.name,
+                cursor.uuid,
+            )
+        if status:
+            return SELECT_TASKS_BY_STATUS, (status.name,)
+        if cursor:
+            return SELECT_TASKS_AFTER, (cursor.status.name, cursor.uuid)
+        return SELECT_TASKS, ()
+
+    async def search_tasks(
+        self, query: str, limit: int, cursor: SearchCursor | None = None
+    ) -> list[SearchHit]:
+        """
+        Полнотекстовый поиск по вычисляемой колонке search_vector с GIN-индексом.
+
+        :param query: Поисковый запрос в синтаксисе websearch_to_tsquery.
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :return: Список результатов в порядке убывания релевантности.
+        """
+        async with self._session.connection() as connection:
+            if cursor is None:
+                records = await connection.fetch(SEARCH_TASKS, limit, query)
+            else:
+                records = await connection.fetch(
+                    SEARCH_TASKS_AFTER, limit, query, cursor.rank, cursor.uuid
+                )
+        return [
+            SearchHit(task=convert_record_to_task_entity(record), rank=record[5])
+            for record in records
+        ]
+
+    async def count_tasks(self) -> dict[Status, int]:
+        """
+        Получение количества задач по статусам из таблицы счетчиков.
+
+        :return: Количество задач в каждом статусе.
+        """
+        async with self._session.connection() as connection:
+            records = await connection.fetch(COUNT_TASKS)
+        counts = dict.fromkeys(Status, 0)
+        counts.update((Status[record[0]], record[1]) for record in records)
+        return counts
+
+    async def estimate_task_counts(self) -> dict[Status, int]:
+        """
+        Оценка количества задач по статусам по статистике планировщика.
+        Если таблица еще не анализировалась, возвращаются точные счетчики.
+
+        :return: Приблизительное количество задач в каждом статусе.
+        """
+        async with self._session.connection() as connection:
+            record = await connection.fetchrow(ESTIMATE_TASK_COUNTS)
+        counts = estimate_counts(*record)
+        if counts is None:
+            return await self.count_tasks()
+        return counts
+
+    async def stream_tasks(self, status: Status | None) -> AsyncIterator[TaskEntity]:
+        """
+        Потоковое получение всех задач с заданным статусом.
+        Строки читаются серверным курсором порциями по STREAM_FETCH_SIZE
+        внутри читающей транзакции.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :yield: Сущности задач.
+        """
+        if status:
+            query, args = STREAM_TASKS_BY_STATUS, (status.name,)
+        else:
+            query, args = STREAM_TASKS, ()
+
+        async with self._session.connection() as connection:
+            async with connection.transaction(readonly=True):
+                async for record in connection.cursor(
+                    query, *args, prefetch=STREAM_FETCH_SIZE
+                ):
+                    yield convert_record_to_task_entity(record)
+
+    async def update_task(
+        self, task: TaskEntity, expected_version: int | None = None
+    ) -> int:
+        """
+        Обновление задачи одним запросом UPDATE ... RETURNING.
+        Версия задачи увеличивается на единицу при каждом обновлении.
+
+        :param task: Сущность задачи, содержащая обновленные данные.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        :return: Новая версия задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        :raises TaskVersionMismatchException: Если версия задачи не совпадает с ожидаемой.
+        """
+        args = (task.uuid, task.title, task.description, task.status.name)
+        async with self._session.connection() as connection:
+            if expected_version is None:
+                version = await connection.fetchval(UPDATE_TASK, *args)
+            else:
+                version = await connection.fetchval(
+                    UPDATE_TASK_VERSIONED, *args, expected_version
+                )
+            if version is None:
+                await self._raise_missing_or_conflict(
+                    connection, task.uuid, expected_version
+                )
+        return version
+
+    async def delete_task(
+        self, task_uuid: str, expected_version: int | None = None
+    ) -> None:
+        """
+        Удаление задачи по UUID одним запросом DELETE ... RETURNING.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        :raises TaskNotFoundException: Если задача не найдена.
+        :raises TaskVersionMismatchException: Если версия задачи не совпадает с ожидаемой.
+        """
+        async with self._session.connection() as connection:
+            if expected_version is None:
+                deleted = await connection.fetchval(DELETE_TASK, task_uuid)
+            else:
+                deleted = await connection.fetchval(
+                    DELETE_TASK_VERSIONED, task_uuid, expected_version
+                )
+            if deleted is None:
+                await self._raise_missing_or_conflict(
+                    connection, task_uuid, expected_version
+                )
+
+    async def _raise_missing_or_conflict(
+        self,
+        connection: asyncpg.Connection,
+        task_uuid: str,
+        expected_version: int | None,
+    ) -> NoReturn:
+        """
+        Определение причины, по которой условное изменение не затронуло ни одной строки.
+        Дополнительный запрос выполняется только при неудачном изменении.
+        """
+        actual_version = None
+        if expected_version is not None:
+            actual_version = await connection.fetchval(SELECT_TASK_VERSION, task_uuid)
+
+        if actual_version is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        raise TaskVersionMismatchException(
+            task_uuid=task_uuid,
+            expected_version=expected_version,
+            actual_version=actual_version,
+        )
+
+    async def create_new_tasks(self, tasks: list[TaskEntity]) -> None:
+        """
+        Создание нескольких задач одним INSERT ... SELECT FROM unnest(...).
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param tasks: Сущности задач, которые необходимо сохранить.
+        """
+        if not tasks:
+            return
+        connection = await self._session.transaction()
+        await connection.execute(
+            INSERT_TASKS,
+            [task.uuid for task in tasks],
+            [task.title for task in tasks],
+            [task.description for task in tasks],
+            [task.status.name for task in tasks],
+            [task.version for task in tasks],
+        )
+
+    async def update_tasks(self, tasks: list[TaskEntity]) -> set[str]:
+        """
+        Обновление нескольких задач одним UPDATE ... FROM unnest(...).
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param tasks: Сущности задач, содержащие обновленные данные.
+        :return: Множество uuid задач, которые были найдены и обновлены.
+        """
+        if not tasks:
+            return set()
+        connection = await self._session.transaction()
+        records = await connection.fetch(
+            UPDATE_TASKS,
+            [task.uuid for task in tasks],
+            [task.title for task in tasks],
+            [task.description for task in tasks],
+            [task.status.name for task in tasks],
+        )
+        return {str(record[0]) for record in records}
+
+    async def delete_tasks(self, task_uuids: list[str]) -> set[str]:
+        """
+        Удаление нескольких задач запросом DELETE ... WHERE uuid = ANY($1).
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param task_uuids: Уникальные идентификаторы задач.
+        :return: Множество uuid задач, которые были найдены и удалены.
+        """
+        if not task_uuids:
+            return set()
+        connection = await self._session.transaction()
+        records = await connection.fetch(DELETE_TASKS, task_uuids)
+        return {str(record[0]) for record in records}
+
+    async def get_changes(
+        self, cursor: ChangeCursor | None, limit: int
+    ) -> list[TaskChange]:
+        """
+        Получение изменений задач после позиции курсора в порядке журнала.
+        Без курсора отметки об удалении не читаются; граница сжатия отметок
+        читается после самих отметок.
+
+        :param cursor: Позиция последнего изменения, полученного клиентом.
+        :param limit: Максимальное количество изменений.
+        :return: Изменения в порядке позиций.
+        :raises ChangesCursorExpiredException: Если отметки после курсора уже удалены.
+        """
+        async with self._session.connection() as connection:
+            if cursor is None:
+                records = await connection.fetch(SELECT_CHANGED_TASKS, limit)
+            else:
+                args = (limit, cursor.txid, cursor.seq, cursor.uuid)
+                records = await connection.fetch(SELECT_CHANGED_TASKS_AFTER, *args)
+                tombstones = await connection.fetch(SELECT_TOMBSTONES_AFTER, *args)
+                horizon = await connection.fetchrow(SELECT_SYNC_HORIZON)
+        changes = [
+            TaskChange(
+                position=ChangeCursor(record[5], record[6], str(record[0])),
+                uuid=str(record[0]),
+                task=convert_record_to_task_entity(record),
+            )
+            for record in records
+        ]
+        if cursor is None:
+            return changes
+
+        if horizon is not None and cursor < ChangeCursor(
+            horizon[0], horizon[1], str(horizon[2])
+        ):
+            raise ChangesCursorExpiredException(cursor=encode_change_cursor(cursor))
+        changes.extend(
+            TaskChange(
+                position=ChangeCursor(record[0], record[1], str(record[2])),
+                uuid=str(record[2]),
+                task=None,
+            )
+            for record in tombstones
+        )
+        changes.sort(key=lambda change: change.position)
+        return changes[:limit]
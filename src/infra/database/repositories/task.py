@@ -1,13 +1,28 @@
+import re
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from typing import AsyncIterator, NoReturn
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import Select, String, any_, bindparam, column, delete, insert, select
+from sqlalchemy import and_, func, literal_column, or_, table, text, tuple_, update
+from sqlalchemy import Uuid, values
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 
+from src.application.pagination import TaskCursor
+from src.application.projection import TaskProjection
+from src.application.search import DESCRIPTION_WEIGHT, SearchCursor, SearchHit
+from src.application.sync import ChangeCursor, TaskChange, encode_change_cursor
 from src.domain.entities import Status
 from src.domain.entities import Task as TaskEntity
-from src.domain.exceptions import TaskNotFoundException
+from src.domain.exceptions import (
+    ChangesCursorExpiredException,
+    TaskNotFoundException,
+    TaskVersionMismatchException,
+)
 from src.infra.database.models.task import Task as TaskModel
+from src.infra.database.models.task_status_count import TaskStatusCount
+from src.infra.database.models.task_tombstone import TaskSyncHorizon, TaskTombstone
 from src.infra.database.converters import (
     convert_task_entity_to_task_model,
     convert_task_model_to_task_entity,
@@ -28,19 +43,136 @@ class BaseTaskRepo(ABC):
     async def get_task(self, task_uuid: str) -> TaskEntity: ...
 
     @abstractmethod
-    async def get_tasks(self, status: Status | None) -> list[TaskEntity]: ...
+    async def get_tasks(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None = None
+    ) -> list[TaskEntity]: ...
+
+    @abstractmethod
+    async def get_task_projection(
+        self, task_uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection: ...
+
+    @abstractmethod
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: TaskCursor | None,
+        fields: tuple[str, ...],
+    ) -> list[TaskProjection]: ...
+
+    @abstractmethod
+    async def search_tasks(
+        self, query: str, limit: int, cursor: SearchCursor | None = None
+    ) -> list[SearchHit]: ...
 
     @abstractmethod
-    async def update_task(self, task: TaskEntity) -> None: ...
+    async def count_tasks(self) -> dict[Status, int]: ...
 
     @abstractmethod
-    async def delete_task(self, task_uuid: str) -> None: ...
+    async def estimate_task_counts(self) -> dict[Status, int]: ...
+
+    @abstractmethod
+    def stream_tasks(self, status: Status | None) -> AsyncIterator[TaskEntity]: ...
+
+    @abstractmethod
+    async def update_task(
+        self, task: TaskEntity, expected_version: int | None = None
+    ) -> int: ...
+
+    @abstractmethod
+    async def delete_task(
+        self, task_uuid: str, expected_version: int | None = None
+    ) -> None: ...
+
+    @abstractmethod
+    async def create_new_tasks(self, tasks: list[TaskEntity]) -> None: ...
+
+    @abstractmethod
+    async def update_tasks(self, tasks: list[TaskEntity]) -> set[str]: ...
+
+    @abstractmethod
+    async def delete_tasks(self, task_uuids: list[str]) -> set[str]: ...
+
+    @abstractmethod
+    async def get_changes(
+        self, cursor: ChangeCursor | None, limit: int
+    ) -> list[TaskChange]: ...
+
+
+STREAM_FETCH_SIZE = 1000
+SEARCH_CONFIG = "russian"
+# Оценка числа строк таблицы tasks и частот статусов по статистике ANALYZE.
+# reltuples равен -1, пока таблица ни разу не анализировалась.
+ESTIMATE_TASK_COUNTS = """
+SELECT c.reltuples::bigint AS total,
+       s.most_common_vals::text::text[] AS statuses,
+       s.most_common_freqs AS frequencies
+FROM pg_class AS c
+LEFT JOIN pg_stats AS s
+  ON s.schemaname = current_schema() AND s.tablename = 'tasks' AND s.attname = 'status'
+WHERE c.oid = 'tasks'::regclass
+"""
+
+
+def estimate_counts(
+    total: int | None, statuses: list[str] | None, frequencies: list[float] | None
+) -> dict[Status, int] | None:
+    """
+    Оценка количества задач по статусам из статистики планировщика.
+
+    :param total: Оценка числа строк таблицы (reltuples).
+    :param statuses: Самые частые значения колонки status (имена членов Status).
+    :param frequencies: Доли этих значений.
+    :return: Оценка по статусам или None, если статистики еще нет.
+    """
+    if total is None or total < 0 or statuses is None or frequencies is None:
+        return None
+    counts = dict.fromkeys(Status, 0)
+    for name, frequency in zip(statuses, frequencies):
+        counts[Status[name]] = round(total * frequency)
+    return counts
+
+
+def fts5_query(query: str) -> str | None:
+    """
+    Преобразование поискового запроса в запрос FTS5.
+    Каждое слово заключается в кавычки, чтобы операторы FTS5 в запросе
+    пользователя не интерпретировались; слова объединяются по И.
+
+    :param query: Поисковый запрос.
+    :return: Запрос FTS5 или None, если в запросе нет слов.
+    """
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"' for term in terms)
+
+
+# Изменения отдаются только от транзакций, завершенных до начала снимка,
+# чтобы позже зафиксированная транзакция не оказалась позади курсора клиента
+# (см. models/task_tombstone.py).
+SNAPSHOT_XMIN = "pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+
+
+# Ограничение на количество строк в одном UPDATE ... FROM (VALUES ...),
+# чтобы не выйти за лимит asyncpg (32767) и SQLite (32766) на число параметров запроса.
+BATCH_UPDATE_CHUNK_SIZE = 1000
 
 
 @dataclass
 class TaskRepo(BaseTaskRepo):
+    """
+    Репозиторий задач поверх SQLAlchemy ORM для Postgres и SQLite.
+    Запросы, которые в SQLite не поддерживаются, имеют отдельную ветку для этой СУБД.
+    """
+
     _session: AsyncSession
 
+    @property
+    def _sqlite(self) -> bool:
+        return self._session.bind.dialect.name == "sqlite"
+
     async def create_new_task(self, task: TaskEntity) -> None:
         """
         Создание новой задачи в базе данных.
@@ -63,45 +195,423 @@ class TaskRepo(BaseTaskRepo):
             raise TaskNotFoundException(task_uuid=task_uuid)
         return convert_task_model_to_task_entity(task)
 
-    async def get_tasks(self, status: Status | None) -> list[TaskEntity]:
+    async def get_tasks(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None = None
+    ) -> list[TaskEntity]:
         """
-        Получение всех задач с заданным статусом.
+        Получение страницы задач с заданным статусом.
+        Задачи упорядочены по (status, uuid), что позволяет использовать
+        составной индекс ix_tasks_status_uuid для keyset-пагинации.
 
         :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
         :return: Список сущностей задач.
         """
-        query = select(TaskModel)
-        if status:
-            query = query.where(TaskModel.status == status)
-
+        query = self._page_query(select(TaskModel), status, limit, cursor)
         result = await self._session.execute(query)
         tasks = result.scalars().all()
         return [convert_task_model_to_task_entity(task) for task in tasks]
 
-    async def update_task(self, task: TaskEntity) -> None:
+    async def get_task_projection(
+        self, task_uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection:
+        """
+        Получение задачи по UUID с чтением только перечисленных колонок.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :param fields: Поля задачи, которые нужно прочитать.
+        :return: Словарь со значениями полей задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        """
+        query = select(*self._columns(fields)).where(TaskModel.uuid == task_uuid)
+        result = await self._session.execute(query)
+        row = result.mappings().one_or_none()
+        if row is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        return dict(row)
+
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: TaskCursor | None,
+        fields: tuple[str, ...],
+    ) -> list[TaskProjection]:
+        """
+        Получение страницы задач с чтением только перечисленных колонок.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :param fields: Поля задачи, которые нужно прочитать.
+        :return: Список словарей со значениями полей задач.
+        """
+        query = self._page_query(select(*self._columns(fields)), status, limit, cursor)
+        result = await self._session.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    @staticmethod
+    def _columns(fields: tuple[str, ...]) -> list:
+        return [TaskModel.__table__.c[field] for field in fields]
+
+    @staticmethod
+    def _page_query(
+        query: Select, status: Status | None, limit: int, cursor: TaskCursor | None
+    ) -> Select:
+        query = query.order_by(TaskModel.status, TaskModel.uuid).limit(limit)
+        if status:
+            query = query.where(TaskModel.status == status)
+        if cursor:
+            query = query.where(
+                tuple_(TaskModel.status, TaskModel.uuid) > (cursor.status, cursor.uuid)
+            )
+        return query
+
+    async def search_tasks(
+        self, query: str, limit: int, cursor: SearchCursor | None = None
+    ) -> list[SearchHit]:
+        """
+        Полнотекстовый поиск по вычисляемой колонке search_vector с GIN-индексом.
+        Колонка создается миграцией и не объявлена в модели, так как есть только в Postgres.
+        В SQLite поиск идет по индексу FTS5 tasks_fts с ранжированием bm25.
+
+        :param query: Поисковый запрос в синтаксисе websearch_to_tsquery.
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :return: Список результатов в порядке убывания релевантности.
+        """
+        if self._sqlite:
+            match = fts5_query(query)
+            if match is None:
+                return []
+            fts = table("tasks_fts", column("rowid"))
+            # bm25 тем меньше, чем релевантнее документ, поэтому берется со знаком минус.
+            rank = -func.bm25(literal_column("tasks_fts"), 1.0, DESCRIPTION_WEIGHT)
+            stmt = (
+                select(TaskModel, rank)
+                .join(fts, fts.c.rowid == literal_column("tasks.rowid"))
+                .where(literal_column("tasks_fts").op("MATCH")(match))
+            )
+        else:
+            vector = literal_column("tasks.search_vector", TSVECTOR)
+            ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            rank = func.ts_rank_cd(vector, ts_query)
+            stmt = select(TaskModel, rank).where(vector.op("@@")(ts_query))
+
+        stmt = stmt.order_by(rank.desc(), TaskModel.uuid).limit(limit)
+        if cursor:
+            stmt = stmt.where(
+                or_(
+                    rank < cursor.rank,
+                    and_(rank == cursor.rank, TaskModel.uuid > cursor.uuid),
+                )
+            )
+
+        result = await self._session.execute(stmt)
+        return [
+            SearchHit(task=convert_task_model_to_task_entity(task), rank=task_rank)
+            for task, task_rank in result.all()
+        ]
+
+    async def count_tasks(self) -> dict[Status, int]:
+        """
+        Получение количества задач по статусам из таблицы счетчиков.
+        Счетчики обновляются триггерами при каждом изменении таблицы tasks.
+
+        :return: Количество задач в каждом статусе.
+        """
+        result = await self._session.execute(
+            select(TaskStatusCount.status, TaskStatusCount.count)
+        )
+        counts = dict.fromkeys(Status, 0)
+        counts.update(result.all())
+        return counts
+
+    async def estimate_task_counts(self) -> dict[Status, int]:
         """
-        Обновление задачи в базе данных.
+        Оценка количества задач по статусам по статистике планировщика.
+        Если таблица еще не анализировалась, а также в SQLite, где такой
+        статистики нет, возвращаются точные счетчики.
+
+        :return: Приблизительное количество задач в каждом статусе.
+        """
+        if self._sqlite:
+            return await self.count_tasks()
+        result = await self._session.execute(text(ESTIMATE_TASK_COUNTS))
+        row = result.one()
+        counts = estimate_counts(row.total, row.statuses, row.frequencies)
+        if counts is None:
+            return await self.count_tasks()
+        return counts
+
+    async def stream_tasks(self, status: Status | None) -> AsyncIterator[TaskEntity]:
+        """
+        Потоковое получение всех задач с заданным статусом.
+        Строки читаются серверным курсором порциями по STREAM_FETCH_SIZE,
+        поэтому потребление памяти не зависит от размера таблицы.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :yield: Сущности задач.
+        """
+        query = select(TaskModel).execution_options(yield_per=STREAM_FETCH_SIZE)
+        if status:
+            query = query.where(TaskModel.status == status)
+
+        result = await self._session.stream_scalars(query)
+        try:
+            async for task in result:
+                yield convert_task_model_to_task_entity(task)
+        finally:
+            await result.close()
+            # Завершаем читающую транзакцию, чтобы вернуть соединение в пул сразу
+            # по окончании выгрузки, а не при закрытии сессии.
+            await self._session.rollback()
+
+    async def update_task(
+        self, task: TaskEntity, expected_version: int | None = None
+    ) -> int:
+        """
+        Обновление задачи в базе данных одним запросом UPDATE ... RETURNING.
+        Версия задачи увеличивается на единицу при каждом обновлении.
 
         :param task: Сущность задачи, содержащая обновленные данные.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        :return: Новая версия задачи.
         :raises TaskNotFoundException: Если задача не найдена.
+        :raises TaskVersionMismatchException: Если версия задачи не совпадает с ожидаемой.
         """
-        task_model = await self._session.get(TaskModel, task.uuid)
-        if not task_model:
-            raise TaskNotFoundException(task_uuid=task.uuid)
+        query = (
+            update(TaskModel)
+            .where(TaskModel.uuid == task.uuid)
+            .values(
+                title=task.title,
+                description=task.description,
+                status=task.status,
+                version=TaskModel.version + 1,
+            )
+            .returning(TaskModel.version)
+            .execution_options(synchronize_session=False)
+        )
+        if expected_version is not None:
+            query = query.where(TaskModel.version == expected_version)
 
-        task_model.title = task.title
-        task_model.description = task.description
-        task_model.status = Status(task.status)
+        result = await self._session.execute(query)
+        version = result.scalar_one_or_none()
+        if version is None:
+            await self._raise_missing_or_conflict(task.uuid, expected_version)
 
         await self._session.commit()
+        return version
 
-    async def delete_task(self, task_uuid: str) -> None:
+    async def delete_task(
+        self, task_uuid: str, expected_version: int | None = None
+    ) -> None:
         """
-        Удаление задачи по UUID.
+        Удаление задачи по UUID одним запросом DELETE ... RETURNING.
 
         :param task_uuid: Уникальный идентификатор задачи.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        :raises TaskNotFoundException: Если задача не найдена.
+        :raises TaskVersionMismatchException: Если версия задачи не совпадает с ожидаемой.
         """
-        task = await self._session.get(TaskModel, task_uuid)
+        query = (
+            delete(TaskModel)
+            .where(TaskModel.uuid == task_uuid)
+            .returning(TaskModel.uuid)
+            .execution_options(synchronize_session=False)
+        )
+        if expected_version is not None:
+            query = query.where(TaskModel.version == expected_version)
+
+        result = await self._session.execute(query)
+        if result.scalar_one_or_none() is None:
+            await self._raise_missing_or_conflict(task_uuid, expected_version)
 
-        await self._session.delete(task)
         await self._session.commit()
+
+    async def _raise_missing_or_conflict(
+        self, task_uuid: str, expected_version: int | None
+    ) -> NoReturn:
+        """
+        Определение причины, по которой условное изменение не затронуло ни одной строки.
+        Дополнительный запрос выполняется только при неудачном изменении.
+        """
+        actual_version = None
+        if expected_version is not None:
+            actual_version = await self._session.scalar(
+                select(TaskModel.version).where(TaskModel.uuid == task_uuid)
+            )
+        await self._session.rollback()
+
+        if actual_version is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        raise TaskVersionMismatchException(
+            task_uuid=task_uuid,
+            expected_version=expected_version,
+            actual_version=actual_version,
+        )
+
+    async def create_new_tasks(self, tasks: list[TaskEntity]) -> None:
+        """
+        Создание нескольких задач многострочным INSERT.
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param tasks: Сущности задач, которые необходимо сохранить.
+        """
+        if not tasks:
+            return
+        await self._session.execute(
+            insert(TaskModel),
+            [
+                {
+                    "uuid": task.uuid,
+                    "title": task.title,
+                    "description": task.description,
+                    "status": task.status,
+                    "version": task.version,
+                }
+                for task in tasks
+            ],
+        )
+
+    async def update_tasks(self, tasks: list[TaskEntity]) -> set[str]:
+        """
+        Обновление нескольких задач запросом UPDATE ... FROM (VALUES ...).
+        SQLite не поддерживает имена колонок у подзапроса VALUES, поэтому
+        в нем строки передаются через WITH batch (...) AS (VALUES ...).
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param tasks: Сущности задач, содержащие обновленные данные.
+        :return: Множество uuid задач, которые были найдены и обновлены.
+        """
+        updated: set[str] = set()
+        for start in range(0, len(tasks), BATCH_UPDATE_CHUNK_SIZE):
+            chunk = tasks[start : start + BATCH_UPDATE_CHUNK_SIZE]
+            batch = values(
+                column("uuid", TaskModel.uuid.type),
+                column("title", String),
+                column("description", String),
+                column("status", TaskModel.status.type),
+                name="batch",
+            ).data([(t.uuid, t.title, t.description, t.status) for t in chunk])
+            if self._sqlite:
+                batch = batch.cte("batch")
+            query = (
+                update(TaskModel)
+                .where(TaskModel.uuid == batch.c.uuid)
+                .values(
+                    title=batch.c.title,
+                    description=batch.c.description,
+                    status=batch.c.status,
+                    version=TaskModel.version + 1,
+                )
+                .returning(TaskModel.uuid)
+                .execution_options(synchronize_session=False)
+            )
+            result = await self._session.execute(query)
+            updated.update(result.scalars().all())
+        return updated
+
+    async def delete_tasks(self, task_uuids: list[str]) -> set[str]:
+        """
+        Удаление нескольких задач запросом DELETE ... WHERE uuid = ANY(...).
+        В SQLite нет массивов, и uuid передаются списком IN частями
+        по BATCH_UPDATE_CHUNK_SIZE.
+        Транзакция не фиксируется: это делает вызывающая сторона.
+
+        :param task_uuids: Уникальные идентификаторы задач.
+        :return: Множество uuid задач, которые были найдены и удалены.
+        """
+        if not task_uuids:
+            return set()
+        if self._sqlite:
+            deleted: set[str] = set()
+            for start in range(0, len(task_uuids), BATCH_UPDATE_CHUNK_SIZE):
+                chunk = task_uuids[start : start + BATCH_UPDATE_CHUNK_SIZE]
+                result = await self._session.execute(
+                    delete(TaskModel)
+                    .where(TaskModel.uuid.in_(chunk))
+                    .returning(TaskModel.uuid)
+                    .execution_options(synchronize_session=False)
+                )
+                deleted.update(result.scalars().all())
+            return deleted
+        query = (
+            delete(TaskModel)
+            .where(
+                TaskModel.uuid
+                == any_(bindparam("uuids", task_uuids, type_=ARRAY(Uuid(as_uuid=False))))
+            )
+            .returning(TaskModel.uuid)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self._session.execute(query)
+        return set(result.scalars().all())
+
+    async def get_changes(
+        self, cursor: ChangeCursor | None, limit: int
+    ) -> list[TaskChange]:
+        """
+        Получение изменений задач после позиции курсора в порядке журнала.
+        Задачи и отметки об удалении читаются по индексам
+        (change_txid, change_seq, uuid) и объединяются. Без курсора отметки
+        не читаются: клиент, синхронизирующийся с нуля, не видел удаленных задач.
+
+        Граница сжатия отметок читается после самих отметок: если сжатие
+        завершилось раньше, чтение границы это обнаружит.
+
+        :param cursor: Позиция последнего изменения, полученного клиентом.
+        :param limit: Максимальное количество изменений.
+        :return: Изменения в порядке позиций.
+        :raises ChangesCursorExpiredException: Если отметки после курсора уже удалены.
+        """
+        result = await self._session.execute(
+            self._changes_query(select(TaskModel), TaskModel, cursor, limit)
+        )
+        changes = [
+            TaskChange(
+                position=ChangeCursor(task.change_txid, task.change_seq, task.uuid),
+                uuid=task.uuid,
+                task=convert_task_model_to_task_entity(task),
+            )
+            for task in result.scalars()
+        ]
+        if cursor is None:
+            return changes
+
+        tombstones = select(
+            TaskTombstone.change_txid, TaskTombstone.change_seq, TaskTombstone.uuid
+        )
+        result = await self._session.execute(
+            self._changes_query(tombstones, TaskTombstone, cursor, limit)
+        )
+        changes.extend(
+            TaskChange(position=ChangeCursor(*row), uuid=row.uuid, task=None)
+            for row in result
+        )
+        result = await self._session.execute(
+            select(
+                TaskSyncHorizon.change_txid,
+                TaskSyncHorizon.change_seq,
+                TaskSyncHorizon.uuid,
+            )
+        )
+        horizon = result.one_or_none()
+        if horizon is not None and cursor < ChangeCursor(*horizon):
+            raise ChangesCursorExpiredException(cursor=encode_change_cursor(cursor))
+        changes.sort(key=lambda change: change.position)
+        return changes[:limit]
+
+    def _changes_query(
+        self, query: Select, model: type, cursor: ChangeCursor | None, limit: int
+    ) -> Select:
+        position = (model.change_txid, model.change_seq, model.uuid)
+        query = query.order_by(*position).limit(limit)
+        if cursor is not None:
+            query = query.where(
+                tuple_(*position) > (cursor.txid, cursor.seq, cursor.uuid)
+            )
+        if not self._sqlite:
+            query = query.where(model.change_txid < literal_column(SNAPSHOT_XMIN))
+        return query
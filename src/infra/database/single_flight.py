@@ -0,0 +1,137 @@
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, TypeVar
+
+from src.application.pagination import TaskCursor
+from src.domain.entities import Status
+from src.domain.entities import Task as TaskEntity
+from src.infra.database.repositories.task import BaseTaskRepo
+from src.infra.metrics.collectors import TASK_READS_COALESCED
+
+T = TypeVar("T")
+
+
+@dataclass(eq=False)
+class _Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных вызовов.
+
+    Первый вызов с ключом запускает функцию отдельной задачей asyncio, а вызовы
+    с тем же ключом, пришедшие до ее завершения, ждут тот же результат или ту же
+    ошибку. Отмена одного из ожидающих не отменяет общую задачу; она отменяется,
+    только когда отменены все ожидающие.
+    """
+
+    def __init__(self, name: str) -> None:
+        """
+        Инициализация.
+
+        :param name: Имя операции в метрике task_reads_coalesced_total.
+        """
+        self._name = name
+        self._flights: dict[Hashable, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: Hashable, function: Callable[[], Awaitable[T]]) -> T:
+        """
+        Выполнение функции или присоединение к уже выполняющемуся вызову.
+
+        :param key: Ключ, по которому вызовы считаются одинаковыми.
+        :param function: Функция, выполняемая первым вызовом.
+        :return: Результат функции.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.create_task(function()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._done(key, flight))
+        else:
+            TASK_READS_COALESCED.labels(self._name).inc()
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Результат больше никому не нужен. Новые вызовы не должны
+                # присоединяться к отменяемой задаче и получать CancelledError.
+                self._forget(key, flight)
+                flight.task.cancel()
+
+    def _done(self, key: Hashable, flight: _Flight) -> None:
+        self._forget(key, flight)
+        # Ошибка считается полученной, даже если все ожидающие уже отменены.
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+
+class TaskReadCoalescer:
+    """
+    Объединение одинаковых одновременных запросов задачи по UUID и страниц задач.
+
+    Общий запрос выполняется в собственной сессии, а не в сессии запроса,
+    который его начал: иначе отмена этого запроса закрыла бы сессию
+    и оборвала бы чтение для всех остальных. Все ожидающие получают одни и те же
+    объекты и не должны их изменять.
+    """
+
+    def __init__(
+        self,
+        sessions: Callable[[], AsyncIterator[Any]],
+        repo_factory: Callable[[Any], BaseTaskRepo],
+    ) -> None:
+        """
+        Инициализация.
+
+        :param sessions: Генератор читающих сессий.
+        :param repo_factory: Фабрика репозитория поверх сессии.
+        """
+        self._sessions = sessions
+        self._repo_factory = repo_factory
+        self._get_task = SingleFlight("get_task")
+        self._get_tasks = SingleFlight("get_tasks")
+
+    async def get_task(self, task_uuid: str) -> TaskEntity:
+        """
+        Получение задачи по UUID.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :return: Сущность задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        """
+        return await self._get_task.do(
+            task_uuid, lambda: self._read(lambda repo: repo.get_task(task_uuid))
+        )
+
+    async def get_tasks(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None = None
+    ) -> list[TaskEntity]:
+        """
+        Получение страницы задач с заданным статусом.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :return: Список сущностей задач.
+        """
+        return await self._get_tasks.do(
+            (status, limit, cursor),
+            lambda: self._read(lambda repo: repo.get_tasks(status, limit, cursor)),
+        )
+
+    async def _read(self, query: Callable[[BaseTaskRepo], Awaitable[T]]) -> T:
+        async with contextlib.aclosing(self._sessions()) as sessions:
+            return await query(self._repo_factory(await anext(sessions)))
@@ -0,0 +1,419 @@
+import asyncio
+import contextlib
+import logging
+from collections import deque
+from typing import Any
+
+import asyncpg
+
+from src.domain.entities import Status, TaskEvent
+from src.infra.database.models.task_event import TASK_EVENTS_CHANNEL
+from src.infra.metrics.collectors import (
+    TASK_EVENT_SUBSCRIBERS,
+    TASK_EVENT_SUBSCRIBERS_DROPPED,
+)
+
+logger = logging.getLogger(__name__)
+
+REPLAY_PAGE_SIZE = 1000
+MAX_RECHECK_DELAY = 2.0
+# Позиция, с которой начинается журнал: раньше любого события.
+ORIGIN = (0, 0)
+
+SELECT_SNAPSHOT_XMIN = "SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"
+# События транзакций старше xmin снимка: такие транзакции уже завершены,
+# и событие с меньшей позицией в журнале больше не появится.
+SELECT_EVENTS_AFTER = (
+    "SELECT id, op, task_uuid, status, previous_status, version, txid "
+    "FROM task_events WHERE (txid, id) > ($1, $2) AND txid < $3 "
+    "AND ($4::status_enum IS NULL "
+    "OR status = $4::status_enum OR previous_status = $4::status_enum) "
+    "ORDER BY txid, id LIMIT $5"
+)
+SELECT_EVENT_TXID = "SELECT txid FROM task_events WHERE id = $1"
+SELECT_OLDEST_EVENT = "SELECT min(id) FROM task_events"
+# Последнее событие не удаляется, чтобы клиент, получивший его,
+# мог продолжить ленту без сброса.
+PRUNE_EVENTS = (
+    "DELETE FROM task_events WHERE created_at < now() - make_interval(secs => $1) "
+    "AND id < (SELECT max(id) FROM task_events)"
+)
+LOCK_LEASE = (
+    "SELECT listening_until < now() FROM task_events_lease WHERE id = 1 FOR UPDATE"
+)
+RENEW_LEASE = (
+    "UPDATE task_events_lease "
+    "SET listening_until = now() + make_interval(secs => $1) WHERE id = 1"
+)
+CLEAR_EVENTS = "DELETE FROM task_events"
+
+
+def _status(name: str | None) -> Status | None:
+    return Status[name] if name is not None else None
+
+
+def convert_row_to_event(row: Any) -> TaskEvent:
+    return TaskEvent(
+        id=row[0],
+        op=row[1],
+        uuid=str(row[2]),
+        status=Status[row[3]],
+        previous_status=_status(row[4]),
+        version=row[5],
+    )
+
+
+class TaskEventSubscription:
+    """
+    Подписка клиента на ленту событий задач.
+
+    События копятся в буфере ограниченного размера до чтения клиентом.
+    Если клиент не успевает читать и буфер переполняется, подписка закрывается
+    без оставшихся событий: клиент переподключится и получит пропущенное
+    из журнала по последнему полученному идентификатору.
+    """
+
+    def __init__(self, status: Status | None, buffer_size: int) -> None:
+        """
+        Инициализация подписки.
+
+        :param status: Статус задач (None — события всех задач).
+        :param buffer_size: Максимальное количество непрочитанных событий.
+        """
+        self.status = status
+        self.dropped = False
+        self._buffer: deque[TaskEvent] = deque()
+        self._buffer_size = buffer_size
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def matches(self, event: TaskEvent) -> bool:
+        # Клиент, следящий за статусом, узнает и об уходе задачи из этого статуса.
+        return self.status is None or self.status in (event.status, event.previous_status)
+
+    def push(self, event: TaskEvent) -> None:
+        if self._closed:
+            return
+        if len(self._buffer) >= self._buffer_size:
+            TASK_EVENT_SUBSCRIBERS_DROPPED.inc()
+            self.dropped = True
+            self._buffer.clear()
+            self.close()
+            return
+        self._buffer.append(event)
+        self._ready.set()
+
+    def close(self) -> None:
+        self._closed = True
+        self._ready.set()
+
+    async def next(self, timeout: float) -> list[TaskEvent] | None:
+        """
+        Ожидание новых событий.
+
+        :param timeout: Максимальное время ожидания.
+        :return: Все накопленные события (пустой список, если за timeout событий
+            не было) или None, если подписка закрыта и событий не осталось.
+        """
+        if not self._buffer and not self._closed:
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._ready.wait(), timeout)
+        self._ready.clear()
+        if not self._buffer and self._closed:
+            return None
+        events = list(self._buffer)
+        self._buffer.clear()
+        return events
+
+
+class TaskEventHub:
+    """
+    Лента событий задач на основе Postgres LISTEN/NOTIFY.
+
+    События записываются в журнал task_events триггерами таблицы tasks,
+    которые уведомляют канал о зафиксированной транзакции. Каждый процесс держит
+    одно выделенное соединение, которое слушает канал, по уведомлению читает
+    из журнала новые события и раздает их всем подписчикам процесса.
+    Через это же соединение читается журнал при возобновлении ленты,
+    продлевается срок записи журнала (task_events_lease) и удаляются
+    события старше retention секунд.
+
+    Если срок записи журнала истек (ни один процесс не работал с лентой),
+    в журнале мог образоваться пропуск, поэтому он очищается: клиенты
+    с прежними идентификаторами получат сброс ленты.
+
+    При потере соединения все подписки закрываются, а соединение
+    восстанавливается: клиенты переподключаются и получают пропущенные
+    события из журнала.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        buffer_size: int = 256,
+        retention: float = 86400.0,
+        prune_interval: float = 60.0,
+        lease: float = 300.0,
+        max_replay: int = 10000,
+        reconnect_delay: float = 1.0,
+        recheck_delay: float = 0.1,
+    ) -> None:
+        """
+        Инициализация ленты.
+
+        :param dsn: Строка подключения к Postgres в формате libpq.
+        :param buffer_size: Размер буфера непрочитанных событий одного клиента.
+        :param retention: Время хранения событий в журнале в секундах.
+        :param prune_interval: Интервал продления срока записи журнала и удаления
+            старых событий в секундах.
+        :param lease: Срок записи журнала после продления в секундах;
+            должен быть больше prune_interval.
+        :param max_replay: Максимальное количество событий при возобновлении;
+            если пропущено больше, клиенту выгоднее загрузить задачи заново.
+        :param reconnect_delay: Пауза между попытками восстановить соединение.
+        :param recheck_delay: Пауза перед повторным чтением журнала, если
+            зафиксированную транзакцию еще скрывает более ранняя незавершенная.
+        """
+        if prune_interval >= lease:
+            raise ValueError("prune_interval must be shorter than lease")
+        self._dsn = dsn
+        self._buffer_size = buffer_size
+        self._retention = retention
+        self._prune_interval = prune_interval
+        self._lease = lease
+        self._max_replay = max_replay
+        self._reconnect_delay = reconnect_delay
+        self._recheck_delay = recheck_delay
+        # Позиция (txid, id) последнего разосланного подписчикам события.
+        self._position = ORIGIN
+        # Наибольший номер транзакции из уведомлений.
+        self._notified_txid = 0
+        self._delivery: asyncio.Task | None = None
+        self._delivery_pending = False
+        self._subscriptions: set[TaskEventSubscription] = set()
+        self._connection: asyncpg.Connection | None = None
+        self._lock = asyncio.Lock()
+        self._background: set[asyncio.Task] = set()
+        self._stopping = False
+
+    @property
+    def available(self) -> bool:
+        return self._connection is not None and not self._connection.is_closed()
+
+    async def __aenter__(self) -> "TaskEventHub":
+        await self._connect()
+        self._spawn(self._prune_periodically())
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self._stopping = True
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+        self.close_subscriptions()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def subscribe(self, status: Status | None = None) -> TaskEventSubscription:
+        """
+        Подписка на события задач.
+        Подписка получает события, зафиксированные после ее создания.
+
+        :param status: Статус задач (None — события всех задач).
+        :return: Подписка, которую нужно передать в unsubscribe после использования.
+        """
+        subscription = TaskEventSubscription(status, self._buffer_size)
+        self._subscriptions.add(subscription)
+        TASK_EVENT_SUBSCRIBERS.set(len(self._subscriptions))
+        return subscription
+
+    def unsubscribe(self, subscription: TaskEventSubscription) -> None:
+        subscription.close()
+        self._subscriptions.discard(subscription)
+        TASK_EVENT_SUBSCRIBERS.set(len(self._subscriptions))
+
+    def close_subscriptions(self) -> None:
+        """
+        Закрытие всех подписок, например перед остановкой приложения.
+        Уже полученные подписками события остаются доступны для чтения.
+        """
+        for subscription in self._subscriptions:
+            subscription.close()
+
+    async def replay(
+        self, after_id: int, status: Status | None = None
+    ) -> list[TaskEvent] | None:
+        """
+        Чтение событий журнала после заданного.
+
+        :param after_id: Идентификатор последнего полученного клиентом события
+            (0 — с начала журнала).
+        :param status: Статус задач (None — события всех задач).
+        :return: События в порядке журнала или None, если событие after_id
+            или более ранние уже удалены из журнала или событий больше max_replay.
+        :raises RuntimeError: Если соединение с Postgres не установлено.
+        """
+        async with self._lock:
+            connection = self._require_connection()
+            if after_id == 0:
+                oldest = await connection.fetchval(SELECT_OLDEST_EVENT)
+                if oldest is not None and oldest > 1:
+                    return None
+                position = ORIGIN
+            else:
+                txid = await connection.fetchval(SELECT_EVENT_TXID, after_id)
+                if txid is None:
+                    return None
+                position = (txid, after_id)
+            rows, _ = await self._fetch_after(
+                connection, position, status, self._max_replay + 1
+            )
+        if len(rows) > self._max_replay:
+            return None
+        return [convert_row_to_event(row) for row in rows]
+
+    async def _fetch_after(
+        self,
+        connection: asyncpg.Connection,
+        position: tuple[int, int],
+        status: Status | None,
+        limit: int,
+    ) -> tuple[list[Any], int]:
+        """
+        Чтение до limit событий журнала после позиции (txid, id).
+
+        :return: Строки событий и граница xmin, до которой они прочитаны.
+        """
+        # Граница xmin берется до чтения: все транзакции старше нее завершены.
+        xmin = await connection.fetchval(SELECT_SNAPSHOT_XMIN)
+        status_name = status.name if status is not None else None
+        rows: list[Any] = []
+        while len(rows) < limit:
+            page = await connection.fetch(
+                SELECT_EVENTS_AFTER,
+                *position,
+                xmin,
+                status_name,
+                min(REPLAY_PAGE_SIZE, limit - len(rows)),
+            )
+            rows.extend(page)
+            if len(page) < REPLAY_PAGE_SIZE:
+                break
+            position = (page[-1][6], page[-1][0])
+        return rows, xmin
+
+    def _require_connection(self) -> asyncpg.Connection:
+        if not self.available:
+            raise RuntimeError("Task event feed is not connected")
+        return self._connection
+
+    def _on_notification(
+        self, connection: asyncpg.Connection, pid: int, channel: str, payload: str
+    ) -> None:
+        self._notified_txid = max(self._notified_txid, int(payload))
+        if self._delivery is not None and not self._delivery.done():
+            # Уже идущее чтение журнала повторится и заберет новые события.
+            self._delivery_pending = True
+            return
+        self._delivery = self._spawn(self._deliver())
+
+    async def _deliver(self) -> None:
+        """
+        Чтение новых событий журнала и рассылка их подписчикам.
+        Одновременно в процессе выполняется одно чтение; уведомления,
+        пришедшие во время чтения, объединяются в следующее.
+        """
+        recheck_delay = self._recheck_delay
+        while True:
+            self._delivery_pending = False
+            try:
+                async with self._lock:
+                    rows, xmin = await self._fetch_after(
+                        self._require_connection(),
+                        self._position,
+                        None,
+                        REPLAY_PAGE_SIZE,
+                    )
+            except (asyncpg.PostgresError, asyncpg.InterfaceError, RuntimeError, OSError):
+                # Подписки закроет обработчик потери соединения.
+                logger.warning("Failed to read task events", exc_info=True)
+                return
+            if rows:
+                self._position = (rows[-1][6], rows[-1][0])
+                self._dispatch([convert_row_to_event(row) for row in rows])
+            if len(rows) == REPLAY_PAGE_SIZE or self._delivery_pending:
+                continue
+            if xmin <= self._notified_txid:
+                # Уведомившая транзакция зафиксирована, но ее события
+                # ждут завершения более ранней транзакции.
+                await asyncio.sleep(recheck_delay)
+                recheck_delay = min(recheck_delay * 2, MAX_RECHECK_DELAY)
+                continue
+            return
+
+    def _dispatch(self, events: list[TaskEvent]) -> None:
+        for subscription in list(self._subscriptions):
+            for event in events:
+                if subscription.matches(event):
+                    subscription.push(event)
+            if subscription.closed:
+                self._subscriptions.discard(subscription)
+        TASK_EVENT_SUBSCRIBERS.set(len(self._subscriptions))
+
+    def _on_termination(self, connection: asyncpg.Connection) -> None:
+        if self._stopping:
+            return
+        logger.warning("Task event feed connection lost, reconnecting")
+        # События, отправленные до восстановления соединения, подписки
+        # не получат, поэтому клиентов нужно перевести на чтение журнала.
+        self.close_subscriptions()
+        self._spawn(self._reconnect())
+
+    async def _connect(self) -> None:
+        connection = await asyncpg.connect(self._dsn)
+        await self._renew_lease(connection)
+        # Подписчикам рассылаются только события, зафиксированные после подключения.
+        xmin = await connection.fetchval(SELECT_SNAPSHOT_XMIN)
+        self._position = (xmin, 0)
+        self._notified_txid = 0
+        self._connection = connection
+        await connection.add_listener(TASK_EVENTS_CHANNEL, self._on_notification)
+        connection.add_termination_listener(self._on_termination)
+
+    async def _renew_lease(self, connection: asyncpg.Connection) -> None:
+        async with connection.transaction():
+            expired = await connection.fetchval(LOCK_LEASE)
+            if expired:
+                await connection.execute(CLEAR_EVENTS)
+            await connection.execute(RENEW_LEASE, self._lease)
+
+    async def _reconnect(self) -> None:
+        while not self._stopping:
+            try:
+                await self._connect()
+                return
+            except (asyncpg.PostgresError, OSError):
+                logger.warning("Failed to reconnect task event feed", exc_info=True)
+                await asyncio.sleep(self._reconnect_delay)
+
+    async def _prune_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._prune_interval)
+            try:
+                async with self._lock:
+                    connection = self._require_connection()
+                    await self._renew_lease(connection)
+                    await connection.execute(PRUNE_EVENTS, self._retention)
+            except (asyncpg.PostgresError, asyncpg.InterfaceError, RuntimeError, OSError):
+                logger.warning("Failed to prune task events", exc_info=True)
+
+    def _spawn(self, coroutine: Any) -> asyncio.Task:
+        task = asyncio.create_task(coroutine)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
@@ -0,0 +1,96 @@
+"""
+Сжатие журнала удалений: удаление отметок об удалении задач старше
+TASK_TOMBSTONE_RETENTION секунд.
+
+Клиент, не синхронизировавшийся дольше этого срока, получит от GET /tasks/changes
+ответ 410 и загрузит задачи заново. Запуск (например, раз в сутки по cron):
+
+    python -m src.infra.database.tombstones
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infra.database.connection import create_session_maker
+from src.infra.database.models.task_tombstone import TaskSyncHorizon, TaskTombstone
+from src.presentation.api.config import load_web_config
+
+COMPACTION_BATCH_SIZE = 5000
+
+
+async def compact_tombstones(
+    session: AsyncSession, retention: float, batch_size: int = COMPACTION_BATCH_SIZE
+) -> int:
+    """
+    Удаление устаревших отметок об удалении пакетами по batch_size.
+
+    Каждый пакет удаляется в отдельной транзакции вместе со сдвигом границы
+    сжатия на позицию последней удаленной отметки, поэтому клиент с курсором
+    до границы всегда узнает, что мог пропустить удаления. Граница только
+    растет, даже если сжатие запущено одновременно в нескольких местах.
+
+    :param session: Асинхронная сессия основной БД.
+    :param retention: Время хранения отметок в секундах.
+    :param batch_size: Количество отметок, удаляемых в одной транзакции.
+    :return: Количество удаленных отметок.
+    """
+    dialect = session.bind.dialect.name
+    insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+    deadline = datetime.now(timezone.utc) - timedelta(seconds=retention)
+    position = (TaskTombstone.change_txid, TaskTombstone.change_seq, TaskTombstone.uuid)
+    expired = (
+        select(TaskTombstone.uuid)
+        .where(TaskTombstone.deleted_at < deadline)
+        .limit(batch_size)
+    )
+    purged = 0
+    while True:
+        result = await session.execute(
+            TaskTombstone.__table__.delete()
+            .where(TaskTombstone.uuid.in_(expired.scalar_subquery()))
+            .returning(*position)
+        )
+        rows = result.all()
+        if not rows:
+            await session.commit()
+            return purged
+
+        horizon = max(tuple(row) for row in rows)
+        query = insert(TaskSyncHorizon).values(
+            id=1, change_txid=horizon[0], change_seq=horizon[1], uuid=horizon[2]
+        )
+        current = (
+            TaskSyncHorizon.change_txid,
+            TaskSyncHorizon.change_seq,
+            TaskSyncHorizon.uuid,
+        )
+        await session.execute(
+            query.on_conflict_do_update(
+                index_elements=[TaskSyncHorizon.id],
+                set_={
+                    "change_txid": query.excluded.change_txid,
+                    "change_seq": query.excluded.change_seq,
+                    "uuid": query.excluded.uuid,
+                },
+                where=tuple_(*current) < horizon,
+            )
+        )
+        await session.commit()
+        purged += len(rows)
+
+
+async def main() -> None:
+    config = load_web_config()
+    session_maker = create_session_maker(config)
+    async with session_maker() as session:
+        purged = await compact_tombstones(session, config.task_tombstone_retention)
+    await session_maker.kw["bind"].dispose()
+    print(f"purged: {purged}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from src.domain.entities import Status
+from src.domain.exceptions import TaskNotFoundException
+from src.infra.database.repositories.task import BaseTaskRepo
+
+logger = logging.getLogger(__name__)
+
+Primer = Callable[[AsyncSession], Awaitable[Any]]
+
+MISSING_TASK_UUID = str(UUID(int=0))
+
+
+async def warm_pool(engine: AsyncEngine, connections: int, primer: Primer | None = None) -> None:
+    """
+    Одновременное открытие соединений пула.
+
+    Каждое соединение удерживается, пока не открыты все остальные: иначе пул
+    выдал бы уже открытое соединение повторно и новые не были бы созданы.
+
+    :param engine: Асинхронный движок.
+    :param connections: Количество соединений (не больше постоянного размера пула).
+    :param primer: Запросы, выполняемые в каждом соединении после открытия.
+    """
+    if connections <= 0:
+        return
+    barrier = asyncio.Barrier(connections)
+
+    async def open_connection() -> None:
+        async with engine.connect() as connection:
+            if primer is not None:
+                async with AsyncSession(bind=connection) as session:
+                    await primer(session)
+            await barrier.wait()
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            for _ in range(connections):
+                group.create_task(open_connection())
+    except ExceptionGroup as error:
+        raise error.exceptions[0]
+
+
+def task_reads_primer(repo_factory: Callable[[Any], BaseTaskRepo]) -> Primer:
+    """
+    Запросы чтения задач для подготовки соединения.
+
+    Выполняются те же запросы, что и в обработке запросов API, поэтому
+    скомпилированные выражения попадают в кэш движка, а подготовленные
+    выражения asyncpg — в кэш соединения.
+
+    :param repo_factory: Фабрика репозитория поверх сессии.
+    :return: Функция подготовки соединения.
+    """
+
+    async def prime(session: AsyncSession) -> None:
+        repo = repo_factory(session)
+        try:
+            await repo.get_task(MISSING_TASK_UUID)
+        except TaskNotFoundException:
+            pass
+        await repo.get_tasks(None, 1)
+        await repo.get_tasks(Status.TODO, 1)
+        await repo.count_tasks()
+
+    return prime
+
+
+class EngineLifecycle:
+    """
+    Движок на время жизни приложения.
+
+    При запуске открывает до connections соединений пула одновременно и
+    выполняет в них primer, чтобы первые запросы после развертывания не ждали
+    установления соединений. При остановке закрывает все соединения пула.
+
+    Ошибка подготовки обязательного движка прерывает запуск приложения;
+    для необязательного (например, реплики) она только записывается в журнал.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        connections: int,
+        primer: Primer | None = None,
+        required: bool = True,
+    ) -> None:
+        """
+        Инициализация.
+
+        :param engine: Асинхронный движок.
+        :param connections: Количество соединений, открываемых при запуске.
+        :param primer: Запросы, выполняемые в каждом соединении после открытия.
+        :param required: Прерывать запуск, если подготовить пул не удалось.
+        """
+        self._engine = engine
+        # Соединения сверх постоянного размера пула закрываются при возврате.
+        self._connections = min(connections, engine.pool.size())
+        self._primer = primer
+        self._required = required
+
+    @property
+    def engine(self) -> AsyncEngine:
+        return self._engine
+
+    async def __aenter__(self) -> "EngineLifecycle":
+        name = self._engine.pool.logging_name
+        start = time.perf_counter()
+        try:
+            await warm_pool(self._engine, self._connections, self._primer)
+        except Exception:
+            if self._required:
+                await self._engine.dispose()
+                raise
+            logger.warning("Failed to warm up connection pool %s", name, exc_info=True)
+        else:
+            logger.info(
+                "Connection pool %s warmed up: %d connections in %.3fs",
+                name,
+                self._connections,
+                time.perf_counter() - start,
+            )
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self._engine.dispose()
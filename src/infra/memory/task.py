@@ -0,0 +1,467 @@
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+import orjson
+
+from src.application.pagination import TaskCursor
+from src.application.projection import TaskProjection, project_task
+from src.application.search import SearchCursor, SearchHit, rank_task
+from src.application.sync import ChangeCursor, TaskChange, encode_change_cursor
+from src.domain.entities import Status
+from src.domain.entities import Task as TaskEntity
+from src.domain.exceptions import (
+    ChangesCursorExpiredException,
+    TaskNotFoundException,
+    TaskVersionMismatchException,
+)
+from src.infra.database.repositories.task import STREAM_FETCH_SIZE, BaseTaskRepo
+
+logger = logging.getLogger(__name__)
+
+# Порядок статусов совпадает с порядком значений status_enum в Postgres,
+# поэтому страницы и курсоры совместимы с репозиториями БД.
+STATUS_ORDER = {status: position for position, status in enumerate(Status)}
+
+
+class InMemoryTaskStore:
+    """
+    Хранилище задач в памяти процесса.
+
+    Задачи лежат в словаре по uuid, а для каждого статуса поддерживается
+    отсортированный список uuid — вторичный индекс для фильтрации и
+    keyset-пагинации по (status, uuid). Получение и обновление без смены
+    статуса выполняются за O(1), страница из k задач — за O(log n + k).
+    Вставка в индекс сдвигает элементы списка, но это копирование указателей
+    и оно заметно только на миллионах задач.
+
+    Все изменения выполняются без точек переключения event loop, поэтому
+    каждая операция атомарна относительно других корутин.
+
+    Для синхронизации клиентов хранится номер последнего изменения каждой
+    задачи (в том числе удаленной) в словаре, порядок которого совпадает
+    с порядком номеров. Отметки об удалении хранятся tombstone_retention секунд.
+    Номера не сохраняются в снимок, поэтому позиции включают эпоху хранилища —
+    время его создания: курсоры прошлого запуска считаются устаревшими.
+
+    Используется как асинхронный контекстный менеджер на время жизни
+    приложения: при входе загружает снимок с диска, пока открыто —
+    периодически сохраняет его, при выходе сохраняет последний снимок.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: Path | None = None,
+        snapshot_interval: float = 60.0,
+        tombstone_retention: float = 2592000.0,
+    ) -> None:
+        """
+        Инициализация хранилища.
+
+        :param snapshot_path: Файл снимка (None — без сохранения на диск).
+        :param snapshot_interval: Период сохранения снимка в секундах.
+        :param tombstone_retention: Время хранения отметок об удалении в секундах.
+        """
+        self.tasks: dict[str, TaskEntity] = {}
+        self.index: dict[Status, list[str]] = {status: [] for status in Status}
+        self.epoch = time.time_ns()
+        self.change_seq = 0
+        self.positions: dict[str, int] = {}
+        self.tombstones: dict[str, float] = {}
+        self.horizon: ChangeCursor | None = None
+        self._tombstone_retention = tombstone_retention
+        self._snapshot_path = snapshot_path
+        self._snapshot_interval = snapshot_interval
+        self._changes = 0
+        self._saved_changes = 0
+        self._snapshot_task: asyncio.Task | None = None
+
+    def add(self, task: TaskEntity) -> None:
+        self.tasks[task.uuid] = task
+        insort(self.index[task.status], task.uuid)
+        self.tombstones.pop(task.uuid, None)
+        self._record_change(task.uuid)
+
+    def remove(self, task_uuid: str) -> TaskEntity:
+        task = self.tasks.pop(task_uuid)
+        uuids = self.index[task.status]
+        del uuids[bisect_left(uuids, task_uuid)]
+        self._record_change(task_uuid)
+        self.tombstones[task_uuid] = time.monotonic()
+        self._compact_tombstones()
+        return task
+
+    def put(self, task: TaskEntity) -> None:
+        """Замена существующей задачи с переносом в индекс нового статуса."""
+        previous = self.tasks[task.uuid]
+        if previous.status != task.status:
+            uuids = self.index[previous.status]
+            del uuids[bisect_left(uuids, task.uuid)]
+            insort(self.index[task.status], task.uuid)
+        self.tasks[task.uuid] = task
+        self._record_change(task.uuid)
+
+    def position(self, task_uuid: str) -> ChangeCursor:
+        return ChangeCursor(self.epoch, self.positions[task_uuid], task_uuid)
+
+    def _record_change(self, task_uuid: str) -> None:
+        # Повторная вставка переносит задачу в конец словаря.
+        self.change_seq += 1
+        self.positions.pop(task_uuid, None)
+        self.positions[task_uuid] = self.change_seq
+        self._changes += 1
+
+    def _compact_tombstones(self) -> None:
+        # Отметки добавляются в порядке удаления, поэтому устаревшие — в начале.
+        deadline = time.monotonic() - self._tombstone_retention
+        while self.tombstones:
+            task_uuid, deleted_at = next(iter(self.tombstones.items()))
+            if deleted_at > deadline:
+                break
+            position = self.position(task_uuid)
+            del self.tombstones[task_uuid]
+            del self.positions[task_uuid]
+            if self.horizon is None or position > self.horizon:
+                self.horizon = position
+
+    # Хранилище выступает сессией запроса: изменения применяются сразу,
+    # поэтому фиксировать и откатывать нечего.
+    async def commit(self) -> None:
+        return None
+
+    async def rollback(self) -> None:
+        return None
+
+    def load(self) -> None:
+        """
+        Загрузка снимка с диска, если он существует.
+        """
+        if self._snapshot_path is None or not self._snapshot_path.exists():
+            return
+        for item in orjson.loads(self._snapshot_path.read_bytes()):
+            item["status"] = Status(item["status"])
+            self.add(TaskEntity(**item))
+        self._saved_changes = self._changes
+        logger.info("Loaded %d tasks from %s", len(self.tasks), self._snapshot_path)
+
+    async def save(self) -> None:
+        """
+        Сохранение снимка на диск.
+        Сериализация и запись выполняются в отдельном потоке над копией списка
+        задач; файл заменяется атомарно, поэтому снимок не бывает частичным.
+        """
+        if self._snapshot_path is None or self._changes == self._saved_changes:
+            return
+        changes = self._changes
+        tasks = list(self.tasks.values())
+        await asyncio.to_thread(_write_snapshot, self._snapshot_path, tasks)
+        self._saved_changes = changes
+
+    async def _save_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._snapshot_interval)
+            try:
+                await self.save()
+            except OSError:
+                logger.exception("Failed to save task snapshot")
+
+    async def __aenter__(self) -> "InMemoryTaskStore":
+        self.load()
+        if self._snapshot_path is not None:
+            self._snapshot_task = asyncio.create_task(self._save_periodically())
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._snapshot_task is not None:
+            self._snapshot_task.cancel()
+            try:
+                await self._snapshot_task
+            except asyncio.CancelledError:
+                pass
+            self._snapshot_task = None
+        await self.save()
+
+
+async def new_memory_session(store: InMemoryTaskStore) -> AsyncIterator:
+    """
+    Сессия хранилища в памяти для кода, открывающего сессии сам
+    (например, для потоковой выгрузки). Сессией выступает само хранилище.
+
+    :param store: Хранилище задач.
+    :yield: Хранилище задач.
+    """
+    yield store
+
+
+def _write_snapshot(path: Path, tasks: list[TaskEntity]) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(orjson.dumps(tasks))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class InMemoryTaskRepo(BaseTaskRepo):
+    """
+    Репозиторий задач поверх InMemoryTaskStore.
+    Возвращает копии сущностей, чтобы вызывающая сторона не могла
+    изменить хранилище в обход репозитория.
+    """
+
+    _store: InMemoryTaskStore
+
+    async def create_new_task(self, task: TaskEntity) -> None:
+        """
+        Создание новой задачи.
+
+        :param task: Сущность задачи, которую необходимо сохранить.
+        """
+        self._store.add(replace(task))
+
+    async def get_task(self, task_uuid: str) -> TaskEntity:
+        """
+        Получение задачи по UUID.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :return: Сущность задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        """
+        task = self._store.tasks.get(task_uuid)
+        if task is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        return replace(task)
+
+    def _page_uuids(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None
+    ) -> list[str]:
+        statuses = [status] if status else list(Status)
+        uuids: list[str] = []
+        for current in statuses:
+            if len(uuids) >= limit:
+                break
+            start = 0
+            if cursor is not None:
+                if STATUS_ORDER[current] < STATUS_ORDER[cursor.status]:
+                    continue
+                if current == cursor.status:
+                    start = bisect_right(self._store.index[current], cursor.uuid)
+            index = self._store.index[current]
+            uuids.extend(index[start : start + limit - len(uuids)])
+        return uuids
+
+    async def get_tasks(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None = None
+    ) -> list[TaskEntity]:
+        """
+        Получение страницы задач в порядке (status, uuid) по индексам статусов.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :return: Список сущностей задач.
+        """
+        tasks = self._store.tasks
+        return [replace(tasks[uuid]) for uuid in self._page_uuids(status, limit, cursor)]
+
+    async def get_task_projection(
+        self, task_uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection:
+        task = self._store.tasks.get(task_uuid)
+        if task is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        return project_task(task, fields)
+
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: TaskCursor | None,
+        fields: tuple[str, ...],
+    ) -> list[TaskProjection]:
+        tasks = self._store.tasks
+        return [
+            project_task(tasks[uuid], fields)
+            for uuid in self._page_uuids(status, limit, cursor)
+        ]
+
+    async def search_tasks(
+        self, query: str, limit: int, cursor: SearchCursor | None = None
+    ) -> list[SearchHit]:
+        """
+        Поиск задач полным перебором с упрощенным ранжированием (rank_task).
+
+        :param query: Поисковый запрос.
+        :param limit: Максимальное количество задач на странице.
+        :param cursor: Позиция, после которой начинается страница.
+        :return: Список результатов в порядке убывания релевантности.
+        """
+        after = (-cursor.rank, cursor.uuid) if cursor else None
+        hits = []
+        for task in self._store.tasks.values():
+            rank = rank_task(task, query)
+            if rank is None or (after and (-rank, task.uuid) <= after):
+                continue
+            hits.append(SearchHit(task=replace(task), rank=rank))
+        hits.sort(key=lambda hit: (-hit.rank, hit.task.uuid))
+        return hits[:limit]
+
+    async def count_tasks(self) -> dict[Status, int]:
+        """
+        Получение количества задач по статусам из размеров индексов.
+
+        :return: Количество задач в каждом статусе.
+        """
+        return {status: len(uuids) for status, uuids in self._store.index.items()}
+
+    async def estimate_task_counts(self) -> dict[Status, int]:
+        return await self.count_tasks()
+
+    async def stream_tasks(self, status: Status | None) -> AsyncIterator[TaskEntity]:
+        """
+        Потоковое получение всех задач с заданным статусом.
+        Между порциями по STREAM_FETCH_SIZE задач управление возвращается
+        event loop, чтобы выгрузка не блокировала другие запросы.
+
+        :param status: Статус задач (может быть None, если нужно получить все задачи).
+        :yield: Сущности задач.
+        """
+        # Выгрузка идет в порядке добавления задач, как у таблицы без индекса.
+        tasks = list(self._store.tasks.values())
+        for start in range(0, len(tasks), STREAM_FETCH_SIZE):
+            for task in tasks[start : start + STREAM_FETCH_SIZE]:
+                if status is None or task.status == status:
+                    yield replace(task)
+            await asyncio.sleep(0)
+
+    async def update_task(
+        self, task: TaskEntity, expected_version: int | None = None
+    ) -> int:
+        """
+        Обновление задачи с увеличением версии.
+
+        :param task: Сущность задачи, содержащая обновленные данные.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        :return: Новая версия задачи.
+        :raises TaskNotFoundException: Если задача не найдена.
+        :raises TaskVersionMismatchException: Если версия задачи не совпадает с ожидаемой.
+        """
+        current = self._checked(task.uuid, expected_version)
+        version = current.version + 1
+        self._store.put(replace(task, version=version))
+        return version
+
+    async def delete_task(
+        self, task_uuid: str, expected_version: int | None = None
+    ) -> None:
+        """
+        Удаление задачи по UUID.
+
+        :param task_uuid: Уникальный идентификатор задачи.
+        :param expected_version: Версия, которую должна иметь задача (None — любая).
+        :raises TaskNotFoundException: Если задача не найдена.
+        :raises TaskVersionMismatchException: Если версия задачи не совпадает с ожидаемой.
+        """
+        self._checked(task_uuid, expected_version)
+        self._store.remove(task_uuid)
+
+    def _checked(self, task_uuid: str, expected_version: int | None) -> TaskEntity:
+        task = self._store.tasks.get(task_uuid)
+        if task is None:
+            raise TaskNotFoundException(task_uuid=task_uuid)
+        if expected_version is not None and task.version != expected_version:
+            raise TaskVersionMismatchException(
+                task_uuid=task_uuid,
+                expected_version=expected_version,
+                actual_version=task.version,
+            )
+        return task
+
+    async def create_new_tasks(self, tasks: list[TaskEntity]) -> None:
+        """
+        Создание нескольких задач. Изменения применяются сразу.
+
+        :param tasks: Сущности задач, которые необходимо сохранить.
+        """
+        for task in tasks:
+            self._store.add(replace(task))
+
+    async def update_tasks(self, tasks: list[TaskEntity]) -> set[str]:
+        """
+        Обновление нескольких задач. Изменения применяются сразу.
+
+        :param tasks: Сущности задач, содержащие обновленные данные.
+        :return: Множество uuid задач, которые были найдены и обновлены.
+        """
+        updated = set()
+        for task in tasks:
+            current = self._store.tasks.get(task.uuid)
+            if current is None:
+                continue
+            self._store.put(replace(task, version=current.version + 1))
+            updated.add(task.uuid)
+        return updated
+
+    async def delete_tasks(self, task_uuids: list[str]) -> set[str]:
+        """
+        Удаление нескольких задач. Изменения применяются сразу.
+
+        :param task_uuids: Уникальные идентификаторы задач.
+        :return: Множество uuid задач, которые были найдены и удалены.
+        """
+        deleted = set()
+        for task_uuid in task_uuids:
+            if task_uuid in self._store.tasks:
+                self._store.remove(task_uuid)
+                deleted.add(task_uuid)
+        return deleted
+
+    async def get_changes(
+        self, cursor: ChangeCursor | None, limit: int
+    ) -> list[TaskChange]:
+        """
+        Получение изменений задач после позиции курсора.
+        Словарь позиций просматривается с конца до позиции курсора, поэтому
+        стоимость зависит от числа изменений после курсора, а не от числа задач.
+
+        :param cursor: Позиция последнего изменения, полученного клиентом.
+        :param limit: Максимальное количество изменений.
+        :return: Изменения в порядке позиций.
+        :raises ChangesCursorExpiredException: Если курсор выдан до перезапуска
+            или отметки после него уже удалены.
+        """
+        store = self._store
+        if cursor is not None and (
+            cursor.txid not in (0, store.epoch)
+            or (store.horizon is not None and cursor < store.horizon)
+        ):
+            raise ChangesCursorExpiredException(cursor=encode_change_cursor(cursor))
+
+        after = cursor.seq if cursor is not None and cursor.txid == store.epoch else 0
+        uuids = []
+        for task_uuid, seq in reversed(store.positions.items()):
+            if seq <= after:
+                break
+            uuids.append(task_uuid)
+
+        changes = []
+        for task_uuid in reversed(uuids):
+            task = store.tasks.get(task_uuid)
+            if task is None and cursor is None:
+                continue
+            changes.append(
+                TaskChange(
+                    position=store.position(task_uuid),
+                    uuid=task_uuid,
+                    task=replace(task) if task is not None else None,
+                )
+            )
+            if len(changes) >= limit:
+                break
+        return changes
@@ -0,0 +1,92 @@
+from prometheus_client import Counter, Gauge, Histogram
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route.",
+    ["method", "route", "status"],
+)
+
+DB_REPO_CALL_DURATION = Histogram(
+    "db_repo_call_duration_seconds",
+    "Task repository method latency.",
+    ["method"],
+)
+
+# Значения датчиков в режиме нескольких процессов (PROMETHEUS_MULTIPROC_DIR)
+# суммируются по работающим процессам.
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Connections currently opened above pool_size.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+
+DB_SLOW_QUERIES = Counter(
+    "db_slow_queries",
+    "Statements slower than the slow query threshold.",
+    ["pool", "method"],
+)
+
+TASK_READS_COALESCED = Counter(
+    "task_reads_coalesced",
+    "Task reads served by an identical in-flight query instead of a new one.",
+    ["method"],
+)
+
+TASK_GROUP_COMMIT_BATCH_SIZE = Histogram(
+    "task_group_commit_batch_size",
+    "Tasks written by one group commit.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+
+TASK_EVENT_SUBSCRIBERS = Gauge(
+    "task_event_subscribers",
+    "Clients currently subscribed to the task change feed.",
+    multiprocess_mode="livesum",
+)
+
+TASK_EVENT_SUBSCRIBERS_DROPPED = Counter(
+    "task_event_subscribers_dropped",
+    "Change feed clients disconnected because their buffer overflowed.",
+)
+
+
+TASK_CACHE_EVENTS = Counter(
+    "task_cache_events",
+    "Task cache hits, misses, evictions and invalidations.",
+    ["event"],
+)
+
+TASK_CACHE_ENTRIES = Gauge(
+    "task_cache_entries",
+    "Entries in the task cache.",
+    multiprocess_mode="livesum",
+)
+
+
+class CacheMetrics:
+    """
+    Экспорт событий кэша задач (CacheObserver) в метрики.
+    Счетчики обновляются при каждом событии, а не читаются из кэша при сборе,
+    поэтому в режиме нескольких процессов суммируются по всем процессам.
+    """
+
+    def record(self, event: str, count: int) -> None:
+        TASK_CACHE_EVENTS.labels(event).inc(count)
+
+    def resize(self, size: int) -> None:
+        TASK_CACHE_ENTRIES.set(size)
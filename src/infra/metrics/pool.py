@@ -0,0 +1,49 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection, QueuePool
+
+from src.infra.metrics.collectors import (
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_CHECKOUT_WAIT,
+    DB_POOL_OVERFLOW,
+)
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, замеряющий время ожидания свободного соединения.
+    Имя пула для метрик берется из pool_logging_name движка.
+    """
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.labels(self.logging_name or "default").observe(
+                time.perf_counter() - start
+            )
+
+
+def instrument_pool(engine: AsyncEngine, name: str) -> None:
+    """
+    Подписка на события пула соединений для обновления метрик.
+
+    :param engine: Асинхронный движок SQLAlchemy.
+    :param name: Имя пула в метриках.
+    """
+    sync_engine = engine.sync_engine
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    overflow = DB_POOL_OVERFLOW.labels(name)
+
+    def update(*args) -> None:
+        # Пул пересоздается при engine.dispose(), поэтому берем текущий.
+        pool = sync_engine.pool
+        if isinstance(pool, QueuePool):
+            checked_out.set(pool.checkedout())
+            overflow.set(max(pool.overflow(), 0))
+
+    for identifier in ("checkout", "checkin", "close", "invalidate"):
+        event.listen(sync_engine.pool, identifier, update)
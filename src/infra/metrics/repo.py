@@ -0,0 +1,116 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Iterator
+
+from src.application.pagination import TaskCursor
+from src.application.projection import TaskProjection
+from src.application.search import SearchCursor, SearchHit
+from src.application.sync import ChangeCursor, TaskChange
+from src.domain.entities import Status
+from src.domain.entities import Task as TaskEntity
+from src.infra.database.repositories.task import BaseTaskRepo
+from src.infra.metrics.collectors import DB_REPO_CALL_DURATION
+from src.infra.metrics.slow_queries import REPO_METHOD
+
+
+@contextmanager
+def _timed(method: str) -> Iterator[None]:
+    # Предыдущее значение восстанавливается без токена: генератор stream_tasks
+    # может быть закрыт в другом контексте.
+    previous = REPO_METHOD.get()
+    REPO_METHOD.set(method)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        DB_REPO_CALL_DURATION.labels(method).observe(time.perf_counter() - start)
+        REPO_METHOD.set(previous)
+
+
+@dataclass
+class InstrumentedTaskRepo(BaseTaskRepo):
+    """
+    Репозиторий, замеряющий длительность вызовов вложенного репозитория.
+    """
+
+    _repo: BaseTaskRepo
+
+    async def create_new_task(self, task: TaskEntity) -> None:
+        with _timed("create_new_task"):
+            await self._repo.create_new_task(task)
+
+    async def get_task(self, task_uuid: str) -> TaskEntity:
+        with _timed("get_task"):
+            return await self._repo.get_task(task_uuid)
+
+    async def get_tasks(
+        self, status: Status | None, limit: int, cursor: TaskCursor | None = None
+    ) -> list[TaskEntity]:
+        with _timed("get_tasks"):
+            return await self._repo.get_tasks(status, limit, cursor)
+
+    async def get_task_projection(
+        self, task_uuid: str, fields: tuple[str, ...]
+    ) -> TaskProjection:
+        with _timed("get_task_projection"):
+            return await self._repo.get_task_projection(task_uuid, fields)
+
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: TaskCursor | None,
+        fields: tuple[str, ...],
+    ) -> list[TaskProjection]:
+        with _timed("get_task_projections"):
+            return await self._repo.get_task_projections(status, limit, cursor, fields)
+
+    async def search_tasks(
+        self, query: str, limit: int, cursor: SearchCursor | None = None
+    ) -> list[SearchHit]:
+        with _timed("search_tasks"):
+            return await self._repo.search_tasks(query, limit, cursor)
+
+    async def count_tasks(self) -> dict[Status, int]:
+        with _timed("count_tasks"):
+            return await self._repo.count_tasks()
+
+    async def estimate_task_counts(self) -> dict[Status, int]:
+        with _timed("estimate_task_counts"):
+            return await self._repo.estimate_task_counts()
+
+    async def stream_tasks(self, status: Status | None) -> AsyncIterator[TaskEntity]:
+        with _timed("stream_tasks"):
+            async for task in self._repo.stream_tasks(status):
+                yield task
+
+    async def update_task(
+        self, task: TaskEntity, expected_version: int | None = None
+    ) -> int:
+        with _timed("update_task"):
+            return await self._repo.update_task(task, expected_version)
+
+    async def delete_task(
+        self, task_uuid: str, expected_version: int | None = None
+    ) -> None:
+        with _timed("delete_task"):
+            await self._repo.delete_task(task_uuid, expected_version)
+
+    async def create_new_tasks(self, tasks: list[TaskEntity]) -> None:
+        with _timed("create_new_tasks"):
+            await self._repo.create_new_tasks(tasks)
+
+    async def update_tasks(self, tasks: list[TaskEntity]) -> set[str]:
+        with _timed("update_tasks"):
+            return await self._repo.update_tasks(tasks)
+
+    async def delete_tasks(self, task_uuids: list[str]) -> set[str]:
+        with _timed("delete_tasks"):
+            return await self._repo.delete_tasks(task_uuids)
+
+    async def get_changes(
+        self, cursor: ChangeCursor | None, limit: int
+    ) -> list[TaskChange]:
+        with _timed("get_changes"):
+            return await self._repo.get_changes(cursor, limit)
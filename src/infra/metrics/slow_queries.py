@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import random
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from src.infra.metrics.collectors import DB_SLOW_QUERIES
+
+logger = logging.getLogger(__name__)
+
+# Метод репозитория, выполняющий запрос. Устанавливается InstrumentedTaskRepo
+# и доступен в событиях движка, так как SQLAlchemy выполняет их в контексте
+# вызывающей задачи.
+REPO_METHOD: ContextVar[str | None] = ContextVar("repo_method", default=None)
+
+# Ограничение времени EXPLAIN ANALYZE, который заново выполняет запрос.
+EXPLAIN_TIMEOUT_MS = 10000
+
+# EXPLAIN ANALYZE выполняет запрос, поэтому разбираются только чтения без блокировок:
+# блокирующее чтение на отдельном соединении ждало бы транзакцию самого запроса.
+# Кроме того, EXPLAIN выполняется в транзакции только для чтения.
+EXPLAINABLE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+LOCKING = re.compile(r"\bFOR\s+(NO\s+KEY\s+UPDATE|UPDATE|KEY\s+SHARE|SHARE)\b", re.I)
+DATA_MODIFYING = re.compile(r"\b(INSERT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+@dataclass
+class SlowQuery:
+    """
+    Запрос, выполнявшийся дольше порога журнала медленных запросов.
+    Значения параметров не сохраняются, только их типы.
+    """
+
+    engine: str
+    repo_method: str | None
+    statement: str
+    parameters: list[str] | dict[str, str]
+    # Количество наборов параметров (больше 1 для executemany).
+    batch_size: int
+    duration: float
+    recorded_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # План выполнения; заполняется позже, если запрос попал в выборку EXPLAIN.
+    plan: str | None = None
+
+
+def redact_parameters(parameters: Any) -> list[str] | dict[str, str]:
+    """
+    Замена значений параметров запроса названиями их типов.
+
+    :param parameters: Параметры одного выполнения (кортеж или словарь).
+    :return: Типы позиционных или именованных параметров.
+    """
+
+    def type_name(value: Any) -> str:
+        return "null" if value is None else type(value).__name__
+
+    if isinstance(parameters, dict):
+        return {key: type_name(value) for key, value in parameters.items()}
+    return [type_name(value) for value in parameters or ()]
+
+
+def is_explainable(statement: str) -> bool:
+    return (
+        EXPLAINABLE.match(statement) is not None
+        and LOCKING.search(statement) is None
+        and DATA_MODIFYING.search(statement) is None
+    )
+
+
+class SlowQueryLog:
+    """
+    Журнал медленных запросов: последние size запросов дольше threshold секунд.
+
+    Доля explain_rate медленных чтений повторно выполняется с EXPLAIN
+    (ANALYZE, BUFFERS) в Postgres или EXPLAIN QUERY PLAN в SQLite в фоне,
+    не задерживая сам запрос, на отдельном от пула приложения соединении
+    (см. create_explain_engine).
+    """
+
+    def __init__(
+        self, threshold: float, size: int = 100, explain_rate: float = 0.0
+    ) -> None:
+        """
+        Инициализация журнала.
+
+        :param threshold: Порог длительности запроса в секундах.
+        :param size: Количество хранимых запросов.
+        :param explain_rate: Доля медленных чтений, для которых снимается план (0..1).
+        """
+        self.threshold = threshold
+        self.explain_rate = explain_rate
+        self._queries: deque[SlowQuery] = deque(maxlen=size)
+        self._explains: dict[str, asyncio.Task] = {}
+
+    def record(self, query: SlowQuery) -> None:
+        self._queries.append(query)
+        DB_SLOW_QUERIES.labels(query.engine, query.repo_method or "").inc()
+        logger.warning(
+            "Slow query on %s (%.1f ms) in %s: %s; parameters: %s",
+            query.engine,
+            query.duration * 1000,
+            query.repo_method or "-",
+            query.statement,
+            query.parameters,
+        )
+
+    def recent(self) -> list[SlowQuery]:
+        """
+        Сохраненные медленные запросы, начиная с последнего.
+        """
+        return list(reversed(self._queries))
+
+    def sample_explain(self) -> bool:
+        return self.explain_rate > 0 and random.random() < self.explain_rate
+
+    def schedule_explain(
+        self, engine: AsyncEngine, query: SlowQuery, statement: str, parameters: Any
+    ) -> None:
+        """
+        Снятие плана запроса в фоновой задаче.
+        Одновременно для движка выполняется не больше одного EXPLAIN,
+        остальные попавшие в выборку запросы пропускаются.
+        """
+        if query.engine in self._explains:
+            return
+        try:
+            task = asyncio.get_running_loop().create_task(
+                self._explain(engine, query, statement, parameters)
+            )
+        except RuntimeError:
+            return
+        self._explains[query.engine] = task
+        task.add_done_callback(lambda _: self._explains.pop(query.engine, None))
+
+    async def _explain(
+        self, engine: AsyncEngine, query: SlowQuery, statement: str, parameters: Any
+    ) -> None:
+        try:
+            async with engine.connect() as connection:
+                if engine.dialect.name == "sqlite":
+                    result = await connection.exec_driver_sql(
+                        f"EXPLAIN QUERY PLAN {statement}", parameters
+                    )
+                    plan = [row[-1] for row in result]
+                else:
+                    result = await connection.exec_driver_sql(
+                        f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters
+                    )
+                    plan = [row[0] for row in result]
+                # Соединение закрывается с откатом транзакции.
+        except Exception:
+            logger.warning(
+                "EXPLAIN of the slow query on %s failed", query.engine, exc_info=True
+            )
+            return
+        query.plan = "\n".join(plan)
+        logger.warning(
+            "Plan of the slow query on %s in %s:\n%s",
+            query.engine,
+            query.repo_method or "-",
+            query.plan,
+        )
+
+
+def create_explain_engine(engine: AsyncEngine) -> AsyncEngine:
+    """
+    Движок для EXPLAIN с той же строкой подключения, что и у engine.
+    Соединение открывается на время одного EXPLAIN и не занимает пул приложения.
+    В Postgres оно ограничено statement_timeout и работает только на чтение.
+
+    :param engine: Движок, запросы которого разбираются.
+    :return: Движок без пула соединений.
+    """
+    connect_args = {}
+    if engine.dialect.name == "postgresql":
+        connect_args["server_settings"] = {
+            "statement_timeout": str(EXPLAIN_TIMEOUT_MS),
+            "default_transaction_read_only": "on",
+        }
+    return create_async_engine(engine.url, poolclass=NullPool, connect_args=connect_args)
+
+
+def instrument_slow_queries(engine: AsyncEngine, name: str, log: SlowQueryLog) -> None:
+    """
+    Подписка на события выполнения запросов движка для журнала медленных запросов.
+
+    :param engine: Асинхронный движок SQLAlchemy.
+    :param name: Имя движка в журнале (совпадает с именем пула в метриках).
+    :param log: Журнал медленных запросов.
+    """
+    sync_engine = engine.sync_engine
+    explain_engine = create_explain_engine(engine) if log.explain_rate > 0 else None
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        context.slow_query_start = time.perf_counter()
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        duration = time.perf_counter() - context.slow_query_start
+        if duration < log.threshold:
+            return
+        query = SlowQuery(
+            engine=name,
+            repo_method=REPO_METHOD.get(),
+            statement=statement,
+            parameters=redact_parameters(parameters[0] if executemany else parameters),
+            batch_size=len(parameters) if executemany else 1,
+            duration=duration,
+        )
+        log.record(query)
+        if (
+            explain_engine is not None
+            and not executemany
+            and is_explainable(statement)
+            and log.sample_explain()
+        ):
+            log.schedule_explain(explain_engine, query, statement, parameters)
@@ -0,0 +1,45 @@
+import secrets
+
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+
+from src.infra.metrics.slow_queries import SlowQueryLog
+
+
+def require_admin_token(
+    request: Request, authorization: str | None = Header(None)
+) -> None:
+    """
+    Проверка заголовка Authorization: Bearer <ADMIN_TOKEN>.
+
+    :raises HTTPException: 401, если токен не передан или не совпадает.
+    """
+    scheme, _, token = (authorization or "").partition(" ")
+    expected: str = request.app.state.admin_token
+    if scheme.lower() != "bearer" or not secrets.compare_digest(
+        token.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid admin token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+# Подключается, только если задан ADMIN_TOKEN.
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin_token)])
+
+
+@router.get("/slow-queries", include_in_schema=False)
+async def slow_queries(request: Request) -> Response:
+    # Последние медленные запросы, начиная с самого нового.
+    log: SlowQueryLog | None = request.app.state.slow_queries
+    if log is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Slow query log is disabled",
+        )
+    return Response(
+        orjson.dumps({"threshold": log.threshold, "queries": log.recent()}),
+        media_type="application/json",
+    )
@@ -1,11 +1,45 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
+DB_URI = "DB_URI"
 HOST = "DB_HOST"
 PORT = "DB_PORT"
 LOGIN = "DB_LOGIN"
 PASSWORD = "DB_PASSWORD"
 DATABASE = "DB_NAME"
+POOL_SIZE = "DB_POOL_SIZE"
+MAX_OVERFLOW = "DB_MAX_OVERFLOW"
+ECHO = "DB_ECHO"
+SLOW_QUERY_THRESHOLD = "DB_SLOW_QUERY_THRESHOLD"
+SLOW_QUERY_LOG_SIZE = "DB_SLOW_QUERY_LOG_SIZE"
+SLOW_QUERY_EXPLAIN_RATE = "DB_SLOW_QUERY_EXPLAIN_RATE"
+POOL_WARMUP = "DB_POOL_WARMUP"
+CONNECTION_BUDGET = "DB_CONNECTION_BUDGET"
+REPLICA_URIS = "DB_REPLICA_URIS"
+REPLICA_EJECT_SECONDS = "DB_REPLICA_EJECT_SECONDS"
+TASK_CACHE_SIZE = "TASK_CACHE_SIZE"
+TASK_CACHE_TTL = "TASK_CACHE_TTL"
+TASK_CACHE_INVALIDATION = "TASK_CACHE_INVALIDATION"
+TASK_REPO_BACKEND = "TASK_REPO_BACKEND"
+TASK_SNAPSHOT_PATH = "TASK_SNAPSHOT_PATH"
+TASK_SNAPSHOT_INTERVAL = "TASK_SNAPSHOT_INTERVAL"
+TASK_READ_COALESCING = "TASK_READ_COALESCING"
+TASK_GROUP_COMMIT_WINDOW = "TASK_GROUP_COMMIT_WINDOW"
+TASK_GROUP_COMMIT_MAX_ROWS = "TASK_GROUP_COMMIT_MAX_ROWS"
+TASK_EVENTS = "TASK_EVENTS"
+TASK_EVENTS_BUFFER = "TASK_EVENTS_BUFFER"
+TASK_EVENTS_RETENTION = "TASK_EVENTS_RETENTION"
+TASK_TOMBSTONE_RETENTION = "TASK_TOMBSTONE_RETENTION"
+SHUTDOWN_DRAIN_TIMEOUT = "SHUTDOWN_DRAIN_TIMEOUT"
+WEB_HOST = "WEB_HOST"
+WEB_PORT = "WEB_PORT"
+WEB_WORKERS = "WEB_WORKERS"
+ADMIN_TOKEN = "ADMIN_TOKEN"
+# Каталог метрик процессов; задается сервером при запуске нескольких процессов.
+PROMETHEUS_MULTIPROC_DIR = "PROMETHEUS_MULTIPROC_DIR"
+
+CACHE_INVALIDATION_MODES = ("none", "postgres")
+TASK_REPO_BACKENDS = ("sqlalchemy", "asyncpg", "memory")
 
 
 class ConfigParseError(ValueError):
@@ -16,6 +50,43 @@ class ConfigParseError(ValueError):
 class WebConfig:
     async_db_uri: str
     db_uri: str
+    pool_size: int = 15
+    max_overflow: int = 15
+    echo: bool = False
+    # Порог журнала медленных запросов в секундах; 0 — журнал отключен.
+    slow_query_threshold: float = 0.0
+    slow_query_log_size: int = 100
+    slow_query_explain_rate: float = 0.0
+    # Количество соединений, открываемых при запуске; None — весь pool_size.
+    pool_warmup: int | None = None
+    replica_async_db_uris: list[str] = field(default_factory=list)
+    replica_eject_seconds: float = 30.0
+    task_cache_size: int = 0
+    task_cache_ttl: float = 30.0
+    task_cache_invalidation: str = "none"
+    task_repo_backend: str = "sqlalchemy"
+    task_snapshot_path: str | None = None
+    task_snapshot_interval: float = 60.0
+    task_read_coalescing: bool = False
+    task_group_commit_window: float = 0.0
+    task_group_commit_max_rows: int = 256
+    task_events: bool = False
+    task_events_buffer: int = 256
+    task_events_retention: float = 86400.0
+    # Время хранения отметок об удалении для GET /tasks/changes (30 дней).
+    task_tombstone_retention: float = 2592000.0
+    shutdown_drain_timeout: float = 30.0
+    # Токен для адресов /admin; None — адреса не подключаются.
+    admin_token: str | None = None
+
+
+@dataclass
+class ServerConfig:
+    host: str = "0.0.0.0"
+    port: int = 8000
+    # 0 — по числу доступных процессору ядер.
+    workers: int = 0
+    graceful_shutdown_timeout: float = 30.0
 
 
 def get_str_env(key: str) -> str:
@@ -25,10 +96,210 @@ def get_str_env(key: str) -> str:
     return val
 
 
+def get_int_env(key: str, default: int) -> int:
+    val = os.getenv(key)
+    if not val:
+        return default
+    try:
+        return int(val)
+    except ValueError:
+        raise ConfigParseError(f"{key} must be an integer")
+
+
+def get_float_env(key: str, default: float) -> float:
+    val = os.getenv(key)
+    if not val:
+        return default
+    try:
+        return float(val)
+    except ValueError:
+        raise ConfigParseError(f"{key} must be a number")
+
+
+def get_bool_env(key: str, default: bool) -> bool:
+    val = os.getenv(key)
+    if not val:
+        return default
+    if val.lower() in ("1", "true", "yes", "on"):
+        return True
+    if val.lower() in ("0", "false", "no", "off"):
+        return False
+    raise ConfigParseError(f"{key} must be a boolean")
+
+
+def get_choice_env(key: str, choices: tuple[str, ...], default: str) -> str:
+    val = os.getenv(key) or default
+    if val not in choices:
+        raise ConfigParseError(f"{key} must be one of: {', '.join(choices)}")
+    return val
+
+
+def is_sqlite_uri(uri: str) -> bool:
+    return uri.partition("://")[0] in ("sqlite", "sqlite+aiosqlite")
+
+
+def parse_db_uri(uri: str) -> tuple[str, str]:
+    """
+    Разбор строки подключения к основной БД.
+    Из одной строки получаются асинхронная (для приложения) и синхронная
+    (для миграций) строки подключения.
+
+    :param uri: Строка подключения postgresql:// или sqlite:///путь/к/файлу.
+    :return: Асинхронная и синхронная строки подключения.
+    :raises ConfigParseError: Если схема строки подключения не поддерживается.
+    """
+    scheme, sep, rest = uri.partition("://")
+    if sep and scheme in ("postgresql", "postgresql+asyncpg"):
+        return f"postgresql+asyncpg://{rest}", f"postgresql://{rest}"
+    if sep and is_sqlite_uri(uri):
+        if rest in ("", "/", "/:memory:"):
+            # У каждого соединения с :memory: своя база, а приложению нужна общая.
+            raise ConfigParseError(f"{DB_URI} must point to an SQLite file")
+        return f"sqlite+aiosqlite://{rest}", f"sqlite://{rest}"
+    raise ConfigParseError(f"{DB_URI} must be a postgresql:// or sqlite:/// URI")
+
+
+def split_connection_budget(
+    budget: int, workers: int, reserved: int = 0
+) -> tuple[int, int]:
+    """
+    Разделение общего лимита соединений с БД между процессами приложения.
+    Из доли процесса вычитаются соединения вне пула (см. reserved_connections),
+    из остатка половина — постоянные соединения пула, половина — временные.
+
+    :param budget: Максимальное количество соединений всех процессов с одной БД.
+    :param workers: Количество процессов.
+    :param reserved: Соединения одного процесса с той же БД помимо пула.
+    :return: pool_size и max_overflow одного процесса.
+    :raises ConfigParseError: Если на пул процесса приходится меньше одного соединения.
+    """
+    per_worker = budget // workers - reserved
+    if per_worker < 1:
+        raise ConfigParseError(
+            f"{CONNECTION_BUDGET} must be at least {workers * (reserved + 1)}"
+            f" for {workers} workers"
+        )
+    pool_size = (per_worker + 1) // 2
+    return pool_size, per_worker - pool_size
+
+
+def reserved_connections(config: WebConfig) -> int:
+    """
+    Соединения процесса с основной БД, не входящие в делимый пул:
+    LISTEN шины инвалидации кэша и ленты событий задач, соединение EXPLAIN
+    журнала медленных запросов, а для SQLite — единственное пишущее
+    соединение (пул делят читающие соединения).
+
+    :param config: Конфигурация приложения.
+    :return: Количество соединений.
+    """
+    reserved = 0
+    if config.task_cache_size > 0 and config.task_cache_invalidation == "postgres":
+        reserved += 1
+    if config.task_events:
+        reserved += 1
+    if config.slow_query_threshold > 0 and config.slow_query_explain_rate > 0:
+        reserved += 1
+    if is_sqlite_uri(config.async_db_uri):
+        reserved += 1
+    return reserved
+
+
+def get_uri_list_env(key: str) -> list[str]:
+    """
+    Получение списка строк подключения, разделенных запятыми.
+    Строки подключения приводятся к асинхронному драйверу asyncpg.
+    """
+    val = os.getenv(key) or ""
+    uris = []
+    for uri in filter(None, (part.strip() for part in val.split(","))):
+        scheme, sep, rest = uri.partition("://")
+        if not sep or scheme not in ("postgresql", "postgresql+asyncpg"):
+            raise ConfigParseError(f"{key} must contain postgresql:// URIs")
+        uris.append(f"postgresql+asyncpg://{rest}")
+    return uris
+
+
 def load_web_config() -> WebConfig:
-    async_db_uri = f"postgresql+asyncpg://{get_str_env(LOGIN)}:{get_str_env(PASSWORD)}@{get_str_env(HOST)}:{get_str_env(PORT)}/{get_str_env(DATABASE)}"
-    db_uri = f"postgresql://{get_str_env(LOGIN)}:{get_str_env(PASSWORD)}@{get_str_env(HOST)}:{get_str_env(PORT)}/{get_str_env(DATABASE)}"
-    return WebConfig(
+    task_repo_backend = get_choice_env(
+        TASK_REPO_BACKEND, TASK_REPO_BACKENDS, "sqlalchemy"
+    )
+    if os.getenv(DB_URI):
+        async_db_uri, db_uri = parse_db_uri(get_str_env(DB_URI))
+    # Хранилищу в памяти база данных не нужна.
+    elif task_repo_backend == "memory" and not os.getenv(HOST):
+        async_db_uri = db_uri = ""
+    else:
+        async_db_uri = f"postgresql+asyncpg://{get_str_env(LOGIN)}:{get_str_env(PASSWORD)}@{get_str_env(HOST)}:{get_str_env(PORT)}/{get_str_env(DATABASE)}"
+        db_uri = f"postgresql://{get_str_env(LOGIN)}:{get_str_env(PASSWORD)}@{get_str_env(HOST)}:{get_str_env(PORT)}/{get_str_env(DATABASE)}"
+    config = WebConfig(
         async_db_uri=async_db_uri,
         db_uri=db_uri,
+        pool_size=get_int_env(POOL_SIZE, 15),
+        max_overflow=get_int_env(MAX_OVERFLOW, 15),
+        echo=get_bool_env(ECHO, False),
+        slow_query_threshold=get_float_env(SLOW_QUERY_THRESHOLD, 0.0),
+        slow_query_log_size=get_int_env(SLOW_QUERY_LOG_SIZE, 100),
+        slow_query_explain_rate=get_float_env(SLOW_QUERY_EXPLAIN_RATE, 0.0),
+        replica_async_db_uris=get_uri_list_env(REPLICA_URIS),
+        replica_eject_seconds=get_float_env(REPLICA_EJECT_SECONDS, 30.0),
+        task_cache_size=get_int_env(TASK_CACHE_SIZE, 0),
+        task_cache_ttl=get_float_env(TASK_CACHE_TTL, 30.0),
+        task_cache_invalidation=get_choice_env(
+            TASK_CACHE_INVALIDATION, CACHE_INVALIDATION_MODES, "none"
+        ),
+        task_repo_backend=task_repo_backend,
+        task_snapshot_path=os.getenv(TASK_SNAPSHOT_PATH) or None,
+        task_snapshot_interval=get_float_env(TASK_SNAPSHOT_INTERVAL, 60.0),
+        task_read_coalescing=get_bool_env(TASK_READ_COALESCING, False),
+        task_group_commit_window=get_float_env(TASK_GROUP_COMMIT_WINDOW, 0.0),
+        task_group_commit_max_rows=get_int_env(TASK_GROUP_COMMIT_MAX_ROWS, 256),
+        task_events=get_bool_env(TASK_EVENTS, False),
+        task_events_buffer=get_int_env(TASK_EVENTS_BUFFER, 256),
+        task_events_retention=get_float_env(TASK_EVENTS_RETENTION, 86400.0),
+        task_tombstone_retention=get_float_env(TASK_TOMBSTONE_RETENTION, 2592000.0),
+        shutdown_drain_timeout=get_float_env(SHUTDOWN_DRAIN_TIMEOUT, 30.0),
+        admin_token=os.getenv(ADMIN_TOKEN) or None,
     )
+    connection_budget = get_int_env(CONNECTION_BUDGET, 0)
+    if connection_budget > 0:
+        # Число процессов передает в окружение точка входа server.
+        config.pool_size, config.max_overflow = split_connection_budget(
+            connection_budget,
+            max(get_int_env(WEB_WORKERS, 1), 1),
+            reserved_connections(config),
+        )
+    config.pool_warmup = get_int_env(POOL_WARMUP, config.pool_size)
+    if not 0 <= config.slow_query_explain_rate <= 1:
+        raise ConfigParseError(f"{SLOW_QUERY_EXPLAIN_RATE} must be between 0 and 1")
+    if config.task_events and config.task_repo_backend == "memory":
+        raise ConfigParseError(f"{TASK_EVENTS} requires PostgreSQL")
+    if is_sqlite_uri(config.async_db_uri):
+        validate_sqlite_config(config)
+    return config
+
+
+def load_server_config() -> ServerConfig:
+    return ServerConfig(
+        host=os.getenv(WEB_HOST) or "0.0.0.0",
+        port=get_int_env(WEB_PORT, 8000),
+        workers=get_int_env(WEB_WORKERS, 0),
+        graceful_shutdown_timeout=get_float_env(SHUTDOWN_DRAIN_TIMEOUT, 30.0),
+    )
+
+
+def validate_sqlite_config(config: WebConfig) -> None:
+    """
+    Проверка, что с SQLite не включены возможности, которым нужен Postgres.
+
+    :param config: Конфигурация приложения.
+    :raises ConfigParseError: Если такая возможность включена.
+    """
+    if config.task_repo_backend == "asyncpg":
+        raise ConfigParseError(f"{TASK_REPO_BACKEND}=asyncpg requires PostgreSQL")
+    if config.task_cache_invalidation == "postgres":
+        raise ConfigParseError(f"{TASK_CACHE_INVALIDATION}=postgres requires PostgreSQL")
+    if config.replica_async_db_uris:
+        raise ConfigParseError(f"{REPLICA_URIS} requires PostgreSQL")
+    if config.task_events:
+        raise ConfigParseError(f"{TASK_EVENTS} requires PostgreSQL")
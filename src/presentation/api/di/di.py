@@ -1,31 +1,260 @@
 from functools import partial
+from pathlib import Path
 
 from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from src.infra.cache.invalidation import InvalidationBus, PostgresInvalidationBus
+from src.infra.cache.lru import LRUCache
+from src.infra.cache.task import CachingTaskRepo
+from src.infra.database.asyncpg_connection import AsyncpgDatabase, new_asyncpg_session
 from src.infra.database.connection import create_session_maker, new_session
-from src.presentation.api.config import WebConfig
+from src.infra.database.group_commit import GroupCommitWriter
+from src.infra.database.replicas import ReplicaRouter
+from src.infra.database.task_events import TaskEventHub
+from src.infra.database.single_flight import TaskReadCoalescer
+from src.infra.database.repositories.asyncpg_task import AsyncpgTaskRepo, prime_connection
+from src.infra.database.repositories.task import BaseTaskRepo, TaskRepo
+from src.infra.database.warmup import EngineLifecycle, task_reads_primer
+from src.infra.memory.task import (
+    InMemoryTaskRepo,
+    InMemoryTaskStore,
+    new_memory_session,
+)
+from src.infra.metrics.collectors import CacheMetrics
+from src.infra.metrics.repo import InstrumentedTaskRepo
+from src.infra.metrics.slow_queries import SlowQueryLog
+from src.presentation.api.config import WebConfig, is_sqlite_uri
 from src.presentation.api.di.providers import (
+    TaskRepoFactory,
+    provide_caching_uow,
+    provide_coalescing_task_reader,
+    provide_group_commit_task_creator,
+    provide_read_session,
     provide_task_deleter,
+    provide_task_exporter,
+    provide_task_reader_repo,
     provide_task_repo,
     provide_task_creator,
     provide_task_reader,
     provide_task_updater,
+    provide_uow,
 )
 from src.presentation.api.di.stub import (
+    provide_read_session_stub,
     provide_session_stub,
     provide_task_deleter_stub,
+    provide_task_event_hub_stub,
+    provide_task_exporter_stub,
+    provide_task_reader_repo_stub,
     provide_task_repo_stub,
     provide_task_creator_stub,
     provide_task_reader_stub,
     provide_task_updater_stub,
+    provide_uow_stub,
 )
 
 
 def init_dependencies(app: FastAPI, config: WebConfig) -> None:
-    session_maker = create_session_maker(config)
-    app.dependency_overrides[provide_session_stub] = partial(new_session, session_maker)
-    app.dependency_overrides[provide_task_repo_stub] = provide_task_repo
+    app.state.resources = []
+    app.state.slow_queries = None
+
+    if config.task_repo_backend == "asyncpg":
+        base_repo_factory = init_asyncpg_sessions(app, config)
+    elif config.task_repo_backend == "memory":
+        base_repo_factory = init_memory_store(app, config)
+    else:
+        base_repo_factory = init_sqlalchemy_sessions(app, config)
+
+    repo_factory = create_task_repo_factory(app, config, base_repo_factory)
+    app.dependency_overrides[provide_task_repo_stub] = partial(
+        provide_task_repo, repo_factory
+    )
+    app.dependency_overrides[provide_task_reader_repo_stub] = partial(
+        provide_task_reader_repo, repo_factory
+    )
+
     app.dependency_overrides[provide_task_creator_stub] = provide_task_creator
+    if config.task_group_commit_window > 0 and config.task_repo_backend != "memory":
+        group_commit = GroupCommitWriter(
+            app.dependency_overrides[provide_session_stub],
+            repo_factory,
+            config.task_group_commit_window,
+            config.task_group_commit_max_rows,
+        )
+        app.state.resources.append(group_commit)
+        app.dependency_overrides[provide_task_creator_stub] = partial(
+            provide_group_commit_task_creator, group_commit
+        )
     app.dependency_overrides[provide_task_reader_stub] = provide_task_reader
+    if config.task_read_coalescing and config.task_repo_backend != "memory":
+        coalescer = TaskReadCoalescer(app.state.read_sessions, repo_factory)
+        app.state.task_read_coalescer = coalescer
+        app.dependency_overrides[provide_task_reader_stub] = partial(
+            provide_caching_uow,
+    provide_coalescing_task_reader, coalescer
+        )
+    app.dependency_overrides[provide_task_exporter_stub] = partial(
+        provide_task_exporter, app.state.read_sessions, repo_factory
+    )
     app.dependency_overrides[provide_task_updater_stub] = provide_task_updater
     app.dependency_overrides[provide_task_deleter_stub] = provide_task_deleter
+    app.dependency_overrides[provide_uow_stub] = provide_uow
+    if config.task_cache_size > 0:
+        app.dependency_overrides[provide_uow_stub] = provide_caching_uow
+
+    init_task_events(app, config)
+
+
+def init_sqlalchemy_sessions(app: FastAPI, config: WebConfig) -> TaskRepoFactory:
+    slow_queries = None
+    if config.slow_query_threshold > 0:
+        slow_queries = SlowQueryLog(
+            config.slow_query_threshold,
+            config.slow_query_log_size,
+            config.slow_query_explain_rate,
+        )
+        app.state.slow_queries = slow_queries
+
+    session_maker = create_session_maker(config, slow_queries=slow_queries)
+    manage_engine(app, config, session_maker)
+    app.dependency_overrides[provide_session_stub] = partial(new_session, session_maker)
+    app.state.read_sessions = partial(new_session, session_maker, release_after_read=True)
+    app.dependency_overrides[provide_read_session_stub] = app.state.read_sessions
+
+    if is_sqlite_uri(config.async_db_uri):
+        # Единственное пишущее соединение SQLite не должно занимать чтение.
+        read_session_maker = create_session_maker(
+            config, name="reader", read_only=True, slow_queries=slow_queries
+        )
+        manage_engine(app, config, read_session_maker)
+        app.state.read_sessions = partial(
+            new_session, read_session_maker, release_after_read=True
+        )
+        app.dependency_overrides[provide_read_session_stub] = app.state.read_sessions
+
+    if config.replica_async_db_uris:
+        replica_session_makers = [
+            create_session_maker(
+                config, uri, f"replica-{index}", slow_queries=slow_queries
+            )
+            for index, uri in enumerate(config.replica_async_db_uris)
+        ]
+        for replica_session_maker in replica_session_makers:
+            # Недоступная при запуске реплика исключается роутером
+            # и не должна мешать запуску приложения.
+            manage_engine(app, config, replica_session_maker, required=False)
+        router = ReplicaRouter(replica_session_makers, config.replica_eject_seconds)
+        app.state.replica_router = router
+        app.state.read_sessions = partial(
+            provide_read_session, router, session_maker, False
+        )
+        app.dependency_overrides[provide_read_session_stub] = partial(
+            provide_read_session, router, session_maker
+        )
+
+    return TaskRepo
+
+
+def manage_engine(
+    app: FastAPI,
+    config: WebConfig,
+    session_maker: async_sessionmaker,
+    required: bool = True,
+) -> None:
+    """
+    Движок фабрики сессий подготавливается при запуске приложения
+    и закрывается при его остановке.
+    """
+    connections = config.pool_size if config.pool_warmup is None else config.pool_warmup
+    app.state.resources.append(
+        EngineLifecycle(
+            session_maker.kw["bind"], connections, task_reads_primer(TaskRepo), required
+        )
+    )
+
+
+def init_asyncpg_sessions(app: FastAPI, config: WebConfig) -> TaskRepoFactory:
+    """
+    Сессии поверх пула asyncpg для репозитория без ORM.
+    Реплики чтения в этом режиме не используются.
+    """
+    database = AsyncpgDatabase(
+        config.db_uri,
+        min_size=config.pool_size,
+        max_size=config.pool_size + config.max_overflow,
+        init=prime_connection,
+    )
+    app.state.resources.append(database)
+    app.dependency_overrides[provide_session_stub] = partial(
+        new_asyncpg_session, database
+    )
+    app.state.read_sessions = partial(new_asyncpg_session, database)
+    app.dependency_overrides[provide_read_session_stub] = app.state.read_sessions
+    return AsyncpgTaskRepo
+
+
+def init_memory_store(app: FastAPI, config: WebConfig) -> TaskRepoFactory:
+    """
+    Хранилище задач в памяти процесса, общее для всех запросов.
+    Хранилище выступает и сессией запроса, и единицей работы.
+    """
+    snapshot_path = Path(config.task_snapshot_path) if config.task_snapshot_path else None
+    store = InMemoryTaskStore(
+        snapshot_path, config.task_snapshot_interval, config.task_tombstone_retention
+    )
+    app.state.resources.append(store)
+    app.state.task_store = store
+    app.dependency_overrides[provide_session_stub] = lambda: store
+    app.dependency_overrides[provide_read_session_stub] = lambda: store
+    app.state.read_sessions = partial(new_memory_session, store)
+    return InMemoryTaskRepo
+
+
+def create_task_repo_factory(
+    app: FastAPI, config: WebConfig, base_repo_factory: TaskRepoFactory = TaskRepo
+) -> TaskRepoFactory:
+    def instrumented(session: AsyncSession) -> BaseTaskRepo:
+        return InstrumentedTaskRepo(base_repo_factory(session))
+
+    if config.task_cache_size <= 0:
+        return instrumented
+
+    cache = LRUCache(
+        config.task_cache_size, config.task_cache_ttl, observer=CacheMetrics()
+    )
+    bus = create_invalidation_bus(config)
+    if bus is not None:
+        bus.subscribe(cache.invalidate)
+        bus.on_reset(cache.clear)
+        app.state.resources.append(bus)
+    app.state.task_cache = cache
+
+    def cached(session: AsyncSession) -> BaseTaskRepo:
+        return CachingTaskRepo(instrumented(session), cache, bus)
+
+    return cached
+
+
+def init_task_events(app: FastAPI, config: WebConfig) -> None:
+    """
+    Лента событий задач: одно соединение LISTEN на процесс.
+    Если лента выключена, зависимость возвращает None.
+    """
+    hub = None
+    if config.task_events:
+        hub = TaskEventHub(
+            config.db_uri,
+            buffer_size=config.task_events_buffer,
+            retention=config.task_events_retention,
+        )
+        app.state.resources.append(hub)
+    app.state.task_events = hub
+    app.dependency_overrides[provide_task_event_hub_stub] = lambda: hub
+
+
+def create_invalidation_bus(config: WebConfig) -> InvalidationBus | None:
+    if config.task_cache_invalidation == "postgres":
+        return PostgresInvalidationBus(config.db_uri)
+    return None
+
@@ -1,9 +1,30 @@
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, Callable
 
-from src.infra.database.repositories.task import BaseTaskRepo, TaskRepo
-from src.presentation.api.di.stub import provide_session_stub, provide_task_repo_stub
-from src.application.interfaces import TaskCreator, TaskDeleter, TaskReader, TaskUpdater
+from fastapi import Depends, Header
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.infra.cache.task import CachingTaskRepo, CachingUnitOfWork
+from src.infra.database.asyncpg_connection import AsyncpgSession
+from src.infra.database.export import SessionTaskExporter
+from src.infra.database.group_commit import GroupCommitWriter
+from src.infra.database.replicas import ReplicaRouter, open_read_session
+from src.infra.database.single_flight import TaskReadCoalescer
+from src.infra.database.repositories.task import BaseTaskRepo
+from src.infra.memory.task import InMemoryTaskStore
+from src.presentation.api.di.stub import (
+    provide_read_session_stub,
+    provide_session_stub,
+    provide_task_reader_repo_stub,
+    provide_task_repo_stub,
+)
+from src.application.interfaces import (
+    TaskCreator,
+    TaskDeleter,
+    TaskExporter,
+    TaskReader,
+    TaskUpdater,
+    UnitOfWork,
+)
 from src.application.interactors import (
     TaskCreatorImpl,
     TaskDeleterImpl,
@@ -12,10 +33,49 @@ from src.application.interactors import (
 )
 
 
+TaskRepoFactory = Callable[
+    [AsyncSession | AsyncpgSession | InMemoryTaskStore], BaseTaskRepo
+]
+
+
+async def provide_read_session(
+    router: ReplicaRouter,
+    primary_session_maker: async_sessionmaker[AsyncSession],
+    read_your_writes: bool = Header(False, alias="X-Read-Your-Writes"),
+) -> AsyncIterator[AsyncSession]:
+    async with open_read_session(
+        router, primary_session_maker, read_your_writes
+    ) as session:
+        yield session
+
+
 async def provide_task_repo(
+    repo_factory: TaskRepoFactory,
     session: AsyncSession = Depends(provide_session_stub),
 ) -> BaseTaskRepo:
-    return TaskRepo(session)
+    return repo_factory(session)
+
+
+async def provide_task_reader_repo(
+    repo_factory: TaskRepoFactory,
+    session: AsyncSession = Depends(provide_read_session_stub),
+) -> BaseTaskRepo:
+    return repo_factory(session)
+
+
+async def provide_uow(
+    session: AsyncSession = Depends(provide_session_stub),
+) -> UnitOfWork:
+    return session
+
+
+async def provide_caching_uow(
+    session: AsyncSession = Depends(provide_session_stub),
+    repo: CachingTaskRepo = Depends(provide_task_repo_stub),
+) -> UnitOfWork:
+    # Репозиторий запроса общий для всех интеракторов, поэтому после фиксации
+    # инвалидируются все задачи, измененные пакетными операциями запроса.
+    return CachingUnitOfWork(session, repo)
 
 
 async def provide_task_creator(
@@ -24,12 +84,39 @@ async def provide_task_creator(
     return TaskCreatorImpl(repo)
 
 
-async def provide_task_reader(
+async def provide_group_commit_task_creator(
+    group_commit: GroupCommitWriter,
     repo: BaseTaskRepo = Depends(provide_task_repo_stub),
+) -> TaskCreator:
+    return TaskCreatorImpl(repo, group_commit)
+
+
+async def provide_task_reader(
+    repo: BaseTaskRepo = Depends(provide_task_reader_repo_stub),
 ) -> TaskReader:
     return TaskReaderImpl(repo)
 
 
+async def provide_coalescing_task_reader(
+    coalescer: TaskReadCoalescer,
+    repo: BaseTaskRepo = Depends(provide_task_reader_repo_stub),
+    read_your_writes: bool = Header(False, alias="X-Read-Your-Writes"),
+) -> TaskReader:
+    # Общий запрос может начаться до записи клиента, поэтому запросы,
+    # которым нужно видеть свои записи, не объединяются.
+    if read_your_writes:
+        return TaskReaderImpl(repo)
+    return TaskReaderImpl(repo, coalescer)
+
+
+async def provide_task_exporter(
+    sessions: Callable[[], AsyncIterator[Any]], repo_factory: TaskRepoFactory
+) -> TaskExporter:
+    # Выгрузка не использует сессию запроса: она закрывается раньше,
+    # чем начинает отправляться потоковый ответ.
+    return SessionTaskExporter(sessions, repo_factory)
+
+
 async def provide_task_updater(
     repo: BaseTaskRepo = Depends(provide_task_repo_stub),
 ) -> TaskUpdater:
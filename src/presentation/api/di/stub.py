@@ -2,10 +2,18 @@ def provide_session_stub() -> None:
     raise NotImplementedError
 
 
+def provide_read_session_stub() -> None:
+    raise NotImplementedError
+
+
 def provide_task_repo_stub() -> None:
     raise NotImplementedError
 
 
+def provide_task_reader_repo_stub() -> None:
+    raise NotImplementedError
+
+
 def provide_task_creator_stub() -> None:
     raise NotImplementedError
 
@@ -14,9 +22,21 @@ def provide_task_reader_stub() -> None:
     raise NotImplementedError
 
 
+def provide_task_exporter_stub() -> None:
+    raise NotImplementedError
+
+
 def provide_task_updater_stub() -> None:
     raise NotImplementedError
 
 
 def provide_task_deleter_stub() -> None:
     raise NotImplementedError
+
+
+def provide_uow_stub() -> None:
+    raise NotImplementedError
+
+
+def provide_task_event_hub_stub() -> None:
+    raise NotImplementedError
@@ -0,0 +1,94 @@
+import hashlib
+from typing import Iterable
+
+from src.application.projection import TaskProjection
+from src.domain.entities import Task
+
+
+def make_version_etag(version: int) -> str:
+    """
+    Сильный ETag задачи, основанный на ее версии.
+
+    :param version: Версия задачи.
+    :return: Значение заголовка ETag.
+    """
+    return f'"{version}"'
+
+
+def make_task_etag(task: Task) -> str:
+    return make_version_etag(task.version)
+
+
+def make_list_etag(tasks: Iterable[Task], next_cursor: str | None) -> str:
+    """
+    Слабый ETag страницы задач, основанный на uuid и версиях задач на странице.
+
+    :param tasks: Задачи на странице.
+    :param next_cursor: Курсор следующей страницы.
+    :return: Значение заголовка ETag.
+    """
+    return _list_etag(((task.uuid, task.version) for task in tasks), next_cursor)
+
+
+def make_projection_list_etag(
+    projections: Iterable[TaskProjection],
+    next_cursor: str | None,
+    fields: tuple[str, ...],
+) -> str:
+    """
+    Слабый ETag страницы задач с набором полей.
+    Набор полей входит в ETag, чтобы разные представления страницы не совпадали.
+
+    :param projections: Задачи на странице; должны содержать uuid и version.
+    :param next_cursor: Курсор следующей страницы.
+    :param fields: Поля задач в ответе.
+    :return: Значение заголовка ETag.
+    """
+    versions = ((p["uuid"], p["version"]) for p in projections)
+    return _list_etag(versions, f"{next_cursor or ''}|{','.join(fields)}")
+
+
+def _list_etag(versions: Iterable[tuple[str, int]], suffix: str | None) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    for uuid, version in versions:
+        digest.update(f"{uuid}:{version};".encode())
+    digest.update((suffix or "").encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _opaque_tag(etag: str) -> str:
+    etag = etag.strip()
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def if_none_match_satisfied(if_none_match: str | None, etag: str) -> bool:
+    """
+    Проверка заголовка If-None-Match слабым сравнением (RFC 9110, 13.1.2).
+
+    :param if_none_match: Значение заголовка If-None-Match.
+    :param etag: Текущий ETag ресурса.
+    :return: True, если у клиента актуальная версия и можно ответить 304.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tag = _opaque_tag(etag)
+    return any(_opaque_tag(candidate) == tag for candidate in if_none_match.split(","))
+
+
+def parse_if_match(if_match: str | None) -> int | None:
+    """
+    Получение ожидаемой версии задачи из заголовка If-Match.
+    Для If-Match допускается только сильное сравнение, поэтому слабые ETag отклоняются.
+
+    :param if_match: Значение заголовка If-Match.
+    :return: Ожидаемая версия или None, если подойдет любая.
+    :raises ValueError: Если заголовок не содержит ровно один сильный ETag версии.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    etag = if_match.strip()
+    if not (len(etag) > 2 and etag[0] == etag[-1] == '"'):
+        raise ValueError(f"Unsupported If-Match value: {if_match}")
+    return int(etag[1:-1])
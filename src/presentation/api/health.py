@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from typing import Callable
+
+from fastapi import APIRouter, Request, Response, status
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class AppLifecycle:
+    """
+    Состояние жизненного цикла приложения: запуск, готовность, остановка.
+
+    Учитывает выполняющиеся HTTP-запросы, чтобы при остановке дождаться
+    их завершения до закрытия пулов соединений.
+    """
+
+    def __init__(self, drain_timeout: float = 30.0) -> None:
+        """
+        Инициализация.
+
+        :param drain_timeout: Максимальное время ожидания запросов при остановке.
+        """
+        self.state = "starting"
+        self._drain_timeout = drain_timeout
+        self._in_flight = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._drain_callbacks: list[Callable[[], None]] = []
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def request_started(self) -> None:
+        self._in_flight += 1
+        self._idle.clear()
+
+    def request_finished(self) -> None:
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self._idle.set()
+
+    def on_drain(self, callback: Callable[[], None]) -> None:
+        """
+        Регистрация функции, вызываемой в начале остановки.
+        Нужна бессрочным запросам (например, потокам событий), чтобы они
+        завершились, не дожидаясь таймаута.
+
+        :param callback: Функция без аргументов.
+        """
+        self._drain_callbacks.append(callback)
+
+    async def drain(self) -> None:
+        """
+        Перевод в состояние остановки и ожидание выполняющихся запросов.
+        Проверка готовности с этого момента не проходит.
+        """
+        self.state = "draining"
+        for callback in self._drain_callbacks:
+            callback()
+        try:
+            await asyncio.wait_for(self._idle.wait(), self._drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Shutting down with %d requests still in flight", self._in_flight
+            )
+
+
+class InFlightMiddleware:
+    """
+    ASGI middleware, учитывающий выполняющиеся HTTP-запросы в AppLifecycle.
+    Запрос считается выполняющимся до отправки последней части ответа.
+    """
+
+    def __init__(self, app: ASGIApp, lifecycle: AppLifecycle) -> None:
+        self.app = app
+        self.lifecycle = lifecycle
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self.lifecycle.request_started()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.lifecycle.request_finished()
+
+
+@router.get("/health/live", include_in_schema=False)
+async def live() -> Response:
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get("/health/ready", include_in_schema=False)
+async def ready(request: Request) -> Response:
+    # Готовность проходит только после подготовки пулов соединений
+    # и перестает проходить с началом остановки.
+    lifecycle: AppLifecycle = request.app.state.lifecycle
+    if not lifecycle.ready:
+        return Response(lifecycle.state, status_code=status.HTTP_503_SERVICE_UNAVAILABLE)
+    return Response(lifecycle.state, status_code=status.HTTP_200_OK)
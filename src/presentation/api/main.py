@@ -1,20 +1,54 @@
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 
-from src.presentation.api.config import load_web_config
+from src.presentation.api.admin import router as admin_router
+from src.presentation.api.config import WebConfig, load_web_config
 from src.presentation.api.di.di import init_dependencies
+from src.presentation.api.health import AppLifecycle, InFlightMiddleware
+from src.presentation.api.health import router as health_router
+from src.presentation.api.metrics import PrometheusMiddleware, release_process_metrics
+from src.presentation.api.metrics import router as metrics_router
 from src.presentation.api.task.handlers import router as task_router
 
 
-def create_app() -> FastAPI:
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # Ресурсы (пулы соединений, фоновые задачи) закрываются в обратном порядке,
+    # после того как дождались выполняющиеся запросы.
+    lifecycle: AppLifecycle = app.state.lifecycle
+    async with AsyncExitStack() as stack:
+        for resource in app.state.resources:
+            await stack.enter_async_context(resource)
+        lifecycle.state = "ready"
+        yield
+        await lifecycle.drain()
+    release_process_metrics()
+
+
+def create_app(config: WebConfig | None = None) -> FastAPI:
     app = FastAPI(
         title="todo-list",
         debug=False,
+        lifespan=lifespan,
     )
 
-    config = load_web_config()
+    if config is None:
+        config = load_web_config()
 
     init_dependencies(app, config)
+    app.state.lifecycle = AppLifecycle(config.shutdown_drain_timeout)
+    if app.state.task_events is not None:
+        app.state.lifecycle.on_drain(app.state.task_events.close_subscriptions)
 
     app.include_router(task_router)
+    app.include_router(metrics_router)
+    app.include_router(health_router)
+    app.state.admin_token = config.admin_token
+    if config.admin_token:
+        app.include_router(admin_router)
+    app.add_middleware(PrometheusMiddleware)
+    app.add_middleware(InFlightMiddleware, lifecycle=app.state.lifecycle)
 
     return app
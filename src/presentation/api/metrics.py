@@ -0,0 +1,80 @@
+import os
+import time
+
+from fastapi import APIRouter, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    generate_latest,
+    multiprocess,
+)
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.infra.metrics.collectors import HTTP_REQUEST_DURATION
+from src.presentation.api.config import PROMETHEUS_MULTIPROC_DIR
+
+router = APIRouter()
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    Реестр метрик для /metrics.
+    В режиме нескольких процессов метрики всех процессов читаются из общего
+    каталога, иначе ответ зависел бы от процесса, принявшего запрос.
+
+    :return: Реестр метрик.
+    """
+    if not os.getenv(PROMETHEUS_MULTIPROC_DIR):
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def release_process_metrics() -> None:
+    """
+    Исключение датчиков остановленного процесса из суммы по процессам.
+    """
+    if os.getenv(PROMETHEUS_MULTIPROC_DIR):
+        multiprocess.mark_process_dead(os.getpid())
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    return Response(generate_latest(metrics_registry()), media_type=CONTENT_TYPE_LATEST)
+
+
+class PrometheusMiddleware:
+    """
+    ASGI middleware, замеряющий длительность запросов по шаблону маршрута.
+    Используется шаблон (например, /tasks/{task_uuid}), а не фактический путь,
+    чтобы число временных рядов не зависело от количества задач.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "<unmatched>"),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
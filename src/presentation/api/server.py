@@ -0,0 +1,108 @@
+"""
+Запуск приложения в production.
+
+    python -m src.presentation.api.server
+
+Запускает WEB_WORKERS процессов uvicorn (по умолчанию по числу доступных
+ядер) с циклом событий uvloop и разбором HTTP через httptools. Если задан
+DB_CONNECTION_BUDGET, каждый процесс получает свою долю этого лимита
+соединений с БД (см. split_connection_budget). Метрики процессов
+собираются в каталоге PROMETHEUS_MULTIPROC_DIR (см. prepare_multiprocess_metrics).
+"""
+
+import math
+import os
+import tempfile
+from pathlib import Path
+
+import uvicorn
+
+from src.presentation.api.config import (
+    PROMETHEUS_MULTIPROC_DIR,
+    TASK_REPO_BACKEND,
+    WEB_WORKERS,
+    ServerConfig,
+    load_server_config,
+)
+
+APP = "src.presentation.api.main:create_app"
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+
+def available_cpus() -> int:
+    """
+    Количество ядер, доступных процессу.
+    Учитываются привязка процесса к ядрам и квота CPU контейнера (cgroup v2),
+    которых не видит os.cpu_count().
+
+    :return: Количество ядер, не меньше одного.
+    """
+    cpus = len(os.sched_getaffinity(0))
+    try:
+        quota, period = CGROUP_CPU_MAX.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def resolve_workers(config: ServerConfig) -> int:
+    """
+    Количество процессов приложения.
+    Асинхронному процессу достаточно одного ядра, поэтому по умолчанию
+    процессов столько же, сколько доступных ядер.
+
+    :param config: Конфигурация сервера.
+    :return: Количество процессов.
+    """
+    # Хранилище в памяти не разделяется между процессами.
+    if os.getenv(TASK_REPO_BACKEND) == "memory":
+        return 1
+    return config.workers if config.workers > 0 else available_cpus()
+
+
+def prepare_multiprocess_metrics(workers: int) -> None:
+    """
+    Подготовка каталога метрик для нескольких процессов.
+    Каждый процесс пишет метрики в свои файлы в PROMETHEUS_MULTIPROC_DIR,
+    а /metrics суммирует их, поэтому каталог задается до запуска процессов.
+    Если он не задан, создается временный; заданный каталог очищается
+    от файлов прошлого запуска.
+
+    :param workers: Количество процессов приложения.
+    """
+    if workers <= 1:
+        return
+    path = os.getenv(PROMETHEUS_MULTIPROC_DIR)
+    if not path:
+        os.environ[PROMETHEUS_MULTIPROC_DIR] = tempfile.mkdtemp(prefix="prometheus-")
+        return
+    Path(path).mkdir(parents=True, exist_ok=True)
+    for file in Path(path).glob("*.db"):
+        file.unlink()
+
+
+def main() -> None:
+    config = load_server_config()
+    workers = resolve_workers(config)
+    # Процессы наследуют окружение и делят DB_CONNECTION_BUDGET на это число.
+    os.environ[WEB_WORKERS] = str(workers)
+    prepare_multiprocess_metrics(workers)
+    uvicorn.run(
+        APP,
+        factory=True,
+        host=config.host,
+        port=config.port,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        # Латентность запросов собирается в /metrics, построчный журнал
+        # доступа только занимал бы цикл событий.
+        access_log=False,
+        timeout_graceful_shutdown=config.graceful_shutdown_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import AsyncIterator
+from uuid import UUID
 
-from src.domain.entities import Status
-from src.application.interfaces import TaskCreator, TaskDeleter, TaskReader, TaskUpdater
-from src.domain.exceptions import TaskNotFoundException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+
+from src.domain.entities import Status, Task
+from src.application.dto import NewTask
+from src.application.interfaces import (
+    TaskCreator,
+    TaskDeleter,
+    TaskEventFeed,
+    TaskExporter,
+    TaskReader,
+    TaskUpdater,
+    UnitOfWork,
+)
+from src.application.projection import TASK_FIELDS, parse_task_fields
+from src.domain.exceptions import (
+    ChangesCursorExpiredException,
+    InvalidCursorException,
+    InvalidFieldsException,
+    TaskNotFoundException,
+    TaskVersionMismatchException,
+)
 from src.presentation.api.di.stub import (
     provide_task_creator_stub,
     provide_task_deleter_stub,
+    provide_task_event_hub_stub,
+    provide_task_exporter_stub,
     provide_task_reader_stub,
     provide_task_updater_stub,
+    provide_uow_stub,
+)
+from src.presentation.api.etag import (
+    if_none_match_satisfied,
+    make_list_etag,
+    make_projection_list_etag,
+    make_task_etag,
+    make_version_etag,
+    parse_if_match,
 )
 from src.presentation.api.schemas import ErrorSchema
 from src.presentation.api.task.schemas import (
+    BatchOperationResult,
+    BatchRequest,
+    BatchResponse,
+    CreateTaskOperation,
+    DeleteTaskOperation,
+    UpdateTaskOperation,
     TaskRequest,
     CreateTaskResponse,
     TaskResponse,
+    TaskChangesResponse,
     TaskListResponse,
+    TaskSearchResponse,
+    TaskStatsResponse,
+)
+from src.presentation.api.task.serialization import (
+    OrjsonResponse,
+    render_ndjson,
+    render_projection,
+    render_projection_list,
+    render_search_hits,
+    render_task,
+    render_task_changes,
+    render_task_events,
+    render_task_list,
 )
 
 
 router = APIRouter(prefix="/tasks")
 
+EXPORT_CHUNK_SIZE = 500
+# Комментарий раз в EVENTS_HEARTBEAT секунд не дает прокси закрыть
+# простаивающее соединение и позволяет заметить отключение клиента.
+EVENTS_HEARTBEAT = 15.0
+
+FIELDS_DESCRIPTION = (
+    "Поля задачи через запятую, которые нужно вернуть (по умолчанию все): "
+    + ", ".join(TASK_FIELDS)
+)
+
 
 @router.post(
     "/",
@@ -46,36 +107,342 @@ async def create_task(
     return CreateTaskResponse(uuid=task_uuid)
 
 
+@router.post(
+    "/batch",
+    status_code=status.HTTP_200_OK,
+    description="Endpoint для пакетного создания, обновления и удаления задач. "
+    "Все операции выполняются в одной транзакции: сначала создания, затем обновления, затем удаления. "
+    "Результат каждой операции возвращается в порядке запроса.",
+    responses={
+        status.HTTP_200_OK: {
+            "model": BatchResponse,
+            "description": "Пакет операций выполнен",
+        },
+        status.HTTP_422_UNPROCESSABLE_ENTITY: {
+            "description": "Ошибка валидации",
+        },
+    },
+    summary="Пакетное изменение задач",
+)
+async def batch_tasks(
+    data: BatchRequest,
+    creator: TaskCreator = Depends(provide_task_creator_stub),
+    updater: TaskUpdater = Depends(provide_task_updater_stub),
+    deleter: TaskDeleter = Depends(provide_task_deleter_stub),
+    uow: UnitOfWork = Depends(provide_uow_stub),
+) -> BatchResponse:
+    creates = [op for op in data.operations if isinstance(op, CreateTaskOperation)]
+    updates = [op for op in data.operations if isinstance(op, UpdateTaskOperation)]
+    deletes = [op for op in data.operations if isinstance(op, DeleteTaskOperation)]
+
+    created_uuids = iter(
+        await creator.create_new_tasks(
+            [NewTask(op.title, op.description, op.status) for op in creates]
+        )
+    )
+    updated = await updater.update_tasks(
+        [Task(str(op.uuid), op.title, op.description, op.status) for op in updates]
+    )
+    deleted = await deleter.delete_tasks([str(op.uuid) for op in deletes])
+    await uow.commit()
+
+    results = []
+    for op in data.operations:
+        if isinstance(op, CreateTaskOperation):
+            uuid, result = next(created_uuids), "created"
+        elif isinstance(op, UpdateTaskOperation):
+            uuid = str(op.uuid)
+            result = "updated" if uuid in updated else "not_found"
+        else:
+            uuid = str(op.uuid)
+            result = "deleted" if uuid in deleted else "not_found"
+        results.append(BatchOperationResult(op=op.op, uuid=uuid, result=result))
+    return BatchResponse(results=results)
+
+
 @router.get(
     "/",
     status_code=status.HTTP_200_OK,
-    description="Endpoint для получения списка всех задач, с возможностью фильтрации. Поле status может принимать значения 'todo', 'in_progress' или 'done'.",
+    response_model=TaskListResponse,
+    description="Endpoint для получения списка всех задач, с возможностью фильтрации. Поле status может принимать значения 'todo', 'in_progress' или 'done'. "
+    "Список возвращается постранично: для получения следующей страницы передайте значение next_cursor в параметр cursor. "
+    "Параметр fields ограничивает набор полей задач в ответе.",
     responses={
         status.HTTP_200_OK: {"model": TaskListResponse, "description": "Список задач"},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Страница не изменилась"},
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorSchema,
+            "description": "Некорректный курсор или список полей",
+        },
     },
     summary="Получение списка всех задач, с возможностью фильтрации",
 )
 async def get_tasks(
-    status: Status | None = None,
+    # Параметр запроса status не должен скрывать модуль fastapi.status.
+    task_status: Status | None = Query(None, alias="status"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = None,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: str | None = Header(None),
     interactor: TaskReader = Depends(provide_task_reader_stub),
-) -> TaskListResponse:
-    tasks = await interactor.get_all_tasks(status)
-    return TaskListResponse(
-        tasks=[
-            TaskResponse(
-                uuid=t.uuid, title=t.title, description=t.description, status=t.status
+) -> Response:
+    try:
+        if fields is None:
+            page = await interactor.get_all_tasks(task_status, limit, cursor)
+        else:
+            selected = parse_task_fields(fields)
+            page = await interactor.get_task_projections(
+                task_status, limit, cursor, selected
             )
-            for t in tasks
-        ]
+    except (InvalidCursorException, InvalidFieldsException) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    if fields is None:
+        etag = make_list_etag(page.items, page.next_cursor)
+    else:
+        etag = make_projection_list_etag(page.items, page.next_cursor, selected)
+    if if_none_match_satisfied(if_none_match, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    if fields is None:
+        content = render_task_list(page.items, page.next_cursor)
+    else:
+        content = render_projection_list(page.items, page.next_cursor, selected)
+    return OrjsonResponse(content, headers={"ETag": etag})
+
+
+@router.get(
+    "/export",
+    status_code=status.HTTP_200_OK,
+    description="Endpoint для потоковой выгрузки всех задач в формате NDJSON (одна задача на строку). Поле status может принимать значения 'todo', 'in_progress' или 'done'.",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"application/x-ndjson": {}},
+            "description": "Поток задач",
+        },
+    },
+    summary="Потоковая выгрузка задач",
+)
+async def export_tasks(
+    status: Status | None = None,
+    exporter: TaskExporter = Depends(provide_task_exporter_stub),
+) -> StreamingResponse:
+    return StreamingResponse(
+        render_ndjson(exporter.export_tasks(status), EXPORT_CHUNK_SIZE),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.get(
+    "/stats",
+    status_code=status.HTTP_200_OK,
+    description="Endpoint для получения количества задач в каждом статусе. "
+    "Счетчики поддерживаются базой данных при каждом изменении задач, поэтому запрос "
+    "не зависит от размера таблицы. С approximate=true количество оценивается "
+    "по статистике планировщика.",
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskStatsResponse,
+            "description": "Количество задач по статусам",
+        },
+    },
+    summary="Количество задач по статусам",
+)
+async def get_task_stats(
+    approximate: bool = False,
+    interactor: TaskReader = Depends(provide_task_reader_stub),
+) -> TaskStatsResponse:
+    stats = await interactor.get_task_stats(approximate)
+    return TaskStatsResponse(
+        counts=stats.counts, total=stats.total, approximate=stats.approximate
+    )
+
+
+@router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    response_model=TaskSearchResponse,
+    description="Endpoint для полнотекстового поиска задач по заголовку и описанию. "
+    "Запрос поддерживает синтаксис веб-поиска: слова в кавычках ищутся как фраза, "
+    "слово с минусом исключается. Результаты упорядочены по убыванию релевантности "
+    "и возвращаются постранично через next_cursor.",
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskSearchResponse,
+            "description": "Найденные задачи",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorSchema,
+            "description": "Некорректный курсор",
+        },
+    },
+    summary="Полнотекстовый поиск задач",
+)
+async def search_tasks(
+    q: str = Query(..., min_length=1, max_length=256),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str | None = None,
+    interactor: TaskReader = Depends(provide_task_reader_stub),
+) -> Response:
+    try:
+        page = await interactor.search_tasks(q, limit, cursor)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    return OrjsonResponse(render_search_hits(page.items, page.next_cursor))
+
+
+@router.get(
+    "/changes",
+    status_code=status.HTTP_200_OK,
+    response_model=TaskChangesResponse,
+    description="Endpoint для синхронизации клиента: возвращает задачи, созданные или измененные, "
+    "и uuid задач, удаленных после курсора since. Без since возвращаются все задачи. "
+    "Значение next_cursor нужно передать в since при следующей синхронизации; "
+    "если has_more равно true, изменения получены не полностью и запрос нужно повторить сразу. "
+    "Стоимость запроса зависит от числа изменений после курсора, а не от числа задач.",
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskChangesResponse,
+            "description": "Изменения задач",
+        },
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorSchema,
+            "description": "Некорректный курсор",
+        },
+        status.HTTP_410_GONE: {
+            "model": ErrorSchema,
+            "description": "Курсор устарел, нужна полная синхронизация без since",
+        },
+    },
+    summary="Изменения задач с момента прошлой синхронизации",
+)
+async def get_task_changes(
+    since: str | None = None,
+    limit: int = Query(500, ge=1, le=1000),
+    interactor: TaskReader = Depends(provide_task_reader_stub),
+) -> Response:
+    try:
+        changes = await interactor.get_changes(since, limit)
+    except InvalidCursorException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+    except ChangesCursorExpiredException as e:
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail=e.message)
+    return OrjsonResponse(render_task_changes(changes))
+
+
+@router.get(
+    "/events",
+    status_code=status.HTTP_200_OK,
+    description="Endpoint для получения ленты изменений задач в формате Server-Sent Events. "
+    "Каждое событие (create, update, delete) содержит UUID, статус, предыдущий статус и версию задачи. "
+    "С параметром status лента содержит только события задач, которые перешли в этот статус или вышли из него. "
+    "Для продолжения ленты после переподключения передайте идентификатор последнего события "
+    "в заголовке Last-Event-ID или параметре last_event_id; если пропущенные события уже недоступны, "
+    "лента начинается с события reset, после которого задачи нужно загрузить заново.",
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "content": {"text/event-stream": {}},
+            "description": "Поток событий",
+        },
+        status.HTTP_404_NOT_FOUND: {
+            "model": ErrorSchema,
+            "description": "Лента событий выключена",
+        },
+        status.HTTP_503_SERVICE_UNAVAILABLE: {
+            "model": ErrorSchema,
+            "description": "Лента событий временно недоступна",
+        },
+    },
+    summary="Лента изменений задач",
+)
+async def task_events(
+    status: Status | None = None,
+    last_event_id: int | None = Query(None, ge=0),
+    last_event_id_header: int | None = Header(None, alias="Last-Event-ID", ge=0),
+    feed: TaskEventFeed | None = Depends(provide_task_event_hub_stub),
+) -> StreamingResponse:
+    if feed is None:
+        raise HTTPException(
+            status_code=404, detail="Лента событий задач выключена."
+        )
+    if not feed.available:
+        raise HTTPException(
+            status_code=503, detail="Лента событий задач временно недоступна."
+        )
+    after_id = last_event_id_header if last_event_id_header is not None else last_event_id
+    return StreamingResponse(
+        stream_task_events(feed, status, after_id, EVENTS_HEARTBEAT),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+async def stream_task_events(
+    feed: TaskEventFeed,
+    status: Status | None,
+    after_id: int | None,
+    heartbeat: float,
+) -> AsyncIterator[bytes]:
+    """
+    Поток событий задач в формате Server-Sent Events.
+
+    Подписка создается до чтения журнала, поэтому события, зафиксированные
+    во время чтения, не теряются; повторно полученные из подписки события
+    пропускаются.
+
+    :param feed: Лента событий.
+    :param status: Статус задач (None — события всех задач).
+    :param after_id: Идентификатор последнего полученного клиентом события.
+    :param heartbeat: Интервал отправки комментария при отсутствии событий.
+    :return: Части ответа.
+    """
+    subscription = feed.subscribe(status)
+    try:
+        replayed: set[int] = set()
+        if after_id is not None:
+            try:
+                events = await feed.replay(after_id, status)
+            except RuntimeError:
+                # Соединение ленты потеряно: клиент переподключится позже.
+                return
+            if events is None:
+                yield b"event: reset\ndata: {}\n\n"
+            else:
+                replayed = {event.id for event in events}
+                if events:
+                    yield render_task_events(events)
+
+        while True:
+            events = await subscription.next(heartbeat)
+            if events is None:
+                return
+            if replayed:
+                events = [event for event in events if event.id not in replayed]
+            if events:
+                yield render_task_events(events)
+            else:
+                yield b": keepalive\n\n"
+    finally:
+        feed.unsubscribe(subscription)
+
+
 @router.get(
     "/{task_uuid}",
     status_code=status.HTTP_200_OK,
-    description="Endpoint для получения задачи по UUID.",
+    response_model=TaskResponse,
+    description="Endpoint для получения задачи по UUID. "
+    "Параметр fields ограничивает набор полей задачи в ответе.",
     responses={
         status.HTTP_200_OK: {"model": TaskResponse, "description": "Задача"},
+        status.HTTP_304_NOT_MODIFIED: {"description": "Задача не изменилась"},
+        status.HTTP_400_BAD_REQUEST: {
+            "model": ErrorSchema,
+            "description": "Некорректный список полей",
+        },
         status.HTTP_404_NOT_FOUND: {
             "model": ErrorSchema,
             "description": "Задача не найдена",
@@ -84,26 +451,44 @@ async def get_tasks(
     summary="Получение задачи по UUID",
 )
 async def get_task_by_uuid(
-    task_uuid: str, interactor: TaskReader = Depends(provide_task_reader_stub)
-) -> TaskResponse:
+    task_uuid: UUID,
+    fields: str | None = Query(None, description=FIELDS_DESCRIPTION),
+    if_none_match: str | None = Header(None),
+    interactor: TaskReader = Depends(provide_task_reader_stub),
+) -> Response:
     try:
-        task = await interactor.get_task_by_uuid(task_uuid)
+        if fields is None:
+            task = await interactor.get_task_by_uuid(str(task_uuid))
+        else:
+            selected = parse_task_fields(fields)
+            projection = await interactor.get_task_projection(str(task_uuid), selected)
 
+    except InvalidFieldsException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
     except TaskNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
 
-    return TaskResponse(
-        uuid=task.uuid,
-        title=task.title,
-        description=task.description,
-        status=task.status,
-    )
+    # Все представления одной версии задачи имеют общий ETag версии,
+    # чтобы его можно было передать в If-Match при изменении.
+    if fields is None:
+        etag = make_task_etag(task)
+    else:
+        etag = make_version_etag(projection["version"])
+    if if_none_match_satisfied(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    if fields is None:
+        content = render_task(task)
+    else:
+        content = render_projection(projection, selected)
+    return OrjsonResponse(content, headers={"ETag": etag})
 
 
 @router.put(
     "/{task_uuid}",
     status_code=status.HTTP_204_NO_CONTENT,
-    description="Endpoint для обновления задачи по UUID. Поле status может принимать значения 'todo', 'in_progress' или 'done'.",
+    description="Endpoint для обновления задачи по UUID. Поле status может принимать значения 'todo', 'in_progress' или 'done'. "
+    "Если передан заголовок If-Match, задача обновляется только при совпадении ее текущего ETag.",
     responses={
         status.HTTP_204_NO_CONTENT: {
             "description": "Задача обновлена успешно",
@@ -112,6 +497,10 @@ async def get_task_by_uuid(
             "model": ErrorSchema,
             "description": "Задача не найдена",
         },
+        status.HTTP_412_PRECONDITION_FAILED: {
+            "model": ErrorSchema,
+            "description": "Задача была изменена другим клиентом",
+        },
         status.HTTP_422_UNPROCESSABLE_ENTITY: {
             "description": "Ошибка валидации",
         },
@@ -119,22 +508,31 @@ async def get_task_by_uuid(
     summary="Обновление задачи по UUID",
 )
 async def update_task(
-    task_uuid: str,
+    task_uuid: UUID,
     data: TaskRequest,
+    response: Response,
+    if_match: str | None = Header(None),
     interactor: TaskUpdater = Depends(provide_task_updater_stub),
 ) -> None:
+    expected_version = _parse_if_match(if_match)
     try:
-        await interactor.update_task(
-            task_uuid, data.title, data.description, data.status
+        version = await interactor.update_task(
+            str(task_uuid), data.title, data.description, data.status, expected_version
         )
     except TaskNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except TaskVersionMismatchException as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=e.message
+        )
+    response.headers["ETag"] = make_version_etag(version)
 
 
 @router.delete(
     "/{task_uuid}",
     status_code=status.HTTP_204_NO_CONTENT,
-    description="Endpoint для удаления задачи по UUID.",
+    description="Endpoint для удаления задачи по UUID. "
+    "Если передан заголовок If-Match, задача удаляется только при совпадении ее текущего ETag.",
     responses={
         status.HTTP_204_NO_CONTENT: {
             "description": "Задача удалена успешно",
@@ -143,14 +541,34 @@ async def update_task(
             "model": ErrorSchema,
             "description": "Задача не найдена",
         },
+        status.HTTP_412_PRECONDITION_FAILED: {
+            "model": ErrorSchema,
+            "description": "Задача была изменена другим клиентом",
+        },
     },
     summary="Удаление задачи по UUID",
 )
 async def delete_task(
-    task_uuid: str,
+    task_uuid: UUID,
+    if_match: str | None = Header(None),
     interactor: TaskDeleter = Depends(provide_task_deleter_stub),
 ) -> None:
+    expected_version = _parse_if_match(if_match)
     try:
-        await interactor.delete_task(task_uuid)
+        await interactor.delete_task(str(task_uuid), expected_version)
     except TaskNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=e.message)
+    except TaskVersionMismatchException as e:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED, detail=e.message
+        )
+
+
+def _parse_if_match(if_match: str | None) -> int | None:
+    try:
+        return parse_if_match(if_match)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Заголовок If-Match должен содержать один ETag задачи.",
+        )
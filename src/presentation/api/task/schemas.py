@@ -1,3 +1,6 @@
+from typing import Annotated, Literal
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
 from src.domain.entities import Status
@@ -18,7 +21,81 @@ class TaskResponse(BaseModel):
     title: str = Field(..., title="Task title")
     description: str = Field(..., title="Task description")
     status: Status = Field(..., title="Task status")
+    version: int = Field(..., title="Task version")
 
 
 class TaskListResponse(BaseModel):
     tasks: list[TaskResponse] = Field(..., title="List of tasks")
+    next_cursor: str | None = Field(None, title="Cursor of the next page")
+
+
+class TaskSearchResult(TaskResponse):
+    rank: float = Field(..., title="Search relevance")
+
+
+class TaskSearchResponse(BaseModel):
+    tasks: list[TaskSearchResult] = Field(
+        ..., title="Found tasks, most relevant first"
+    )
+    next_cursor: str | None = Field(None, title="Cursor of the next page")
+
+
+class TaskChangesResponse(BaseModel):
+    tasks: list[TaskResponse] = Field(..., title="Created or updated tasks")
+    deleted: list[str] = Field(..., title="UUIDs of deleted tasks")
+    next_cursor: str = Field(..., title="Cursor for the next sync")
+    has_more: bool = Field(..., title="Whether more changes are available")
+
+
+class TaskStatsResponse(BaseModel):
+    counts: dict[Status, int] = Field(..., title="Number of tasks per status")
+    total: int = Field(..., title="Total number of tasks")
+    approximate: bool = Field(
+        ..., title="Counts are estimated from planner statistics"
+    )
+
+
+class CreateTaskOperation(BaseModel):
+    op: Literal["create"]
+    title: str = Field(..., title="Task title")
+    description: str = Field(..., title="Task description")
+    status: Status = Field(..., title="Task status")
+
+
+class UpdateTaskOperation(BaseModel):
+    op: Literal["update"]
+    uuid: UUID = Field(..., title="Task UUID")
+    title: str = Field(..., title="Task title")
+    description: str = Field(..., title="Task description")
+    status: Status = Field(..., title="Task status")
+
+
+class DeleteTaskOperation(BaseModel):
+    op: Literal["delete"]
+    uuid: UUID = Field(..., title="Task UUID")
+
+
+BatchOperation = Annotated[
+    CreateTaskOperation | UpdateTaskOperation | DeleteTaskOperation,
+    Field(discriminator="op"),
+]
+
+
+class BatchRequest(BaseModel):
+    operations: list[BatchOperation] = Field(
+        ..., title="List of operations", min_length=1, max_length=10000
+    )
+
+
+class BatchOperationResult(BaseModel):
+    op: Literal["create", "update", "delete"] = Field(..., title="Operation type")
+    uuid: str = Field(..., title="Task UUID")
+    result: Literal["created", "updated", "deleted", "not_found"] = Field(
+        ..., title="Operation outcome"
+    )
+
+
+class BatchResponse(BaseModel):
+    results: list[BatchOperationResult] = Field(
+        ..., title="Outcome of each operation, in request order"
+    )
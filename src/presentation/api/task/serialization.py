@@ -0,0 +1,80 @@
+from dataclasses import asdict
+from typing import AsyncIterator, Iterable
+
+import orjson
+from fastapi import Response
+
+from src.application.projection import TaskProjection
+from src.application.search import SearchHit
+from src.application.sync import TaskChanges
+from src.domain.entities import Task, TaskEvent
+
+# orjson сериализует dataclass-сущности и перечисления напрямую в байты
+# (Status — по значению), минуя промежуточные модели Pydantic.
+# Структура совпадает с TaskResponse, который остается схемой OpenAPI.
+
+
+class OrjsonResponse(Response):
+    media_type = "application/json"
+
+
+def render_task(task: Task) -> bytes:
+    return orjson.dumps(task)
+
+
+def render_task_list(tasks: Iterable[Task], next_cursor: str | None) -> bytes:
+    return orjson.dumps({"tasks": list(tasks), "next_cursor": next_cursor})
+
+
+def render_projection(projection: TaskProjection, fields: tuple[str, ...]) -> bytes:
+    return orjson.dumps({field: projection[field] for field in fields})
+
+
+def render_projection_list(
+    projections: Iterable[TaskProjection],
+    next_cursor: str | None,
+    fields: tuple[str, ...],
+) -> bytes:
+    tasks = [{field: p[field] for field in fields} for p in projections]
+    return orjson.dumps({"tasks": tasks, "next_cursor": next_cursor})
+
+
+def render_search_hits(hits: Iterable[SearchHit], next_cursor: str | None) -> bytes:
+    tasks = [{**asdict(hit.task), "rank": hit.rank} for hit in hits]
+    return orjson.dumps({"tasks": tasks, "next_cursor": next_cursor})
+
+
+def render_task_changes(changes: TaskChanges) -> bytes:
+    return orjson.dumps(changes)
+
+
+async def render_ndjson(
+    tasks: AsyncIterator[Task], chunk_size: int
+) -> AsyncIterator[bytes]:
+    """
+    Кодирование потока задач в NDJSON порциями по chunk_size строк.
+
+    :param tasks: Поток сущностей задач.
+    :param chunk_size: Количество строк в одной порции.
+    :yield: Порции ответа в кодировке UTF-8.
+    """
+    chunk = []
+    async for task in tasks:
+        chunk.append(orjson.dumps(task, option=orjson.OPT_APPEND_NEWLINE))
+        if len(chunk) >= chunk_size:
+            yield b"".join(chunk)
+            chunk = []
+    if chunk:
+        yield b"".join(chunk)
+
+
+def render_task_events(events: Iterable[TaskEvent]) -> bytes:
+    """
+    Кодирование событий задач в формат Server-Sent Events.
+    Идентификатор события клиент передает в Last-Event-ID при переподключении.
+    """
+    return b"".join(
+        b"id: %d\nevent: %s\ndata: %s\n\n"
+        % (event.id, event.op.encode(), orjson.dumps(event))
+        for event in events
+    )
@@ -1,34 +1,115 @@
+import os
+from contextlib import AsyncExitStack
+from functools import partial
+
 import httpx
 import pytest
 from fastapi import FastAPI
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.infra.database.models.base import Base
+from src.infra.database.repositories.task import TaskRepo
+from src.infra.memory.task import InMemoryTaskRepo, InMemoryTaskStore
+from src.presentation.api.config import WebConfig, parse_db_uri
+from src.presentation.api.di.di import init_dependencies
 
 from src.presentation.api.di.providers import (
     provide_task_deleter,
     provide_task_creator,
+    provide_task_exporter,
     provide_task_reader,
     provide_task_updater,
+    provide_uow,
 )
 from src.presentation.api.di.stub import (
     provide_session_stub,
     provide_task_deleter_stub,
+    provide_task_exporter_stub,
+    provide_task_reader_repo_stub,
     provide_task_repo_stub,
     provide_task_creator_stub,
     provide_task_reader_stub,
     provide_task_updater_stub,
+    provide_uow_stub,
 )
+from src.presentation.api.metrics import PrometheusMiddleware
+from src.presentation.api.metrics import router as metrics_router
 from src.presentation.api.task.handlers import router as task_router
 
 from tests.mocks import MockTaskRepo, MockSession
 
+# Строка подключения к тестовой БД Postgres (postgresql://...).
+# Если она задана, тесты API дополнительно прогоняются на репозиториях поверх Postgres;
+# на SQLite во временном файле они прогоняются всегда.
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+requires_postgres = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL is not set"
+)
+
 
 @pytest.fixture
 def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(
+    params=[
+        "mock",
+        "memory",
+        "sqlite",
+        pytest.param("sqlalchemy", marks=requires_postgres),
+        pytest.param("asyncpg", marks=requires_postgres),
+    ]
+)
+def task_backend(request):
+    return request.param
+
+
+@pytest.fixture
+def database_config(task_backend, tmp_path):
+    if task_backend in ("mock", "memory"):
+        return None
+    if task_backend == "sqlite":
+        async_db_uri, db_uri = parse_db_uri(f"sqlite:///{tmp_path}/tasks.db")
+        task_backend = "sqlalchemy"
+    else:
+        async_db_uri, db_uri = parse_db_uri(TEST_DATABASE_URL)
+    return WebConfig(
+        async_db_uri=async_db_uri,
+        db_uri=db_uri,
+        pool_size=2,
+        max_overflow=2,
+        task_repo_backend=task_backend,
+    )
+
+
 @pytest.fixture
-def mock_task_repo():
-    return MockTaskRepo()
+async def database_engine(database_config):
+    if database_config is None:
+        yield None
+        return
+    engine = create_async_engine(database_config.async_db_uri)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def mock_task_repo(task_backend, database_engine):
+    if task_backend == "memory":
+        yield InMemoryTaskRepo(InMemoryTaskStore())
+        return
+    if database_engine is None:
+        yield MockTaskRepo()
+        return
+    # На настоящей БД состояние проверяется отдельной сессией,
+    # которая видит только зафиксированные данные.
+    async with async_sessionmaker(database_engine)() as session:
+        yield TaskRepo(session)
 
 
 @pytest.fixture
@@ -37,7 +118,12 @@ def mock_session():
 
 
 @pytest.fixture
-async def client(mock_task_repo, mock_session):
+async def client(database_config, mock_task_repo, mock_session):
+    if database_config is not None:
+        async for client in _database_client(database_config):
+            yield client
+        return
+
     app = FastAPI(
         title="todo-list",
         debug=True,
@@ -45,14 +131,72 @@ async def client(mock_task_repo, mock_session):
 
     app.dependency_overrides[provide_session_stub] = lambda: mock_session
     app.dependency_overrides[provide_task_repo_stub] = lambda: mock_task_repo
+    app.dependency_overrides[provide_task_reader_repo_stub] = lambda: mock_task_repo
     app.dependency_overrides[provide_task_creator_stub] = provide_task_creator
     app.dependency_overrides[provide_task_reader_stub] = provide_task_reader
+    app.dependency_overrides[provide_task_exporter_stub] = partial(
+        provide_task_exporter,
+        partial(_mock_sessions, mock_session),
+        lambda session: mock_task_repo,
+    )
     app.dependency_overrides[provide_task_updater_stub] = provide_task_updater
     app.dependency_overrides[provide_task_deleter_stub] = provide_task_deleter
+    app.dependency_overrides[provide_uow_stub] = provide_uow
 
     app.include_router(task_router)
+    app.include_router(metrics_router)
+    app.add_middleware(PrometheusMiddleware)
 
     async with httpx.AsyncClient(
         transport=httpx.ASGITransport(app=app), base_url="http://test"
     ) as client:
         yield client
+
+
+async def _mock_sessions(session: MockSession):
+    yield session
+
+
+async def _database_client(config: WebConfig):
+    app = FastAPI(title="todo-list", debug=True)
+    init_dependencies(app, config)
+    app.include_router(task_router)
+    app.include_router(metrics_router)
+    app.add_middleware(PrometheusMiddleware)
+
+    async with AsyncExitStack() as stack:
+        for resource in app.state.resources:
+            await stack.enter_async_context(resource)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            yield client
+
+
+@pytest.fixture
+async def db_engine():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def executed_statements(db_engine):
+    statements: list[str] = []
+
+    @event.listens_for(db_engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    return statements
+
+
+@pytest.fixture
+async def db_session(db_engine):
+    session_maker = async_sessionmaker(
+        db_engine, autoflush=False, expire_on_commit=False
+    )
+    async with session_maker() as session:
+        yield session
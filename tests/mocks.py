@@ -1,15 +1,26 @@
-from typing import List
+from typing import AsyncIterator, List
 
+from src.application.pagination import TaskCursor
+from src.application.projection import project_task
+from src.application.search import SearchCursor, SearchHit, rank_task
+from src.application.sync import ChangeCursor, TaskChange
 from src.domain.entities import Task as TaskEntity, Status
-from src.domain.exceptions import TaskNotFoundException
+from src.domain.exceptions import TaskNotFoundException, TaskVersionMismatchException
 
 
 class MockTaskRepo:
     def __init__(self):
         self._tasks: List[TaskEntity] = []
+        self._positions: dict[str, ChangeCursor] = {}
+        self._seq = 0
+
+    def _record_change(self, task_uuid: str) -> None:
+        self._seq += 1
+        self._positions[task_uuid] = ChangeCursor(1, self._seq, task_uuid)
 
     async def create_new_task(self, task: TaskEntity) -> None:
         self._tasks.append(task)
+        self._record_change(task.uuid)
 
     async def get_task(self, task_uuid: str) -> TaskEntity:
         for task in self._tasks:
@@ -17,27 +28,137 @@ class MockTaskRepo:
                 return task
         raise TaskNotFoundException(task_uuid=task_uuid)
 
-    async def get_tasks(self, status: Status | None = None) -> List[TaskEntity]:
-        if status is None:
-            return self._tasks
-        return [task for task in self._tasks if task.status == status]
+    async def get_tasks(
+        self,
+        status: Status | None = None,
+        limit: int | None = None,
+        cursor: TaskCursor | None = None,
+    ) -> List[TaskEntity]:
+        order = list(Status)
+        tasks = sorted(self._tasks, key=lambda t: (order.index(t.status), t.uuid))
+        if status is not None:
+            tasks = [task for task in tasks if task.status == status]
+        if cursor is not None:
+            after = (order.index(cursor.status), cursor.uuid)
+            tasks = [t for t in tasks if (order.index(t.status), t.uuid) > after]
+        return tasks[:limit]
+
+    async def get_task_projection(self, task_uuid: str, fields: tuple[str, ...]) -> dict:
+        return project_task(await self.get_task(task_uuid), fields)
+
+    async def get_task_projections(
+        self,
+        status: Status | None,
+        limit: int,
+        cursor: TaskCursor | None,
+        fields: tuple[str, ...],
+    ) -> List[dict]:
+        tasks = await self.get_tasks(status, limit, cursor)
+        return [project_task(task, fields) for task in tasks]
+
+    async def search_tasks(
+        self, query: str, limit: int, cursor: SearchCursor | None = None
+    ) -> List[SearchHit]:
+        hits = []
+        for task in self._tasks:
+            rank = rank_task(task, query)
+            if rank is not None:
+                hits.append(SearchHit(task=task, rank=rank))
+        hits.sort(key=lambda h: (-h.rank, h.task.uuid))
+        if cursor is not None:
+            after = (-cursor.rank, cursor.uuid)
+            hits = [h for h in hits if (-h.rank, h.task.uuid) > after]
+        return hits[:limit]
+
+    async def count_tasks(self) -> dict[Status, int]:
+        counts = dict.fromkeys(Status, 0)
+        for task in self._tasks:
+            counts[task.status] += 1
+        return counts
+
+    async def estimate_task_counts(self) -> dict[Status, int]:
+        return await self.count_tasks()
 
-    async def update_task(self, task: TaskEntity) -> None:
+    async def stream_tasks(self, status: Status | None = None) -> AsyncIterator[TaskEntity]:
+        for task in list(self._tasks):
+            if status is None or task.status == status:
+                yield task
+
+    async def update_task(
+        self, task: TaskEntity, expected_version: int | None = None
+    ) -> int:
         for idx, existing_task in enumerate(self._tasks):
             if existing_task.uuid == task.uuid:
+                self._check_version(existing_task, expected_version)
+                task.version = existing_task.version + 1
                 self._tasks[idx] = task
-                return
+                self._record_change(task.uuid)
+                return task.version
         raise TaskNotFoundException(task_uuid=task.uuid)
 
-    async def delete_task(self, task_uuid: str) -> None:
+    async def delete_task(
+        self, task_uuid: str, expected_version: int | None = None
+    ) -> None:
         for idx, task in enumerate(self._tasks):
             if task.uuid == task_uuid:
+                self._check_version(task, expected_version)
                 del self._tasks[idx]
+                self._record_change(task_uuid)
                 return
         raise TaskNotFoundException(task_uuid=task_uuid)
 
+    @staticmethod
+    def _check_version(task: TaskEntity, expected_version: int | None) -> None:
+        if expected_version is not None and task.version != expected_version:
+            raise TaskVersionMismatchException(
+                task_uuid=task.uuid,
+                expected_version=expected_version,
+                actual_version=task.version,
+            )
+
+    async def create_new_tasks(self, tasks: List[TaskEntity]) -> None:
+        self._tasks.extend(tasks)
+        for task in tasks:
+            self._record_change(task.uuid)
+
+    async def update_tasks(self, tasks: List[TaskEntity]) -> set[str]:
+        updated = set()
+        for task in tasks:
+            try:
+                await self.update_task(task)
+            except TaskNotFoundException:
+                continue
+            updated.add(task.uuid)
+        return updated
+
+    async def delete_tasks(self, task_uuids: List[str]) -> set[str]:
+        deleted = set()
+        for task_uuid in task_uuids:
+            try:
+                await self.delete_task(task_uuid)
+            except TaskNotFoundException:
+                continue
+            deleted.add(task_uuid)
+        return deleted
+
+    async def get_changes(
+        self, cursor: ChangeCursor | None, limit: int
+    ) -> List[TaskChange]:
+        tasks = {task.uuid: task for task in self._tasks}
+        changes = [
+            TaskChange(position=position, uuid=uuid, task=tasks.get(uuid))
+            for uuid, position in self._positions.items()
+            if (cursor is None and uuid in tasks)
+            or (cursor is not None and position > cursor)
+        ]
+        changes.sort(key=lambda change: change.position)
+        return changes[:limit]
+
 
 class MockSession:
+    def __init__(self):
+        self.commits = 0
+
     async def __aenter__(self):
         return self
 
@@ -45,7 +166,10 @@ class MockSession:
         pass
 
     async def commit(self):
-        pass
+        self.commits += 1
 
     async def rollback(self):
         pass
+
+    async def close(self):
+        pass
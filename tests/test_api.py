@@ -1,5 +1,15 @@
+import json
+
 import pytest
 
+from src.domain.entities import Status, Task
+from src.infra.database.export import SessionTaskExporter
+from src.presentation.api.task.schemas import TaskListResponse, TaskResponse
+
+from tests.mocks import MockTaskRepo
+
+MISSING_UUID = "00000000-0000-7000-8000-000000000000"
+
 
 @pytest.mark.anyio
 async def test_create_task(client, mock_task_repo):
@@ -13,7 +23,7 @@ async def test_create_task(client, mock_task_repo):
     )
     assert response.status_code == 201
 
-    tasks = await mock_task_repo.get_tasks()
+    tasks = await mock_task_repo.get_tasks(None, 100)
     assert len(tasks) == 1
     assert tasks[0].title == "Test Task"
     assert tasks[0].description == "This is a test task"
@@ -33,7 +43,7 @@ async def test_create_task_invalid_status(client, mock_task_repo):
     )
     assert response.status_code == 422
 
-    tasks = await mock_task_repo.get_tasks()
+    tasks = await mock_task_repo.get_tasks(None, 100)
     assert len(tasks) == 0
 
 
@@ -62,6 +72,12 @@ async def test_get_task_by_uuid(client):
 @pytest.mark.anyio
 async def test_get_task_by_invalid_uuid(client):
     response = await client.get("/tasks/invalid-uuid")
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_get_missing_task(client):
+    response = await client.get(f"/tasks/{MISSING_UUID}")
     assert response.status_code == 404
 
 
@@ -92,3 +108,340 @@ async def test_filter_tasks_by_status(client, mock_task_repo):
     assert len(data["tasks"]) == 1
     assert data["tasks"][0]["title"] == "Task 2"
     assert data["tasks"][0]["uuid"] == uuid2
+
+
+@pytest.mark.anyio
+async def test_get_tasks_pagination(client):
+    created = set()
+    for i in range(5):
+        response = await client.post(
+            "/tasks/",
+            json={"title": f"Task {i}", "description": "Test", "status": "todo"},
+        )
+        created.add(response.json()["uuid"])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/tasks/", params=params)
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["tasks"]) <= 2
+        seen.extend(t["uuid"] for t in data["tasks"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == sorted(created)
+
+
+@pytest.mark.anyio
+async def test_get_tasks_invalid_cursor(client):
+    response = await client.get("/tasks/?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_export_tasks(client):
+    for i, task_status in enumerate(["todo", "done", "todo"]):
+        await client.post(
+            "/tasks/",
+            json={"title": f"Task {i}", "description": "Test", "status": task_status},
+        )
+
+    response = await client.get("/tasks/export?status=todo")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    # Порядок выгрузки не определен: SQLite читает задачи по индексу (status, uuid).
+    assert sorted(line["title"] for line in lines) == ["Task 0", "Task 2"]
+    assert all(line["status"] == "todo" for line in lines)
+
+
+@pytest.mark.anyio
+async def test_export_opens_own_session():
+    sessions = []
+
+    async def open_session():
+        sessions.append("open")
+        try:
+            yield "session"
+        finally:
+            sessions.append("closed")
+
+    repo = MockTaskRepo()
+    for i in range(3):
+        await repo.create_new_task(
+            Task(uuid=f"task-{i}", title="Task", description="Test", status=Status.TODO)
+        )
+    exporter = SessionTaskExporter(open_session, lambda session: repo)
+
+    # Сессия открывается только при чтении потока, то есть после завершения
+    # зависимостей запроса, и закрывается вместе с потоком.
+    tasks = exporter.export_tasks(None)
+    assert sessions == []
+    assert (await anext(tasks)).uuid == "task-0"
+    assert sessions == ["open"]
+    assert [task.uuid async for task in tasks] == ["task-1", "task-2"]
+    assert sessions == ["open", "closed"]
+
+    tasks = exporter.export_tasks(None)
+    await anext(tasks)
+    await tasks.aclose()
+    assert sessions == ["open", "closed", "open", "closed"]
+
+
+@pytest.mark.anyio
+async def test_batch_tasks(client, mock_task_repo, mock_session, task_backend):
+    response = await client.post(
+        "/tasks/",
+        json={"title": "Existing", "description": "Test", "status": "todo"},
+    )
+    existing_uuid = response.json()["uuid"]
+
+    response = await client.post(
+        "/tasks/batch",
+        json={
+            "operations": [
+                {"op": "create", "title": "New", "description": "Test", "status": "todo"},
+                {
+                    "op": "update",
+                    "uuid": existing_uuid,
+                    "title": "Updated",
+                    "description": "Test",
+                    "status": "done",
+                },
+                {"op": "delete", "uuid": MISSING_UUID},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["result"] for r in results] == ["created", "updated", "not_found"]
+    assert results[1]["uuid"] == existing_uuid
+    if task_backend in ("mock", "memory"):
+        assert mock_session.commits == 1
+
+    tasks = {t.uuid: t for t in await mock_task_repo.get_tasks(None, 100)}
+    assert tasks[results[0]["uuid"]].title == "New"
+    assert tasks[existing_uuid].title == "Updated"
+
+
+@pytest.mark.anyio
+async def test_conditional_get_task(client):
+    create_task = await client.post(
+        "/tasks/",
+        json={"title": "Test Task", "description": "Test", "status": "todo"},
+    )
+    task_uuid = create_task.json()["uuid"]
+
+    response = await client.get(f"/tasks/{task_uuid}")
+    etag = response.headers["etag"]
+    assert response.json()["version"] == 1
+
+    response = await client.get(f"/tasks/{task_uuid}", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+    response = await client.get("/tasks/")
+    list_etag = response.headers["etag"]
+    response = await client.get("/tasks/", headers={"If-None-Match": list_etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.anyio
+async def test_update_task_if_match(client):
+    create_task = await client.post(
+        "/tasks/",
+        json={"title": "Test Task", "description": "Test", "status": "todo"},
+    )
+    task_uuid = create_task.json()["uuid"]
+    etag = (await client.get(f"/tasks/{task_uuid}")).headers["etag"]
+    data = {"title": "Updated", "description": "Test", "status": "done"}
+
+    response = await client.put(
+        f"/tasks/{task_uuid}", json=data, headers={"If-Match": etag}
+    )
+    assert response.status_code == 204
+    new_etag = response.headers["etag"]
+    assert new_etag != etag
+
+    response = await client.put(
+        f"/tasks/{task_uuid}", json=data, headers={"If-Match": etag}
+    )
+    assert response.status_code == 412
+
+    response = await client.delete(f"/tasks/{task_uuid}", headers={"If-Match": etag})
+    assert response.status_code == 412
+
+    response = await client.delete(
+        f"/tasks/{task_uuid}", headers={"If-Match": new_etag}
+    )
+    assert response.status_code == 204
+
+
+@pytest.mark.anyio
+async def test_task_responses_match_schema(client):
+    create_task = await client.post(
+        "/tasks/",
+        json={"title": "Задача", "description": "Тест", "status": "in_progress"},
+    )
+    task_uuid = create_task.json()["uuid"]
+
+    response = await client.get(f"/tasks/{task_uuid}")
+    assert response.headers["content-type"] == "application/json"
+    assert TaskResponse.model_validate_json(response.content).title == "Задача"
+
+    response = await client.get("/tasks/")
+    page = TaskListResponse.model_validate_json(response.content)
+    assert page.tasks[0].status == Status.IN_PROGRESS
+    assert page.next_cursor is None
+
+    schema = (await client.get("/openapi.json")).json()
+    list_schema = schema["paths"]["/tasks/"]["get"]["responses"]["200"]
+    task_schema = schema["paths"]["/tasks/{task_uuid}"]["get"]["responses"]["200"]
+    assert list_schema["content"]["application/json"]["schema"]["$ref"].endswith(
+        "/TaskListResponse"
+    )
+    assert task_schema["content"]["application/json"]["schema"]["$ref"].endswith(
+        "/TaskResponse"
+    )
+
+
+@pytest.mark.anyio
+async def test_get_tasks_sparse_fields(client):
+    for i in range(3):
+        await client.post(
+            "/tasks/",
+            json={"title": f"Task {i}", "description": "Long", "status": "todo"},
+        )
+
+    response = await client.get("/tasks/?fields=status,uuid&limit=2")
+    assert response.status_code == 200
+    data = response.json()
+    assert [set(t) for t in data["tasks"]] == [{"uuid", "status"}] * 2
+    assert data["next_cursor"] is not None
+
+    response = await client.get(f"/tasks/?fields=title&cursor={data['next_cursor']}")
+    assert [set(t) for t in response.json()["tasks"]] == [{"title"}]
+
+    task_uuid = data["tasks"][0]["uuid"]
+    full = await client.get(f"/tasks/{task_uuid}")
+    response = await client.get(f"/tasks/{task_uuid}?fields=title,version")
+    assert response.status_code == 200
+    assert response.json() == {"title": full.json()["title"], "version": 1}
+    assert response.headers["etag"] == full.headers["etag"]
+
+    response = await client.get("/tasks/?fields=uuid,secret")
+    assert response.status_code == 400
+    response = await client.get(f"/tasks/{task_uuid}?fields=")
+    assert response.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_search_tasks(client):
+    tasks = [
+        ("Купить молоко", "В магазине у дома"),
+        ("Позвонить маме", "Спросить про молоко"),
+        ("Починить кран", "Вызвать мастера"),
+    ]
+    for title, description in tasks:
+        await client.post(
+            "/tasks/",
+            json={"title": title, "description": description, "status": "todo"},
+        )
+
+    response = await client.get("/tasks/search", params={"q": "молоко"})
+    assert response.status_code == 200
+    data = response.json()
+    assert [t["title"] for t in data["tasks"]] == ["Купить молоко", "Позвонить маме"]
+    assert data["tasks"][0]["rank"] > data["tasks"][1]["rank"]
+
+    response = await client.get("/tasks/search", params={"q": "молоко", "limit": 1})
+    next_cursor = response.json()["next_cursor"]
+    response = await client.get(
+        "/tasks/search", params={"q": "молоко", "limit": 1, "cursor": next_cursor}
+    )
+    assert [t["title"] for t in response.json()["tasks"]] == ["Позвонить маме"]
+    assert response.json()["next_cursor"] is None
+
+    response = await client.get("/tasks/search", params={"q": "молоко", "cursor": "!"})
+    assert response.status_code == 400
+    response = await client.get("/tasks/search")
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_task_stats(client):
+    for status in ("todo", "todo", "done"):
+        await client.post(
+            "/tasks/",
+            json={"title": "Task", "description": "Test", "status": status},
+        )
+
+    response = await client.get("/tasks/stats")
+    assert response.status_code == 200
+    assert response.json() == {
+        "counts": {"todo": 2, "in_progress": 0, "done": 1},
+        "total": 3,
+        "approximate": False,
+    }
+
+    response = await client.get("/tasks/stats?approximate=true")
+    assert response.json()["approximate"] is True
+
+
+@pytest.mark.anyio
+async def test_task_changes(client):
+    uuids = []
+    for i in range(3):
+        response = await client.post(
+            "/tasks/",
+            json={"title": f"Task {i}", "description": "Test", "status": "todo"},
+        )
+        uuids.append(response.json()["uuid"])
+
+    # Первая синхронизация порциями получает все задачи.
+    response = await client.get("/tasks/changes", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["has_more"] is True
+    assert [t["uuid"] for t in data["tasks"]] == uuids[:2]
+    response = await client.get(
+        "/tasks/changes", params={"since": data["next_cursor"], "limit": 2}
+    )
+    data = response.json()
+    assert data["has_more"] is False
+    assert [t["uuid"] for t in data["tasks"]] == uuids[2:]
+    assert data["deleted"] == []
+    cursor = data["next_cursor"]
+
+    response = await client.get("/tasks/changes", params={"since": cursor})
+    assert response.json() == {
+        "tasks": [],
+        "deleted": [],
+        "next_cursor": cursor,
+        "has_more": False,
+    }
+
+    await client.put(
+        f"/tasks/{uuids[0]}",
+        json={"title": "Task 0", "description": "Changed", "status": "done"},
+    )
+    await client.delete(f"/tasks/{uuids[1]}")
+
+    response = await client.get("/tasks/changes", params={"since": cursor})
+    data = response.json()
+    assert [(t["uuid"], t["version"]) for t in data["tasks"]] == [(uuids[0], 2)]
+    assert data["deleted"] == [uuids[1]]
+
+    # Удаленная задача не попадает в синхронизацию с нуля.
+    response = await client.get("/tasks/changes")
+    assert [t["uuid"] for t in response.json()["tasks"]] == [uuids[2], uuids[0]]
+
+    response = await client.get("/tasks/changes", params={"since": "not-a-cursor"})
+    assert response.status_code == 400
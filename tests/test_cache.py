@@ -0,0 +1,171 @@
+import asyncio
+
+import asyncpg
+import pytest
+
+from src.domain.entities import Status, Task
+from src.domain.exceptions import TaskNotFoundException
+from src.infra.cache.invalidation import LocalInvalidationBus, PostgresInvalidationBus
+from src.infra.cache.lru import LRUCache
+from src.infra.cache.task import CachingTaskRepo, CachingUnitOfWork
+from src.presentation.api.config import parse_db_uri
+from tests.conftest import TEST_DATABASE_URL, requires_postgres
+from tests.mocks import MockSession, MockTaskRepo
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_task(uuid: str, title: str = "Task") -> Task:
+    return Task(uuid=uuid, title=title, description="Test", status=Status.TODO)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats.evictions == 1
+    assert cache.stats.hits == 3
+    assert cache.stats.misses == 1
+
+
+def test_lru_cache_expires_entries():
+    clock = FakeClock()
+    cache = LRUCache(max_size=10, ttl=5, clock=clock)
+    cache.put("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_skips_stale_put():
+    cache = LRUCache(max_size=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate("a")
+    cache.put("a", 1, generation)
+    assert cache.get("a") is None
+
+
+def test_lru_cache_invalidation_is_per_key():
+    cache = LRUCache(max_size=2, ttl=60)
+    generation = cache.generation
+    cache.invalidate("b")
+    cache.put("a", 1, generation)
+    assert cache.get("a") == 1
+
+    # Отметки вытесняются, и более ранние чтения считаются устаревшими.
+    generation = cache.generation
+    for key in ("c", "d", "e"):
+        cache.invalidate(key)
+    cache.put("f", 1, generation)
+    assert cache.get("f") is None
+
+
+def test_lru_cache_clear_discards_reads_in_flight():
+    cache = LRUCache(max_size=10, ttl=60)
+    cache.put("a", 1)
+    generation = cache.generation
+    cache.clear()
+    cache.put("b", 2, generation)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is None
+    cache.put("b", 2, cache.generation)
+    assert cache.get("b") == 2
+
+
+@pytest.mark.anyio
+async def test_caching_repo_reads_through_and_invalidates():
+    inner = MockTaskRepo()
+    await inner.create_new_task(make_task("task-1"))
+    cache = LRUCache(max_size=10, ttl=60)
+    repo = CachingTaskRepo(inner, cache)
+
+    assert (await repo.get_task("task-1")).title == "Task"
+    assert (await repo.get_task("task-1")).title == "Task"
+    assert cache.stats.misses == 1
+    assert cache.stats.hits == 1
+
+    await repo.update_task(make_task("task-1", title="Updated"))
+    assert (await repo.get_task("task-1")).title == "Updated"
+
+    await repo.delete_task("task-1")
+    with pytest.raises(TaskNotFoundException):
+        await repo.get_task("task-1")
+
+
+@pytest.mark.anyio
+async def test_invalidation_bus_evicts_other_workers():
+    inner = MockTaskRepo()
+    await inner.create_new_task(make_task("task-1"))
+    bus = LocalInvalidationBus()
+    caches = [LRUCache(max_size=10, ttl=60) for _ in range(2)]
+    for cache in caches:
+        bus.subscribe(cache.invalidate)
+    writer, reader = (CachingTaskRepo(inner, cache, bus) for cache in caches)
+
+    await reader.get_task("task-1")
+    await writer.update_task(make_task("task-1", title="Updated"))
+
+    assert (await reader.get_task("task-1")).title == "Updated"
+
+
+@pytest.mark.anyio
+async def test_batch_invalidation_waits_for_commit():
+    inner = MockTaskRepo()
+    for uuid in ("task-1", "task-2"):
+        await inner.create_new_task(make_task(uuid))
+    cache = LRUCache(max_size=10, ttl=60)
+    repo = CachingTaskRepo(inner, cache)
+    uow = CachingUnitOfWork(MockSession(), repo)
+    await repo.get_task("task-1")
+    await repo.get_task("task-2")
+
+    await repo.update_tasks([make_task("task-1", title="Updated")])
+    # До фиксации другие запросы видят старую задачу, и кэш ее сохраняет.
+    assert cache.get("task-1") is not None
+    await uow.commit()
+    assert cache.get("task-1") is None
+
+    await repo.delete_tasks(["task-2"])
+    await uow.rollback()
+    assert cache.get("task-2") is not None
+
+
+@requires_postgres
+@pytest.mark.anyio
+async def test_postgres_bus_resets_cache_after_reconnect():
+    _, dsn = parse_db_uri(TEST_DATABASE_URL)
+    cache = LRUCache(max_size=10, ttl=60)
+    async with PostgresInvalidationBus(dsn, reconnect_delay=0.01) as bus:
+        bus.subscribe(cache.invalidate)
+        bus.on_reset(cache.clear)
+        cache.put("task-1", make_task("task-1"))
+
+        connection = await asyncpg.connect(dsn)
+        try:
+            await connection.execute(
+                "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                "WHERE pid <> pg_backend_pid() AND query LIKE 'LISTEN%'"
+            )
+        finally:
+            await connection.close()
+
+        for _ in range(500):
+            if cache.get("task-1") is None:
+                break
+            await asyncio.sleep(0.01)
+        assert cache.get("task-1") is None
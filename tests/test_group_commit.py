@@ -0,0 +1,113 @@
+import asyncio
+from functools import partial
+
+import pytest
+from sqlalchemy import event
+
+from src.application.interactors import TaskCreatorImpl
+from src.domain.entities import Status, Task
+from src.infra.database.connection import create_session_maker, new_session
+from src.infra.database.group_commit import GroupCommitWriter
+from src.infra.database.models.base import Base
+from src.infra.database.repositories.task import TaskRepo
+from src.presentation.api.config import WebConfig, parse_db_uri
+from tests.mocks import MockSession, MockTaskRepo
+
+
+class RejectingTaskRepo(MockTaskRepo):
+    """Репозиторий, отклоняющий пакет целиком, если в нем есть задача с заголовком bad."""
+
+    def __init__(self, tasks: list[Task]):
+        super().__init__()
+        self._tasks = tasks
+
+    async def create_new_tasks(self, tasks: list[Task]) -> None:
+        if any(task.title == "bad" for task in tasks):
+            raise ValueError("bad task")
+        await super().create_new_tasks(tasks)
+
+
+async def mock_sessions():
+    yield MockSession()
+
+
+def make_task(i: int, title: str = "Task") -> Task:
+    return Task(uuid=f"task-{i}", title=title, description="Test", status=Status.TODO)
+
+
+@pytest.mark.anyio
+async def test_group_commit_writes_concurrent_creates_in_one_statement(tmp_path):
+    async_db_uri, db_uri = parse_db_uri(f"sqlite:///{tmp_path}/tasks.db")
+    session_maker = create_session_maker(WebConfig(async_db_uri, db_uri))
+    engine = session_maker.kw["bind"]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    inserts: list[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO tasks"):
+            inserts.append(statement)
+
+    writer = GroupCommitWriter(partial(new_session, session_maker), TaskRepo, window=0.05)
+    async with writer:
+        creators = [TaskCreatorImpl(TaskRepo(None), writer) for _ in range(20)]
+        uuids = await asyncio.gather(
+            *(c.create_new_task("Task", "Test", Status.TODO) for c in creators)
+        )
+
+    assert len(inserts) == 1
+    async with session_maker() as session:
+        assert (await TaskRepo(session).count_tasks())[Status.TODO] == 20
+        assert {t.uuid for t in await TaskRepo(session).get_tasks(None, 100)} == set(uuids)
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_group_commit_isolates_failures():
+    tasks: list[Task] = []
+    writer = GroupCommitWriter(
+        mock_sessions, lambda session: RejectingTaskRepo(tasks), window=0.05
+    )
+    async with writer:
+        results = await asyncio.gather(
+            writer.create_new_task(make_task(1)),
+            writer.create_new_task(make_task(2, "bad")),
+            writer.create_new_task(make_task(3)),
+            return_exceptions=True,
+        )
+
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], ValueError)
+    assert [t.uuid for t in tasks] == ["task-1", "task-3"]
+
+
+@pytest.mark.anyio
+async def test_group_commit_respects_max_rows_and_skips_cancelled():
+    tasks: list[Task] = []
+    batches: list[int] = []
+
+    class CountingRepo(RejectingTaskRepo):
+        async def create_new_tasks(self, new_tasks: list[Task]) -> None:
+            batches.append(len(new_tasks))
+            await super().create_new_tasks(new_tasks)
+
+    writer = GroupCommitWriter(
+        mock_sessions, lambda session: CountingRepo(tasks), window=0.05, max_rows=4
+    )
+    async with writer:
+        cancelled = asyncio.create_task(writer.create_new_task(make_task(0)))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(*(writer.create_new_task(make_task(i)) for i in range(1, 11)))
+
+    assert batches == [4, 4, 2]
+    assert [t.uuid for t in tasks] == [f"task-{i}" for i in range(1, 11)]
+
+
+@pytest.mark.anyio
+async def test_group_commit_requires_running_writer():
+    writer = GroupCommitWriter(mock_sessions, lambda session: MockTaskRepo())
+    with pytest.raises(RuntimeError):
+        await writer.create_new_task(make_task(1))
@@ -0,0 +1,15 @@
+from uuid import UUID
+
+from src.application.ids import uuid7
+
+
+def test_uuid7_version_and_variant():
+    value = UUID(uuid7())
+    assert value.version == 7
+    assert value.variant == "specified in RFC 4122"
+
+
+def test_uuid7_is_monotonic():
+    uuids = [uuid7() for _ in range(10000)]
+    assert uuids == sorted(uuids)
+    assert len(set(uuids)) == len(uuids)
@@ -0,0 +1,94 @@
+import asyncio
+
+import httpx
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from src.infra.database.connection import create_session_maker
+from src.infra.database.models.base import Base
+from src.infra.database.repositories.task import TaskRepo
+from src.infra.database.warmup import EngineLifecycle, task_reads_primer
+from src.presentation.api.config import WebConfig, parse_db_uri
+from src.presentation.api.health import AppLifecycle
+from src.presentation.api.main import create_app
+
+
+@pytest.fixture
+async def config(tmp_path):
+    async_db_uri, db_uri = parse_db_uri(f"sqlite:///{tmp_path}/tasks.db")
+    config = WebConfig(async_db_uri=async_db_uri, db_uri=db_uri, pool_size=4)
+    engine = create_session_maker(config).kw["bind"]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+    return config
+
+
+@pytest.mark.anyio
+async def test_engine_lifecycle_warms_and_disposes_pool(config):
+    engine = create_session_maker(config, name="reader", read_only=True).kw["bind"]
+    connects: list[object] = []
+    event.listen(engine.sync_engine, "connect", lambda *args: connects.append(args))
+
+    async with EngineLifecycle(engine, 10, task_reads_primer(TaskRepo)):
+        # Количество соединений ограничено постоянным размером пула.
+        assert len(connects) == 4
+        assert engine.sync_engine.pool.checkedin() == 4
+
+    assert engine.sync_engine.pool.checkedin() == 0
+
+
+@pytest.mark.anyio
+async def test_engine_lifecycle_failure(tmp_path):
+    async_db_uri, db_uri = parse_db_uri(f"sqlite:///{tmp_path}/missing/tasks.db")
+    config = WebConfig(async_db_uri=async_db_uri, db_uri=db_uri, pool_size=2)
+
+    with pytest.raises(OperationalError):
+        async with EngineLifecycle(create_session_maker(config).kw["bind"], 2):
+            pass
+
+    async with EngineLifecycle(
+        create_session_maker(config).kw["bind"], 2, required=False
+    ):
+        pass
+
+
+@pytest.mark.anyio
+async def test_readiness_follows_lifespan(config):
+    app = create_app(config)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert (await client.get("/health/ready")).status_code == 503
+
+        async with app.router.lifespan_context(app):
+            response = await client.get("/health/ready")
+            assert response.status_code == 200
+            assert (await client.get("/tasks/")).status_code == 200
+
+        assert (await client.get("/health/ready")).status_code == 503
+        assert app.state.lifecycle.state == "draining"
+
+
+@pytest.mark.anyio
+async def test_drain_waits_for_in_flight_requests():
+    lifecycle = AppLifecycle(drain_timeout=5)
+    lifecycle.request_started()
+
+    drain = asyncio.create_task(lifecycle.drain())
+    await asyncio.sleep(0.01)
+    assert not drain.done()
+    assert not lifecycle.ready
+
+    lifecycle.request_finished()
+    await asyncio.wait_for(drain, 1)
+
+
+@pytest.mark.anyio
+async def test_drain_gives_up_after_timeout():
+    lifecycle = AppLifecycle(drain_timeout=0.01)
+    lifecycle.request_started()
+
+    await lifecycle.drain()
+    assert lifecycle.in_flight == 1
@@ -0,0 +1,78 @@
+import pytest
+
+from src.application.pagination import TaskCursor
+from src.domain.entities import Status, Task
+from src.domain.exceptions import TaskVersionMismatchException
+from src.infra.memory.task import InMemoryTaskRepo, InMemoryTaskStore
+
+
+def make_task(uuid: str, status: Status) -> Task:
+    return Task(uuid=uuid, title=f"Task {uuid}", description="Test", status=status)
+
+
+@pytest.fixture
+async def repo():
+    repo = InMemoryTaskRepo(InMemoryTaskStore())
+    await repo.create_new_tasks(
+        [
+            make_task("c", Status.TODO),
+            make_task("a", Status.DONE),
+            make_task("b", Status.TODO),
+            make_task("d", Status.IN_PROGRESS),
+        ]
+    )
+    return repo
+
+
+@pytest.mark.anyio
+async def test_pages_follow_status_uuid_order(repo):
+    tasks = await repo.get_tasks(None, 10)
+    assert [t.uuid for t in tasks] == ["b", "c", "d", "a"]
+
+    tasks = await repo.get_tasks(None, 2, TaskCursor(Status.TODO, "c"))
+    assert [t.uuid for t in tasks] == ["d", "a"]
+
+    tasks = await repo.get_tasks(Status.TODO, 10, TaskCursor(Status.TODO, "b"))
+    assert [t.uuid for t in tasks] == ["c"]
+    assert await repo.get_tasks(Status.TODO, 10, TaskCursor(Status.DONE, "")) == []
+
+
+@pytest.mark.anyio
+async def test_status_change_moves_task_between_indexes(repo):
+    version = await repo.update_task(make_task("c", Status.DONE), expected_version=1)
+
+    assert version == 2
+    assert [t.uuid for t in await repo.get_tasks(Status.DONE, 10)] == ["a", "c"]
+    assert await repo.count_tasks() == {
+        Status.TODO: 1,
+        Status.IN_PROGRESS: 1,
+        Status.DONE: 2,
+    }
+    with pytest.raises(TaskVersionMismatchException):
+        await repo.delete_task("c", expected_version=1)
+
+
+@pytest.mark.anyio
+async def test_returned_tasks_do_not_alias_store(repo):
+    task = await repo.get_task("a")
+    task.title = "Changed"
+    assert (await repo.get_task("a")).title == "Task a"
+
+
+@pytest.mark.anyio
+async def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "tasks.json"
+    async with InMemoryTaskStore(path) as store:
+        repo = InMemoryTaskRepo(store)
+        await repo.create_new_task(make_task("a", Status.TODO))
+        await repo.update_task(make_task("a", Status.DONE))
+        await repo.create_new_task(make_task("b", Status.TODO))
+        await repo.delete_task("b")
+
+    async with InMemoryTaskStore(path) as store:
+        tasks = await InMemoryTaskRepo(store).get_tasks(None, 10)
+
+    assert tasks == [
+        Task(uuid="a", title="Task a", description="Test", status=Status.DONE, version=2)
+    ]
+    assert not path.with_name("tasks.json.tmp").exists()
@@ -0,0 +1,56 @@
+import pytest
+from prometheus_client.mmap_dict import MmapedDict, mmap_key
+
+from src.domain.entities import Status, Task
+from src.infra.database.repositories.task import TaskRepo
+from src.infra.metrics.repo import InstrumentedTaskRepo
+
+
+def sample(metrics: str, prefix: str) -> float:
+    for line in metrics.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.mark.anyio
+async def test_route_latency_uses_route_template(client):
+    route = 'http_request_duration_seconds_count{method="GET",route="/tasks/{task_uuid}",status="404"}'
+    before = sample((await client.get("/metrics")).text, route)
+
+    await client.get("/tasks/00000000-0000-7000-8000-000000000001")
+    await client.get("/tasks/00000000-0000-7000-8000-000000000002")
+
+    metrics = (await client.get("/metrics")).text
+    assert sample(metrics, route) == before + 2
+
+
+@pytest.mark.anyio
+async def test_repo_latency(client, db_session):
+    route = 'db_repo_call_duration_seconds_count{method="get_task"}'
+    before = sample((await client.get("/metrics")).text, route)
+
+    repo = InstrumentedTaskRepo(TaskRepo(db_session))
+    await repo.create_new_task(
+        Task(uuid="task-1", title="Task", description="Test", status=Status.TODO)
+    )
+    await repo.get_task("task-1")
+
+    metrics = (await client.get("/metrics")).text
+    assert sample(metrics, route) == before + 1
+
+
+@pytest.mark.anyio
+async def test_metrics_are_summed_across_workers(client, monkeypatch, tmp_path):
+    # Метрики других процессов, записанные в общий каталог.
+    metrics_dir = tmp_path / "metrics"
+    metrics_dir.mkdir()
+    key = mmap_key("task_cache_events", "task_cache_events_total", ["event"], ["hit"], "")
+    for pid in (101, 102):
+        values = MmapedDict(str(metrics_dir / f"counter_{pid}.db"))
+        values.write_value(key, 3.0, 0.0)
+        values.close()
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(metrics_dir))
+
+    metrics = (await client.get("/metrics")).text
+    assert sample(metrics, 'task_cache_events_total{event="hit"}') == 6
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src.infra.database.replicas import ReplicaRouter, open_read_session
+from tests.mocks import MockSession
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def session_maker(name: str):
+    def make() -> MockSession:
+        session = MockSession()
+        session.name = name
+        return session
+
+    return make
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def router(clock):
+    return ReplicaRouter(
+        [session_maker("replica-0"), session_maker("replica-1")],
+        eject_seconds=10,
+        clock=clock,
+    )
+
+
+async def read_from(router: ReplicaRouter, read_your_writes: bool = False) -> str:
+    async with open_read_session(
+        router, session_maker("primary"), read_your_writes
+    ) as session:
+        return session.name
+
+
+@pytest.mark.anyio
+async def test_round_robin(router):
+    assert [await read_from(router) for _ in range(4)] == [
+        "replica-0",
+        "replica-1",
+        "replica-0",
+        "replica-1",
+    ]
+
+
+@pytest.mark.anyio
+async def test_read_your_writes_uses_primary(router):
+    assert await read_from(router, read_your_writes=True) == "primary"
+
+
+@pytest.mark.anyio
+async def test_failed_replica_is_ejected(router, clock):
+    with pytest.raises(OperationalError):
+        async with open_read_session(router, session_maker("primary")):
+            raise OperationalError("SELECT 1", {}, ConnectionError())
+
+    assert not router.is_healthy(0)
+    assert [await read_from(router) for _ in range(2)] == ["replica-1", "replica-1"]
+
+    router.eject(1)
+    assert await read_from(router) == "primary"
+
+    clock.now = 10
+    assert await read_from(router) == "replica-0"
@@ -0,0 +1,93 @@
+import pytest
+
+from src.presentation.api import server
+from src.presentation.api.config import (
+    ConfigParseError,
+    ServerConfig,
+    load_web_config,
+    split_connection_budget,
+)
+
+
+def test_split_connection_budget():
+    assert split_connection_budget(100, 4) == (13, 12)
+    assert split_connection_budget(90, 3) == (15, 15)
+    assert split_connection_budget(3, 3) == (1, 0)
+    with pytest.raises(ConfigParseError):
+        split_connection_budget(3, 4)
+    # LISTEN шины инвалидации и ленты событий не входят в пул.
+    assert split_connection_budget(100, 4, reserved=2) == (12, 11)
+    with pytest.raises(ConfigParseError):
+        split_connection_budget(8, 4, reserved=2)
+
+
+def test_connection_budget_overrides_pool_size(monkeypatch, tmp_path):
+    monkeypatch.setenv("DB_URI", f"sqlite:///{tmp_path}/tasks.db")
+    monkeypatch.setenv("DB_POOL_SIZE", "15")
+    monkeypatch.setenv("DB_CONNECTION_BUDGET", "40")
+    monkeypatch.setenv("WEB_WORKERS", "4")
+
+    config = load_web_config()
+    # Из доли процесса вычитается пишущее соединение SQLite.
+    assert (config.pool_size, config.max_overflow) == (5, 4)
+    assert config.pool_warmup == 5
+
+
+def test_connection_budget_reserves_listen_connections(monkeypatch):
+    monkeypatch.setenv("DB_URI", "postgresql://user:password@db:5432/tasks")
+    monkeypatch.setenv("DB_CONNECTION_BUDGET", "48")
+    monkeypatch.setenv("WEB_WORKERS", "4")
+    monkeypatch.setenv("TASK_CACHE_SIZE", "1000")
+    monkeypatch.setenv("TASK_CACHE_INVALIDATION", "postgres")
+    monkeypatch.setenv("TASK_EVENTS", "true")
+
+    config = load_web_config()
+    assert (config.pool_size, config.max_overflow) == (5, 5)
+
+
+def test_connection_budget_reserves_sqlite_writer(monkeypatch, tmp_path):
+    monkeypatch.setenv("DB_URI", f"sqlite:///{tmp_path}/tasks.db")
+    monkeypatch.setenv("DB_CONNECTION_BUDGET", "9")
+    monkeypatch.setenv("WEB_WORKERS", "1")
+
+    config = load_web_config()
+    assert (config.pool_size, config.max_overflow) == (4, 4)
+
+
+def test_available_cpus_respects_cgroup_quota(monkeypatch, tmp_path):
+    cpu_max = tmp_path / "cpu.max"
+    monkeypatch.setattr(server, "CGROUP_CPU_MAX", cpu_max)
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)))
+
+    assert server.available_cpus() == 8
+    cpu_max.write_text("max 100000\n")
+    assert server.available_cpus() == 8
+    cpu_max.write_text("250000 100000\n")
+    assert server.available_cpus() == 3
+    cpu_max.write_text("10000 100000\n")
+    assert server.available_cpus() == 1
+
+
+def test_resolve_workers(monkeypatch):
+    monkeypatch.setattr(server, "available_cpus", lambda: 6)
+    monkeypatch.delenv("TASK_REPO_BACKEND", raising=False)
+
+    assert server.resolve_workers(ServerConfig()) == 6
+    assert server.resolve_workers(ServerConfig(workers=2)) == 2
+    monkeypatch.setenv("TASK_REPO_BACKEND", "memory")
+    assert server.resolve_workers(ServerConfig()) == 1
+
+
+def test_prepare_multiprocess_metrics(monkeypatch, tmp_path):
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    server.prepare_multiprocess_metrics(1)
+    assert "PROMETHEUS_MULTIPROC_DIR" not in server.os.environ
+
+    server.prepare_multiprocess_metrics(4)
+    assert server.os.path.isdir(server.os.environ["PROMETHEUS_MULTIPROC_DIR"])
+
+    # Файлы прошлого запуска не попадают в метрики нового.
+    (tmp_path / "counter_1.db").write_bytes(b"")
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    server.prepare_multiprocess_metrics(4)
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+from src.application.interactors import TaskReaderImpl
+from src.domain.entities import Status, Task
+from src.domain.exceptions import TaskNotFoundException
+from src.infra.database.single_flight import SingleFlight, TaskReadCoalescer
+from tests.mocks import MockSession, MockTaskRepo
+
+
+def coalesced(method: str) -> float:
+    return REGISTRY.get_sample_value("task_reads_coalesced_total", {"method": method}) or 0.0
+
+
+class SlowFunction:
+    def __init__(self, result: object = "result"):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+
+    async def __call__(self) -> object:
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+class CountingTaskRepo(MockTaskRepo):
+    def __init__(self, tasks: list[Task], calls: list[str]):
+        super().__init__()
+        self._tasks = tasks
+        self._calls = calls
+
+    async def get_task(self, task_uuid: str) -> Task:
+        self._calls.append("get_task")
+        await asyncio.sleep(0.01)
+        return await super().get_task(task_uuid)
+
+    async def get_tasks(self, status, limit, cursor=None):
+        self._calls.append("get_tasks")
+        await asyncio.sleep(0.01)
+        return await super().get_tasks(status, limit, cursor)
+
+
+async def mock_sessions():
+    yield MockSession()
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_one_call():
+    flights = SingleFlight("test_shared")
+    function = SlowFunction()
+
+    waiters = [asyncio.create_task(flights.do("key", function)) for _ in range(10)]
+    await asyncio.sleep(0)
+    function.release.set()
+
+    assert await asyncio.gather(*waiters) == ["result"] * 10
+    assert function.calls == 1
+    assert coalesced("test_shared") == 9
+    assert len(flights) == 0
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_errors():
+    flights = SingleFlight("test_errors")
+    function = SlowFunction(TaskNotFoundException(task_uuid="missing"))
+
+    waiters = [asyncio.create_task(flights.do("key", function)) for _ in range(3)]
+    await asyncio.sleep(0)
+    function.release.set()
+
+    results = await asyncio.gather(*waiters, return_exceptions=True)
+    assert all(isinstance(r, TaskNotFoundException) for r in results)
+    assert function.calls == 1
+
+
+@pytest.mark.anyio
+async def test_single_flight_survives_leader_cancellation():
+    flights = SingleFlight("test_leader")
+    function = SlowFunction()
+
+    leader = asyncio.create_task(flights.do("key", function))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flights.do("key", function))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    function.release.set()
+
+    assert await follower == "result"
+    assert leader.cancelled()
+    assert function.calls == 1
+
+
+@pytest.mark.anyio
+async def test_single_flight_cancels_call_without_waiters():
+    flights = SingleFlight("test_abandoned")
+    function = SlowFunction()
+
+    waiter = asyncio.create_task(flights.do("key", function))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    await asyncio.sleep(0)
+    assert len(flights) == 0
+
+    # Новый вызов не присоединяется к отмененному и выполняет функцию заново.
+    retry = asyncio.create_task(flights.do("key", function))
+    await asyncio.sleep(0)
+    function.release.set()
+    assert await retry == "result"
+    assert function.calls == 2
+
+
+@pytest.mark.anyio
+async def test_task_reader_coalesces_identical_reads():
+    tasks = [
+        Task(uuid=f"task-{i}", title="Task", description="Test", status=Status.TODO)
+        for i in range(3)
+    ]
+    calls: list[str] = []
+    coalescer = TaskReadCoalescer(
+        mock_sessions, lambda session: CountingTaskRepo(tasks, calls)
+    )
+    readers = [TaskReaderImpl(MockTaskRepo(), coalescer) for _ in range(5)]
+
+    found = await asyncio.gather(*(r.get_task_by_uuid("task-1") for r in readers))
+    pages = await asyncio.gather(*(r.get_all_tasks(Status.TODO, 2) for r in readers))
+
+    assert [t.uuid for t in found] == ["task-1"] * 5
+    assert all([t.uuid for t in page.items] == ["task-0", "task-1"] for page in pages)
+    assert calls == ["get_task", "get_tasks"]
@@ -0,0 +1,143 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.domain.entities import Status, Task
+from src.infra.database.connection import create_session_maker
+from src.infra.database.models.base import Base
+from src.infra.database.repositories.task import TaskRepo
+from src.infra.metrics.repo import InstrumentedTaskRepo
+from src.infra.metrics.slow_queries import (
+    EXPLAIN_TIMEOUT_MS,
+    SlowQueryLog,
+    create_explain_engine,
+    is_explainable,
+    redact_parameters,
+)
+from src.presentation.api.config import WebConfig, parse_db_uri
+from src.presentation.api.main import create_app
+from tests.conftest import TEST_DATABASE_URL, requires_postgres
+
+TASK_UUID = "00000000-0000-7000-8000-000000000001"
+
+
+@pytest.fixture
+async def config(tmp_path):
+    async_db_uri, db_uri = parse_db_uri(f"sqlite:///{tmp_path}/tasks.db")
+    config = WebConfig(async_db_uri=async_db_uri, db_uri=db_uri)
+    engine = create_session_maker(config).kw["bind"]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+    return config
+
+
+def test_redact_parameters():
+    assert redact_parameters(("secret", 1, None)) == ["str", "int", "null"]
+    assert redact_parameters({"title": "secret"}) == {"title": "str"}
+
+
+def test_only_plain_reads_are_explained():
+    assert is_explainable("SELECT tasks.uuid FROM tasks WHERE tasks.uuid = ?")
+    assert not is_explainable("SELECT uuid FROM tasks FOR UPDATE")
+    assert not is_explainable("WITH d AS (DELETE FROM tasks RETURNING uuid) SELECT 1")
+    assert not is_explainable("UPDATE tasks SET status = ?")
+
+
+@requires_postgres
+@pytest.mark.anyio
+async def test_explain_connection_is_read_only_with_timeout():
+    async_db_uri, db_uri = parse_db_uri(TEST_DATABASE_URL)
+    engine = create_session_maker(
+        WebConfig(async_db_uri=async_db_uri, db_uri=db_uri)
+    ).kw["bind"]
+    explain_engine = create_explain_engine(engine)
+
+    async with explain_engine.connect() as connection:
+        timeout = await connection.exec_driver_sql(
+            "SELECT setting FROM pg_settings WHERE name = 'statement_timeout'"
+        )
+        assert timeout.scalar() == str(EXPLAIN_TIMEOUT_MS)
+        read_only = await connection.exec_driver_sql("SHOW transaction_read_only")
+        assert read_only.scalar() == "on"
+    # Пул приложения не используется.
+    assert engine.pool.checkedout() == 0
+
+    await explain_engine.dispose()
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_slow_queries_are_logged_with_plan(config):
+    # Нулевой порог делает медленным любой запрос.
+    log = SlowQueryLog(threshold=1e-9, size=3, explain_rate=1.0)
+    session_maker = create_session_maker(config, slow_queries=log)
+
+    async with session_maker() as session:
+        repo = InstrumentedTaskRepo(TaskRepo(session))
+        await repo.create_new_task(
+            Task(uuid=TASK_UUID, title="Secret", description="Test", status=Status.TODO)
+        )
+        await session.commit()
+    async with session_maker() as session:
+        await InstrumentedTaskRepo(TaskRepo(session)).get_task(TASK_UUID)
+
+    queries = log.recent()
+    assert len(queries) == 3
+    read = next(query for query in queries if query.repo_method == "get_task")
+    # План снимается в фоне на отдельном соединении.
+    for _ in range(100):
+        if read.plan is not None:
+            break
+        await asyncio.sleep(0.01)
+    assert read.engine == "primary"
+    assert read.statement.startswith("SELECT")
+    assert "str" in read.parameters
+    assert "Secret" not in repr(queries)
+    assert "USING" in read.plan
+
+    await session_maker.kw["bind"].dispose()
+
+
+@pytest.mark.anyio
+async def test_slow_queries_endpoint(config):
+    config.slow_query_threshold = 1e-9
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(config)), base_url="http://test"
+    ) as client:
+        # Без ADMIN_TOKEN адрес не подключается.
+        assert (await client.get("/admin/slow-queries")).status_code == 404
+
+    config.admin_token = "admin-secret"
+    app = create_app(config)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert (await client.get(f"/tasks/{TASK_UUID}")).status_code == 404
+        assert (await client.get("/admin/slow-queries")).status_code == 401
+        response = await client.get(
+            "/admin/slow-queries", headers={"Authorization": "Bearer wrong"}
+        )
+        assert response.status_code == 401
+        response = await client.get(
+            "/admin/slow-queries", headers={"Authorization": "Bearer admin-secret"}
+        )
+
+    assert response.status_code == 200
+    queries = response.json()["queries"]
+    assert queries[0]["repo_method"] == "get_task"
+    assert queries[0]["engine"] == "reader"
+    assert queries[0]["plan"] is None
+
+
+@pytest.mark.anyio
+async def test_slow_queries_endpoint_when_log_is_disabled(config):
+    config.admin_token = "admin-secret"
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(config)), base_url="http://test"
+    ) as client:
+        response = await client.get(
+            "/admin/slow-queries", headers={"Authorization": "Bearer admin-secret"}
+        )
+    assert response.status_code == 404
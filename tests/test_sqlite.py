@@ -0,0 +1,100 @@
+import asyncio
+import contextlib
+
+import pytest
+from sqlalchemy import text
+
+from src.domain.entities import Status, Task
+from src.infra.database.connection import create_session_maker, new_session
+from src.infra.database.counters import reconcile_task_counts
+from src.infra.database.models.base import Base
+from src.infra.database.repositories.task import TaskRepo, fts5_query
+from src.presentation.api.config import ConfigParseError, WebConfig, parse_db_uri
+
+
+@pytest.fixture
+async def config(tmp_path):
+    async_db_uri, db_uri = parse_db_uri(f"sqlite:///{tmp_path}/tasks.db")
+    config = WebConfig(async_db_uri=async_db_uri, db_uri=db_uri, pool_size=4)
+    session_maker = create_session_maker(config)
+    engine = session_maker.kw["bind"]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+    return config
+
+
+def test_parse_db_uri():
+    assert parse_db_uri("sqlite:////var/lib/todo/tasks.db") == (
+        "sqlite+aiosqlite:////var/lib/todo/tasks.db",
+        "sqlite:////var/lib/todo/tasks.db",
+    )
+    assert parse_db_uri("postgresql://user:pass@db:5432/todo") == (
+        "postgresql+asyncpg://user:pass@db:5432/todo",
+        "postgresql://user:pass@db:5432/todo",
+    )
+    for uri in ("sqlite://", "sqlite:///:memory:", "mysql://db/todo"):
+        with pytest.raises(ConfigParseError):
+            parse_db_uri(uri)
+
+
+def test_fts5_query_quotes_terms():
+    assert fts5_query('молоко OR "кран" NEAR(a b)') == (
+        '"молоко" "OR" "кран" "NEAR" "a" "b"'
+    )
+    assert fts5_query("!?") is None
+
+
+@pytest.mark.anyio
+async def test_sqlite_pragmas(config):
+    writer = create_session_maker(config)
+    reader = create_session_maker(config, name="reader", read_only=True)
+
+    async with writer() as session:
+        assert await session.scalar(text("PRAGMA journal_mode")) == "wal"
+        assert await session.scalar(text("PRAGMA synchronous")) == 1
+        assert await session.scalar(text("PRAGMA query_only")) == 0
+    async with reader() as session:
+        assert await session.scalar(text("PRAGMA query_only")) == 1
+
+    assert writer.kw["bind"].sync_engine.pool.size() == 1
+    assert reader.kw["bind"].sync_engine.pool.size() == config.pool_size
+    await writer.kw["bind"].dispose()
+    await reader.kw["bind"].dispose()
+
+
+@pytest.mark.anyio
+async def test_sqlite_concurrent_writes_are_serialized(config):
+    session_maker = create_session_maker(config)
+
+    async def create(i: int) -> None:
+        async with contextlib.aclosing(new_session(session_maker)) as sessions:
+            await TaskRepo(await anext(sessions)).create_new_task(
+                Task(uuid=f"task-{i}", title="Task", description="Test", status=Status.TODO)
+            )
+
+    await asyncio.gather(*(create(i) for i in range(50)))
+
+    async with session_maker() as session:
+        assert (await TaskRepo(session).count_tasks())[Status.TODO] == 50
+    await session_maker.kw["bind"].dispose()
+
+
+@pytest.mark.anyio
+async def test_reconcile_task_counts_on_sqlite(config):
+    session_maker = create_session_maker(config)
+    async with session_maker() as session:
+        await TaskRepo(session).create_new_tasks(
+            [
+                Task(uuid=f"task-{i}", title="Task", description="Test", status=status)
+                for i, status in enumerate([Status.TODO, Status.DONE, Status.DONE])
+            ]
+        )
+        await session.execute(text("DELETE FROM task_status_counts"))
+        await session.commit()
+
+        counts = await reconcile_task_counts(session)
+
+        assert counts == {Status.TODO: 1, Status.IN_PROGRESS: 0, Status.DONE: 2}
+        assert await TaskRepo(session).count_tasks() == counts
+    await session_maker.kw["bind"].dispose()
@@ -0,0 +1,89 @@
+import pytest
+
+from src.application.sync import (
+    ORIGIN,
+    ChangeCursor,
+    decode_change_cursor,
+    encode_change_cursor,
+)
+from src.domain.entities import Status, Task
+from src.domain.exceptions import ChangesCursorExpiredException, InvalidCursorException
+from src.infra.database.repositories.task import TaskRepo
+from src.infra.database.tombstones import compact_tombstones
+from src.infra.memory.task import InMemoryTaskRepo, InMemoryTaskStore
+
+
+def make_task(uuid: str) -> Task:
+    return Task(uuid=uuid, title="t", description="d", status=Status.TODO)
+
+
+UUIDS = [f"00000000-0000-7000-8000-{i:012d}" for i in range(4)]
+
+
+def test_change_cursor_round_trip():
+    position = ChangeCursor(txid=12, seq=34, uuid=UUIDS[1])
+    assert decode_change_cursor(encode_change_cursor(position)) == position
+    assert ORIGIN < position
+
+    for cursor in ("!", encode_change_cursor(position)[:-2], "WzEsMl0"):
+        with pytest.raises(InvalidCursorException):
+            decode_change_cursor(cursor)
+
+
+@pytest.mark.anyio
+async def test_database_assigns_change_positions(db_session):
+    repo = TaskRepo(db_session)
+    await repo.create_new_tasks([make_task(uuid) for uuid in UUIDS[:3]])
+    await db_session.commit()
+    changes = await repo.get_changes(None, 10)
+    assert [change.position.seq for change in changes] == [1, 2, 3]
+
+    await repo.update_task(make_task(UUIDS[0]))
+    await repo.delete_task(UUIDS[1])
+    changes = await repo.get_changes(changes[-1].position, 10)
+    assert [(change.uuid, change.task is None) for change in changes] == [
+        (UUIDS[0], False),
+        (UUIDS[1], True),
+    ]
+    assert [change.position.seq for change in changes] == [4, 5]
+
+
+@pytest.mark.anyio
+async def test_compaction_expires_old_cursors(db_session):
+    repo = TaskRepo(db_session)
+    await repo.create_new_tasks([make_task(uuid) for uuid in UUIDS])
+    await db_session.commit()
+    before = (await repo.get_changes(None, 10))[-1].position
+    await repo.delete_task(UUIDS[0])
+    await repo.delete_task(UUIDS[1])
+    after = (await repo.get_changes(before, 10))[-1].position
+
+    assert await compact_tombstones(db_session, retention=3600) == 0
+    assert await compact_tombstones(db_session, retention=-1, batch_size=1) == 2
+
+    with pytest.raises(ChangesCursorExpiredException):
+        await repo.get_changes(before, 10)
+    assert await repo.get_changes(after, 10) == []
+    await repo.delete_task(UUIDS[2])
+    assert [change.uuid for change in await repo.get_changes(after, 10)] == [UUIDS[2]]
+
+
+@pytest.mark.anyio
+async def test_memory_store_tombstones():
+    store = InMemoryTaskStore(tombstone_retention=0)
+    repo = InMemoryTaskRepo(store)
+    for uuid in UUIDS:
+        await repo.create_new_task(make_task(uuid))
+    before = (await repo.get_changes(None, 10))[-1].position
+
+    await repo.delete_task(UUIDS[0])
+    # Без срока хранения отметка удаляется сразу и курсор устаревает.
+    with pytest.raises(ChangesCursorExpiredException):
+        await repo.get_changes(before, 10)
+
+    with pytest.raises(ChangesCursorExpiredException):
+        await InMemoryTaskRepo(InMemoryTaskStore()).get_changes(before, 10)
+
+    await repo.update_task(make_task(UUIDS[3]))
+    changes = await repo.get_changes(None, 10)
+    assert [change.uuid for change in changes] == [UUIDS[1], UUIDS[2], UUIDS[3]]
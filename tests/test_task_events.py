@@ -0,0 +1,270 @@
+import asyncio
+
+import asyncpg
+import httpx
+import orjson
+import pytest
+
+from src.domain.entities import Status, TaskEvent
+from src.infra.database.connection import create_session_maker
+from src.infra.database.models.base import Base
+from src.infra.database.task_events import TaskEventHub, TaskEventSubscription
+from src.presentation.api.config import WebConfig, parse_db_uri
+from src.presentation.api.main import create_app
+from src.presentation.api.task.handlers import stream_task_events
+
+from tests.conftest import TEST_DATABASE_URL, requires_postgres
+
+
+def make_event(id: int, status: Status = Status.TODO, previous=None) -> TaskEvent:
+    return TaskEvent(
+        id=id,
+        op="update" if previous else "create",
+        uuid=f"00000000-0000-7000-8000-{id:012d}",
+        status=status,
+        previous_status=previous,
+        version=1,
+    )
+
+
+class FakeFeed:
+    def __init__(self, journal: list[TaskEvent] | None, buffer_size: int = 16):
+        self.journal = journal
+        self.buffer_size = buffer_size
+        self.subscriptions: list[TaskEventSubscription] = []
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    def subscribe(self, status=None):
+        subscription = TaskEventSubscription(status, self.buffer_size)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+        self.subscriptions.remove(subscription)
+
+    async def replay(self, after_id, status=None):
+        if self.journal is None:
+            return None
+        return [event for event in self.journal if event.id > after_id]
+
+
+def test_subscription_filters_by_status():
+    subscription = TaskEventSubscription(Status.DONE, 4)
+
+    assert subscription.matches(make_event(1, Status.DONE))
+    # Уход задачи из статуса тоже интересен подписчику.
+    assert subscription.matches(make_event(2, Status.TODO, Status.DONE))
+    assert not subscription.matches(make_event(3, Status.TODO))
+    assert TaskEventSubscription(None, 4).matches(make_event(4, Status.TODO))
+
+
+@pytest.mark.anyio
+async def test_subscription_drops_slow_consumer():
+    subscription = TaskEventSubscription(None, 2)
+    subscription.push(make_event(1))
+    subscription.push(make_event(2))
+    assert [event.id for event in await subscription.next(0.01)] == [1, 2]
+    assert await subscription.next(0.01) == []
+
+    for id in range(3, 6):
+        subscription.push(make_event(id))
+
+    assert subscription.dropped
+    assert subscription.closed
+    assert await subscription.next(0.01) is None
+
+
+@pytest.mark.anyio
+async def test_hub_fans_out_events():
+    hub = TaskEventHub("postgresql://unused", buffer_size=1)
+    todo = hub.subscribe(Status.TODO)
+    done = hub.subscribe(Status.DONE)
+
+    hub._dispatch([make_event(1), make_event(2)])
+
+    # Подписчик на TODO переполнил буфер и отключен, DONE событий не получил.
+    assert todo.dropped
+    assert await done.next(0.01) == []
+    assert hub._subscriptions == {done}
+
+
+@pytest.mark.anyio
+async def test_stream_replays_and_skips_duplicates():
+    feed = FakeFeed([make_event(1), make_event(2)])
+    stream = stream_task_events(feed, None, 0, heartbeat=0.01)
+
+    replayed = await anext(stream)
+    assert replayed.startswith(b"id: 1\nevent: create\ndata: ")
+    assert b"id: 2\n" in replayed
+
+    # Событие 2 уже отправлено из журнала, а 3 новое.
+    feed.subscriptions[0].push(make_event(2))
+    feed.subscriptions[0].push(make_event(3))
+    live = await anext(stream)
+    assert live.startswith(b"id: 3\n")
+    data = orjson.loads(live.split(b"data: ", 1)[1])
+    assert data["uuid"] == make_event(3).uuid
+    assert data["status"] == "todo"
+
+    assert await anext(stream) == b": keepalive\n\n"
+
+    feed.subscriptions[0].close()
+    with pytest.raises(StopAsyncIteration):
+        await anext(stream)
+    assert feed.subscriptions == []
+
+
+@pytest.mark.anyio
+async def test_stream_resets_when_journal_is_gone():
+    feed = FakeFeed(None)
+    stream = stream_task_events(feed, None, 10, heartbeat=0.01)
+
+    assert (await anext(stream)).startswith(b"event: reset\n")
+    await stream.aclose()
+    assert feed.subscriptions == []
+
+
+@pytest.mark.anyio
+async def test_events_disabled(tmp_path):
+    async_db_uri, db_uri = parse_db_uri(f"sqlite:///{tmp_path}/tasks.db")
+    app = create_app(WebConfig(async_db_uri=async_db_uri, db_uri=db_uri))
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        assert (await client.get("/tasks/events")).status_code == 404
+
+
+async def recreate_schema() -> str:
+    async_db_uri, db_uri = parse_db_uri(TEST_DATABASE_URL)
+    engine = create_session_maker(
+        WebConfig(async_db_uri=async_db_uri, db_uri=db_uri)
+    ).kw["bind"]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+    return db_uri
+
+
+INSERT_TASKS = (
+    "INSERT INTO tasks (uuid, title, description, status) "
+    "SELECT gen_random_uuid(), 't', 'd', 'TODO' FROM generate_series(1, $1) "
+    "RETURNING uuid"
+)
+
+
+@requires_postgres
+@pytest.mark.anyio
+async def test_hub_receives_committed_changes():
+    db_uri = await recreate_schema()
+
+    async with TaskEventHub(db_uri) as hub:
+        subscription = hub.subscribe(Status.DONE)
+        connection = await asyncpg.connect(db_uri)
+        try:
+            task_uuid = await connection.fetchval(INSERT_TASKS, 1)
+            await connection.execute(
+                "UPDATE tasks SET status = 'DONE' WHERE uuid = $1", task_uuid
+            )
+        finally:
+            await connection.close()
+
+        events = await subscription.next(5)
+        assert [(event.op, event.previous_status) for event in events] == [
+            ("update", Status.TODO)
+        ]
+        assert events[0].uuid == str(task_uuid)
+
+        replayed = await hub.replay(0)
+        assert [event.op for event in replayed] == ["create", "update"]
+        assert await hub.replay(replayed[0].id) == replayed[1:]
+        hub.unsubscribe(subscription)
+
+
+@requires_postgres
+@pytest.mark.anyio
+async def test_hub_receives_large_batches():
+    db_uri = await recreate_schema()
+
+    async with TaskEventHub(db_uri) as hub:
+        subscription = hub.subscribe()
+        connection = await asyncpg.connect(db_uri)
+        try:
+            # Уведомление не содержит событий и не упирается в лимит NOTIFY.
+            await connection.fetch(INSERT_TASKS, 256)
+        finally:
+            await connection.close()
+
+        events: list[TaskEvent] = []
+        while len(events) < 256:
+            events.extend(await subscription.next(5))
+        assert len(events) == 256
+        assert len(await hub.replay(0)) == 256
+        hub.unsubscribe(subscription)
+
+
+@requires_postgres
+@pytest.mark.anyio
+async def test_hub_delivers_events_in_commit_safe_order():
+    db_uri = await recreate_schema()
+
+    async with TaskEventHub(db_uri, recheck_delay=0.01) as hub:
+        subscription = hub.subscribe()
+        first = await asyncpg.connect(db_uri)
+        second = await asyncpg.connect(db_uri)
+        try:
+            # Первая транзакция получает меньший номер события,
+            # но фиксируется после второй.
+            transaction = first.transaction()
+            await transaction.start()
+            await first.fetch(INSERT_TASKS, 1)
+            await second.fetch(INSERT_TASKS, 1)
+
+            # Событие второй транзакции придержано, пока первая не завершится:
+            # иначе клиент с его идентификатором пропустил бы событие первой.
+            assert await subscription.next(0.3) == []
+            assert await hub.replay(0) == []
+
+            await transaction.commit()
+        finally:
+            await first.close()
+            await second.close()
+
+        events = await subscription.next(5)
+        if len(events) < 2:
+            events.extend(await subscription.next(5))
+        assert [event.id for event in events] == [1, 2]
+        assert await hub.replay(0) == events
+        assert await hub.replay(1) == events[1:]
+        hub.unsubscribe(subscription)
+
+
+@requires_postgres
+@pytest.mark.anyio
+async def test_journal_is_written_only_while_the_feed_is_on():
+    db_uri = await recreate_schema()
+    connection = await asyncpg.connect(db_uri)
+    try:
+        # Без ленты триггеры не пишут события.
+        await connection.fetch(INSERT_TASKS, 3)
+        assert await connection.fetchval("SELECT count(*) FROM task_events") == 0
+
+        async with TaskEventHub(db_uri) as hub:
+            await connection.fetch(INSERT_TASKS, 1)
+            replayed = await hub.replay(0)
+            assert len(replayed) == 1
+
+        # Срок записи истек: журнал мог пропустить события и очищается.
+        await connection.execute(
+            "UPDATE task_events_lease SET listening_until = now() - interval '1s'"
+        )
+        await connection.fetch(INSERT_TASKS, 1)
+        async with TaskEventHub(db_uri) as hub:
+            assert await connection.fetchval("SELECT count(*) FROM task_events") == 0
+            assert await hub.replay(replayed[0].id) is None
+    finally:
+        await connection.close()
@@ -0,0 +1,124 @@
+import contextlib
+
+import pytest
+
+from src.domain.entities import Status, Task
+from src.domain.exceptions import TaskNotFoundException, TaskVersionMismatchException
+from src.infra.database.connection import create_session_maker, new_session
+from src.infra.database.models.base import Base
+from src.infra.database.repositories.task import TaskRepo, estimate_counts
+from src.presentation.api.config import WebConfig
+
+
+@pytest.fixture
+async def repo(db_session):
+    repo = TaskRepo(db_session)
+    await repo.create_new_task(
+        Task(uuid="task-1", title="Task", description="Test", status=Status.TODO)
+    )
+    return repo
+
+
+@pytest.mark.anyio
+async def test_update_task_single_statement(repo, executed_statements):
+    executed_statements.clear()
+    await repo.update_task(
+        Task(uuid="task-1", title="Updated", description="Test", status=Status.DONE)
+    )
+
+    assert len(executed_statements) == 1
+    assert executed_statements[0].startswith("UPDATE")
+    task = await repo.get_task("task-1")
+    assert task.title == "Updated"
+    assert task.status == Status.DONE
+
+
+@pytest.mark.anyio
+async def test_delete_task_single_statement(repo, executed_statements):
+    executed_statements.clear()
+    await repo.delete_task("task-1")
+
+    assert len(executed_statements) == 1
+    assert executed_statements[0].startswith("DELETE")
+    with pytest.raises(TaskNotFoundException):
+        await repo.get_task("task-1")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("operation", ["update", "delete"])
+async def test_missing_task_single_statement(repo, executed_statements, operation):
+    executed_statements.clear()
+    with pytest.raises(TaskNotFoundException):
+        if operation == "update":
+            await repo.update_task(
+                Task(uuid="missing", title="T", description="D", status=Status.DONE)
+            )
+        else:
+            await repo.delete_task("missing")
+
+    assert len(executed_statements) == 1
+
+
+@pytest.mark.anyio
+async def test_update_task_expected_version(repo, executed_statements):
+    executed_statements.clear()
+    version = await repo.update_task(
+        Task(uuid="task-1", title="Updated", description="Test", status=Status.DONE),
+        expected_version=1,
+    )
+    assert version == 2
+    assert len(executed_statements) == 1
+
+    with pytest.raises(TaskVersionMismatchException) as exc_info:
+        await repo.delete_task("task-1", expected_version=1)
+    assert exc_info.value.actual_version == 2
+    assert (await repo.get_task("task-1")).version == 2
+
+
+@pytest.mark.anyio
+async def test_lazy_session_releases_connection_after_read(tmp_path):
+    config = WebConfig(async_db_uri=f"sqlite+aiosqlite:///{tmp_path}/tasks.db", db_uri="")
+    session_maker = create_session_maker(config)
+    engine = session_maker.kw["bind"]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    pool = engine.sync_engine.pool
+
+    async with contextlib.aclosing(new_session(session_maker)) as sessions:
+        session = await anext(sessions)
+        assert session._session is None
+        await TaskRepo(session).create_new_task(
+            Task(uuid="task-1", title="Task", description="Test", status=Status.TODO)
+        )
+        assert pool.checkedout() == 0
+
+    async with contextlib.aclosing(
+        new_session(session_maker, release_after_read=True)
+    ) as sessions:
+        repo = TaskRepo(await anext(sessions))
+        assert (await repo.get_task("task-1")).title == "Task"
+        assert pool.checkedout() == 0
+        assert [t.uuid for t in await repo.get_tasks(None, 10)] == ["task-1"]
+        assert pool.checkedout() == 0
+
+    await engine.dispose()
+
+
+@pytest.mark.anyio
+async def test_projection_reads_only_requested_columns(repo, executed_statements):
+    executed_statements.clear()
+    tasks = await repo.get_task_projections(None, 10, None, ("uuid", "status"))
+    task = await repo.get_task_projection("task-1", ("uuid", "title"))
+
+    assert tasks == [{"uuid": "task-1", "status": Status.TODO}]
+    assert task == {"uuid": "task-1", "title": "Task"}
+    assert all("description" not in statement for statement in executed_statements)
+    with pytest.raises(TaskNotFoundException):
+        await repo.get_task_projection("missing", ("uuid",))
+
+
+def test_estimate_counts_from_planner_statistics():
+    counts = estimate_counts(1000, ["TODO", "DONE"], [0.7, 0.25])
+    assert counts == {Status.TODO: 700, Status.IN_PROGRESS: 0, Status.DONE: 250}
+    assert estimate_counts(-1, None, None) is None
+    assert estimate_counts(10, None, None) is None